@@ -4,65 +4,222 @@ import re
 from .campus import Campus
 from .dispositivo import Dispositivo
 from .restconf_operations import RESTCONFOperations
+from .ejecutor_flota import EjecutorFlota
+from .inventario import Inventario
+from .diario_cambios import DiarioCambios
+from .almacen_inventario import AlmacenInventario
+from .reportes import FORMATOS_REPORTE, generar_reporte, escribir_reporte
+from .analisis_direcciones import analizar
+from .direcciones_ip import mascara_a_prefijo
+from .instantaneas_configuracion import AlmacenInstantaneas, describir_cambio
+from .metricas import metricas
+
+UMBRAL_COMPACTACION = 1000
+
+
+def limpiar_pantalla():
+    # Secuencia ANSI en lugar de lanzar un proceso "clear" en cada pantalla
+    print("\033[H\033[2J", end="", flush=True)
+
 
 class AdministradorRedes:
     def __init__(self, nombre_archivo):
         self.nombre_archivo = nombre_archivo
         self.campus = {}
+        self.inventario = Inventario()
+        # Las consultas globales del inventario necesitan todos los campus cargados
+        self.inventario.preparar = self.cargar_todo
+        self.almacen = AlmacenInventario(nombre_archivo)
+        self.diario = DiarioCambios(nombre_archivo + ".diario")
+        self.instantaneas = AlmacenInstantaneas(nombre_archivo + ".instantaneas")
+        self._registrar_cambios = False
         if os.path.exists(nombre_archivo):
             self.cargar_desde_archivo()
+        self.reproducir_diario()
+        self._registrar_cambios = True
 
     def cargar_desde_archivo(self):
-        with open(self.nombre_archivo, "r") as archivo:
-            datos = json.load(archivo)
-            for nombre, descripcion in datos["campus"].items():
-                campus = Campus(nombre, descripcion)
-                self.campus[nombre] = campus
-                dispositivos_info = datos.get(nombre, [])
-                for dispositivo_info in dispositivos_info:
-                    dispositivo = Dispositivo(**dispositivo_info)
-                    campus.dispositivos.append(dispositivo)
+        with metricas.medir("cargar_desde_archivo"):
+            if self.almacen.es_formato_indexado():
+                for nombre, descripcion in self.almacen.leer_indice().items():
+                    self.campus[nombre] = Campus(nombre, descripcion, cargador=self._cargar_campus)
+                return
+            # Formato anterior: se migra al formato indexado en la siguiente compactación
+            for tipo, nombre, valor in self.almacen.leer_formato_anterior():
+                if tipo == "campus":
+                    self.campus[nombre] = Campus(nombre, valor)
+                elif nombre in self.campus:
+                    self._agregar_cargado(self.campus[nombre], self._sin_nombre_repetido(self.campus[nombre], Dispositivo(**valor)))
+
+    @staticmethod
+    def _sin_nombre_repetido(campus, dispositivo):
+        # El formato anterior admitía nombres repetidos en un campus; ahora el nombre es la clave,
+        # así que los siguientes se renombran para no perderlos al migrar
+        if campus.obtener_dispositivo(dispositivo.nombre) is None:
+            return dispositivo
+        original = dispositivo.nombre
+        numero = 2
+        while campus.obtener_dispositivo(f"{original} ({numero})") is not None:
+            numero += 1
+        dispositivo.nombre = f"{original} ({numero})"
+        print(f"Advertencia: el campus {campus.nombre} tiene más de un dispositivo llamado {original}; "
+              f"se renombró como {dispositivo.nombre}")
+        return dispositivo
+
+    def _cargar_campus(self, campus):
+        # Con el formato indexado los dispositivos de cada campus se cargan al usarlo por primera vez
+        with metricas.medir("cargar_campus"):
+            for dispositivo_info in self.almacen.leer_dispositivos(campus.nombre):
+                self._agregar_cargado(campus, Dispositivo(**dispositivo_info))
+
+    def _agregar_cargado(self, campus, dispositivo):
+        campus.agregar_dispositivo(dispositivo)
+        self.inventario.agregar(campus.nombre, dispositivo)
+
+    def cargar_todo(self):
+        for campus in self.campus.values():
+            campus.cargar()
+
+    def reproducir_diario(self):
+        # Las operaciones del diario son idempotentes, así que reaplicarlas sobre la instantánea es seguro
+        for entrada in self.diario.leer():
+            operacion = entrada["op"]
+            if operacion == "crear_campus":
+                self.crear_campus(entrada["campus"], entrada["descripcion"])
+            elif operacion == "modificar_campus":
+                self.modificar_descripcion_campus(entrada["campus"], entrada["descripcion"])
+            elif operacion == "eliminar_campus":
+                self.eliminar_campus(entrada["campus"])
+            elif operacion == "registrar_dispositivo" and entrada["campus"] in self.campus:
+                self.registrar_dispositivo(entrada["campus"], Dispositivo(**entrada["dispositivo"]))
+            elif operacion == "eliminar_dispositivo":
+                self.eliminar_dispositivo(entrada["campus"], entrada["dispositivo"])
+        if os.path.exists(self.diario.ruta) and os.path.getsize(self.diario.ruta) > 0:
+            self.guardar_en_archivo()
+
+    def _registrar_cambio(self, operacion, **datos):
+        if not self._registrar_cambios:
+            return
+        self.diario.registrar(operacion, **datos)
+        if self.diario.entradas >= UMBRAL_COMPACTACION:
+            self.guardar_en_archivo()
+
+    def crear_campus(self, nombre, descripcion):
+        if nombre in self.campus:
+            self.eliminar_campus(nombre)
+        self.campus[nombre] = Campus(nombre, descripcion)
+        self._registrar_cambio("crear_campus", campus=nombre, descripcion=descripcion)
+
+    def modificar_descripcion_campus(self, nombre, descripcion):
+        if nombre in self.campus:
+            self.campus[nombre].descripcion = descripcion
+            self._registrar_cambio("modificar_campus", campus=nombre, descripcion=descripcion)
+
+    def eliminar_campus(self, nombre):
+        campus = self.campus.pop(nombre, None)
+        if campus is not None:
+            if campus.cargado:
+                self.inventario.quitar_campus(nombre, [dispositivo.nombre for dispositivo in campus.dispositivos])
+            self._registrar_cambio("eliminar_campus", campus=nombre)
+
+    def registrar_dispositivo(self, nombre_campus, dispositivo):
+        campus = self.campus[nombre_campus]
+        campus.cargar()
+        self.inventario.quitar(nombre_campus, dispositivo.nombre)
+        campus.agregar_dispositivo(dispositivo)
+        self.inventario.agregar(nombre_campus, dispositivo)
+        self._registrar_cambio("registrar_dispositivo", campus=nombre_campus, dispositivo=dispositivo.a_diccionario())
+
+    def actualizar_dispositivo(self, nombre_campus, dispositivo, **cambios):
+        self.inventario.quitar(nombre_campus, dispositivo.nombre)
+        for atributo, valor in cambios.items():
+            setattr(dispositivo, atributo, valor)
+        self.inventario.agregar(nombre_campus, dispositivo)
+        self._registrar_cambio("registrar_dispositivo", campus=nombre_campus, dispositivo=dispositivo.a_diccionario())
+
+    def eliminar_dispositivo(self, nombre_campus, nombre_dispositivo):
+        if nombre_campus not in self.campus:
+            return None
+        self.campus[nombre_campus].cargar()
+        self.inventario.quitar(nombre_campus, nombre_dispositivo)
+        dispositivo = self.campus[nombre_campus].quitar_dispositivo(nombre_dispositivo)
+        if dispositivo is not None:
+            self._registrar_cambio("eliminar_dispositivo", campus=nombre_campus, dispositivo=nombre_dispositivo)
+        return dispositivo
+
+    def importar(self, registros):
+        # registros: iterable de (campus, descripcion, dispositivo); descripcion o dispositivo pueden ser None.
+        # No se escribe una entrada de diario por dispositivo: el resultado se guarda con una sola compactación.
+        cantidad = 0
+        self._registrar_cambios = False
+        try:
+            for nombre_campus, descripcion, dispositivo in registros:
+                if nombre_campus not in self.campus:
+                    self.crear_campus(nombre_campus, descripcion or "")
+                elif descripcion is not None:
+                    self.modificar_descripcion_campus(nombre_campus, descripcion)
+                if dispositivo is not None:
+                    self.registrar_dispositivo(nombre_campus, dispositivo)
+                    cantidad += 1
+        finally:
+            self._registrar_cambios = True
+        self.guardar_en_archivo()
+        return cantidad
 
     def guardar_en_archivo(self):
-        datos = {"campus": {}, "dispositivos": {}}
-        for nombre, campus in self.campus.items():
-            datos["campus"][nombre] = campus.descripcion
-            datos[nombre] = [dispositivo.__dict__ for dispositivo in campus.dispositivos]
-        with open(self.nombre_archivo, "w") as archivo:
-            json.dump(datos, archivo, indent=4)
-
-    def guardar_en_archivo_texto(self, archivo_texto):
+        # Compactación: instantánea completa escrita de forma atómica y diario vaciado.
+        # Los campus que nunca se cargaron se copian tal cual desde la instantánea anterior.
+        with metricas.medir("guardar_en_archivo"):
+            self.almacen.escribir(
+                (nombre, campus.descripcion, [dispositivo.a_diccionario() for dispositivo in campus.dispositivos] if campus.cargado else None)
+                for nombre, campus in self.campus.items()
+            )
+            self.diario.vaciar()
+
+    def guardar_en_archivo_texto(self, archivo_texto, formato="texto", nombre_campus=None, capa=None):
         self.guardar_en_archivo()
-        texto_formato = self.convertir_a_formato_texto()
-        with open(archivo_texto, "w") as archivo:
-            archivo.write(texto_formato)
+        escribir_reporte(archivo_texto, self.campus, formato, nombre_campus, capa)
         print(f"Datos convertidos y guardados en el archivo: {archivo_texto}")
+        self.informar_direcciones(solo_cargados=True)
+
+    def analizar_direcciones(self, solo_cargados=False):
+        # solo_cargados no lee el resto del inventario: los campus sin cargar no cambiaron en esta sesión,
+        # pero los duplicados o solapamientos con ellos no se detectan (para eso está el análisis completo)
+        if solo_cargados:
+            return analizar({nombre: campus for nombre, campus in self.campus.items() if campus.cargado})
+        self.cargar_todo()
+        return analizar(self.campus)
+
+    def informar_direcciones(self, solo_cargados=False):
+        resultado = self.analizar_direcciones(solo_cargados)
+        if resultado.hay_problemas:
+            print("Advertencias de direccionamiento (solo campus cargados):" if solo_cargados else "Advertencias de direccionamiento:")
+            for linea in resultado.resumen():
+                print(linea)
+        return resultado
 
     def convertir_a_formato_texto(self):
-        texto_formato = ""
-        for nombre, campus in self.campus.items():
-            texto_formato += f"Campus: {nombre}\nDescripción: {campus.descripcion}\n"
-            for dispositivo in campus.dispositivos:
-                texto_formato += f"\nDispositivo: {dispositivo.nombre}\nModelo: {dispositivo.modelo}\nCapa: {dispositivo.capa}\n"
-                texto_formato += "Interfaces:\n" + "\n".join([f"- {interface}: IP: {dispositivo.ips_masks[interface][0]}, Máscara: {dispositivo.ips_masks[interface][1]}" for interface in dispositivo.interfaces]) + "\n"
-                texto_formato += "VLANs:\n" + "\n".join([f"- {vlan}: {numero}" for vlan, numero in dispositivo.vlans.items()]) + "\n"
-                texto_formato += f"Servicios: {', '.join(dispositivo.servicios)}\n" + "-" * 30 + "\n"
-        return texto_formato
+        return "".join(generar_reporte(self.campus, "texto"))
 
     @staticmethod
     def es_direccion_ipv4(direccion):
         patron_ipv4 = r'^((25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)$'
         return re.match(patron_ipv4, direccion) is not None
 
+    @staticmethod
+    def es_mascara_valida(mascara):
+        return AdministradorRedes.es_direccion_ipv4(mascara) and mascara_a_prefijo(mascara) is not None
+
     def menu_principal(self):
         while True:
-            os.system("clear")
+            limpiar_pantalla()
             print("¡Bienvenido al Administrador de Redes!")
             print("1. Administrar campus")
             print("2. Administrar dispositivos de red")
             print("3. Guardar información en archivo de texto")
             print("4. Operaciones RESTCONF")
-            print("5. Salir")
+            print("5. Operaciones RESTCONF en campus")
+            print("6. Salir")
             opcion = input("Seleccione una opción: ")
             if opcion == "1":
                 self.administrar_campus()
@@ -70,11 +227,23 @@ class AdministradorRedes:
                 self.administrar_dispositivos()
             elif opcion == "3":
                 archivo_texto = input("Ingrese el nombre del archivo de texto para guardar los datos: ")
-                self.guardar_en_archivo_texto(archivo_texto)
+                formato = input(f"Ingrese el formato ({', '.join(FORMATOS_REPORTE)}) [texto]: ") or "texto"
+                nombre_campus = input("Filtrar por campus (Enter para todos): ") or None
+                capa = input("Filtrar por capa (Enter para todas): ") or None
+                if formato in FORMATOS_REPORTE:
+                    self.guardar_en_archivo_texto(archivo_texto, formato, nombre_campus, capa)
+                else:
+                    print("Formato no válido.")
                 input("Presione Enter para continuar.")
             elif opcion == "4":
                 self.menu_restconf()
             elif opcion == "5":
+                self.menu_restconf_flota()
+            elif opcion == "6":
+                self.guardar_en_archivo()
+                # Solo puede haber cambios de direcciones si se cargó algún campus
+                if any(campus.cargado for campus in self.campus.values()):
+                    self.informar_direcciones(solo_cargados=True)
                 print("¡Hasta luego!")
                 break
             else:
@@ -86,7 +255,7 @@ class AdministradorRedes:
         contrasena = input("Ingrese la contraseña: ")
         restconf = RESTCONFOperations(ip, usuario, contrasena)
         while True:
-            os.system("clear")
+            limpiar_pantalla()
             print("Operaciones RESTCONF:")
             print("1. Revisar si el dispositivo está operativo")
             print("2. Obtener configuración running")
@@ -95,7 +264,9 @@ class AdministradorRedes:
             print("5. Borrar interfaz")
             print("6. Crear ruta")
             print("7. Configurar protocolo de enrutamiento")
-            print("8. Regresar al menú principal")
+            print("8. Guardar instantánea de la configuración running")
+            print("9. Comparar instantáneas de la configuración running")
+            print("10. Regresar al menú principal")
             opcion = input("Seleccione una opción: ")
             if opcion == "1":
                 if restconf.es_dispositivo_operativo():
@@ -104,14 +275,14 @@ class AdministradorRedes:
                     print("El dispositivo no está operativo.")
                 input("Presione Enter para continuar.")
             elif opcion == "2":
-                configuracion = restconf.obtener_configuracion_running()
-                if configuracion:
-                    print(json.dumps(configuracion, indent=4))
+                filtro = input("Ingrese un filtro de ruta YANG (Enter para todas las secciones): ") or "*/*"
+                for ruta, seccion in restconf.obtener_configuracion_running_stream(filtro):
+                    print(f"{ruta}:")
+                    print(json.dumps(seccion, indent=4))
                 input("Presione Enter para continuar.")
             elif opcion == "3":
-                tabla_enrutamiento = restconf.obtener_tabla_enrutamiento()
-                if tabla_enrutamiento:
-                    print(json.dumps(tabla_enrutamiento, indent=4))
+                for ruta, entrada in restconf.obtener_tabla_enrutamiento_stream():
+                    print(json.dumps(entrada, indent=4))
                 input("Presione Enter para continuar.")
             elif opcion == "4":
                 nombre_interfaz = input("Ingrese el nombre de la interfaz: ")
@@ -145,16 +316,99 @@ class AdministradorRedes:
                     print("Protocolo de enrutamiento configurado exitosamente.")
                 input("Presione Enter para continuar.")
             elif opcion == "8":
+                self.guardar_instantanea(restconf)
+                input("Presione Enter para continuar.")
+            elif opcion == "9":
+                self.comparar_instantaneas(ip)
+                input("Presione Enter para continuar.")
+            elif opcion == "10":
+                restconf.cerrar()
                 break
             else:
                 input("Opción no válida. Presione Enter para continuar.")
 
+    def guardar_instantanea(self, restconf):
+        # Sin caché: la instantánea debe registrar la configuración actual del dispositivo
+        configuracion = restconf.obtener_configuracion_running(refrescar=True)
+        if configuracion is None:
+            return None
+        anteriores = self.instantaneas.listar(restconf.ip)
+        id_instantanea, hash_contenido, nueva = self.instantaneas.guardar(restconf.ip, configuracion)
+        print(f"Instantánea {id_instantanea} guardada ({hash_contenido}).")
+        if anteriores:
+            cambios = self.instantaneas.comparar(restconf.ip, anteriores[-1]["id"], id_instantanea)
+            print(f"Cambios respecto de la instantánea {anteriores[-1]['id']}: {len(cambios)}")
+            for cambio in cambios:
+                print(describir_cambio(*cambio))
+        return id_instantanea
+
+    def comparar_instantaneas(self, ip):
+        instantaneas = self.instantaneas.listar(ip)
+        if len(instantaneas) < 2:
+            print("Se necesitan al menos dos instantáneas del dispositivo para comparar.")
+            return
+        for entrada in instantaneas:
+            print(f"{entrada['id']}. {entrada['fecha']} ({entrada['hash']})")
+        id_a = input(f"Instantánea de origen [{instantaneas[-2]['id']}]: ") or instantaneas[-2]["id"]
+        id_b = input(f"Instantánea de destino [{instantaneas[-1]['id']}]: ") or instantaneas[-1]["id"]
+        try:
+            cambios = self.instantaneas.comparar(ip, int(id_a), int(id_b))
+        except (KeyError, ValueError) as e:
+            print(f"No se pudieron comparar las instantáneas: {e}")
+            return
+        print(f"Rutas modificadas: {len(cambios)}")
+        for cambio in cambios:
+            print(describir_cambio(*cambio))
+
+    def menu_restconf_flota(self):
+        limpiar_pantalla()
+        nombre_campus = input("Ingrese el nombre del campus (o 'todos' para todo el inventario): ")
+        if nombre_campus.lower() == "todos":
+            lista_campus = list(self.campus.values())
+        elif nombre_campus in self.campus:
+            lista_campus = [self.campus[nombre_campus]]
+        else:
+            input("El campus especificado no existe. Presione Enter para continuar.")
+            return
+        usuario = input("Ingrese el nombre de usuario: ")
+        contrasena = input("Ingrese la contraseña: ")
+        print("Operaciones RESTCONF en campus:")
+        print("1. Revisar si los dispositivos están operativos")
+        print("2. Obtener configuración running")
+        print("3. Obtener tabla de enrutamiento")
+        print("4. Crear ruta")
+        opcion = input("Seleccione una opción: ")
+        if opcion == "1":
+            operacion, args = "es_dispositivo_operativo", ()
+        elif opcion == "2":
+            operacion, args = "obtener_configuracion_running", ()
+        elif opcion == "3":
+            operacion, args = "obtener_tabla_enrutamiento", ()
+        elif opcion == "4":
+            destino = input("Ingrese el destino de la ruta: ")
+            mascara = input("Ingrese la máscara: ")
+            siguiente_salto = input("Ingrese el siguiente salto: ")
+            operacion, args = "crear_ruta", (destino, mascara, siguiente_salto)
+        else:
+            input("Opción no válida. Presione Enter para continuar.")
+            return
+        ejecutor = EjecutorFlota(usuario, contrasena)
+        exitosos = fallidos = 0
+        for resultado in ejecutor.ejecutar(lista_campus, operacion, *args):
+            if resultado.exitoso and resultado.resultado:
+                exitosos += 1
+                print(f"[{resultado.campus}] {resultado.dispositivo} ({resultado.ip}): OK ({resultado.duracion:.2f} s)")
+            else:
+                fallidos += 1
+                print(f"[{resultado.campus}] {resultado.dispositivo} ({resultado.ip}): Error {resultado.error or 'sin respuesta'}")
+        input(f"Exitosos: {exitosos}, fallidos: {fallidos}. Presione Enter para continuar.")
+
     # ... (otros métodos de la clase)
 
 
     def administrar_campus(self):
         while True:
-            os.system("clear")
+            limpiar_pantalla()
             print("Campus:")
             for nombre in sorted(self.campus.keys()):
                 print(nombre)
@@ -173,14 +427,14 @@ class AdministradorRedes:
     def agregar_campus(self):
         nombre = input("Ingrese el nombre del campus: ")
         descripcion = input("Ingrese una descripción del campus: ")
-        self.campus[nombre] = Campus(nombre, descripcion)
+        self.crear_campus(nombre, descripcion)
         input("Campus agregado. Presione Enter para continuar.")
 
     def modificar_campus(self):
         nombre = input("Ingrese el nombre del campus que desea modificar: ")
         if nombre in self.campus:
             nueva_descripcion = input("Ingrese la nueva descripción del campus: ")
-            self.campus[nombre].descripcion = nueva_descripcion
+            self.modificar_descripcion_campus(nombre, nueva_descripcion)
             input("Campus modificado. Presione Enter para continuar.")
         else:
             input("El campus especificado no existe. Presione Enter para continuar.")
@@ -188,14 +442,14 @@ class AdministradorRedes:
     def borrar_campus(self):
         nombre = input("Ingrese el nombre del campus que desea borrar: ")
         if nombre in self.campus:
-            del self.campus[nombre]
+            self.eliminar_campus(nombre)
             input("Campus eliminado. Presione Enter para continuar.")
         else:
             input("El campus especificado no existe. Presione Enter para continuar.")
 
     def administrar_dispositivos(self):
         while True:
-            os.system("clear")
+            limpiar_pantalla()
             print("Campus disponibles:")
             for nombre, campus in self.campus.items():
                 print(f"{nombre}: {campus.descripcion}")
@@ -204,7 +458,7 @@ class AdministradorRedes:
                 break
             elif campus_seleccionado in self.campus:
                 while True:
-                    os.system("clear")
+                    limpiar_pantalla()
                     print("Dispositivos en el campus:")
                     for dispositivo in self.campus[campus_seleccionado].dispositivos:
                         print(dispositivo.nombre)
@@ -225,12 +479,16 @@ class AdministradorRedes:
                 print("El campus especificado no existe.")
 
     def agregar_dispositivos(self, nombre_campus):
-        os.system("clear")
+        limpiar_pantalla()
         dispositivos_nuevos = []
         while True:
             nombre = input("Ingrese el nombre del dispositivo (o 'fin' para salir): ")
             if nombre.lower() == "fin":
                 break
+            if self.campus[nombre_campus].obtener_dispositivo(nombre) is not None or any(
+                    dispositivo.nombre == nombre for dispositivo in dispositivos_nuevos):
+                print("Ya existe un dispositivo con ese nombre en el campus; use la opción de modificar.")
+                continue
             modelo = input("Ingrese el modelo del dispositivo: ")
             capa = self.seleccionar_capa()
             interfaces = input("Ingrese las interfaces de red del dispositivo (separadas por coma): ").split(",")
@@ -239,34 +497,33 @@ class AdministradorRedes:
             servicios = input("Ingrese los servicios de red configurados (separados por coma): ").split(",")
             dispositivo = Dispositivo(nombre, modelo, capa, interfaces, ips_masks, vlans, servicios)
             dispositivos_nuevos.append(dispositivo)
-        self.campus[nombre_campus].dispositivos.extend(dispositivos_nuevos)
+        for dispositivo in dispositivos_nuevos:
+            self.registrar_dispositivo(nombre_campus, dispositivo)
         print("Dispositivos agregados.")
 
     def modificar_dispositivo(self, nombre_campus, nombre_dispositivo):
         if nombre_campus in self.campus:
-            campus = self.campus[nombre_campus]
-            for dispositivo in campus.dispositivos:
-                if dispositivo.nombre == nombre_dispositivo:
-                    dispositivo.modelo = input("Ingrese el nuevo modelo del dispositivo: ")
-                    dispositivo.capa = self.seleccionar_capa()
-                    dispositivo.interfaces = input("Ingrese las interfaces de red del dispositivo (separadas por coma): ").split(",")
-                    dispositivo.ips_masks = self.ingresar_ips_masks(dispositivo.interfaces)
-                    dispositivo.vlans = self.ingresar_vlans()
-                    dispositivo.servicios = input("Ingrese los servicios de red configurados (separados por coma): ").split(",")
-                    print("Dispositivo modificado.")
-                    return
+            dispositivo = self.campus[nombre_campus].obtener_dispositivo(nombre_dispositivo)
+            if dispositivo is not None:
+                modelo = input("Ingrese el nuevo modelo del dispositivo: ")
+                capa = self.seleccionar_capa()
+                interfaces = input("Ingrese las interfaces de red del dispositivo (separadas por coma): ").split(",")
+                ips_masks = self.ingresar_ips_masks(interfaces)
+                vlans = self.ingresar_vlans()
+                servicios = input("Ingrese los servicios de red configurados (separados por coma): ").split(",")
+                self.actualizar_dispositivo(nombre_campus, dispositivo, modelo=modelo, capa=capa, interfaces=interfaces,
+                                            ips_masks=ips_masks, vlans=vlans, servicios=servicios)
+                print("Dispositivo modificado.")
+                return
             print("El dispositivo especificado no existe en el campus.")
         else:
             print("El campus especificado no existe.")
 
     def borrar_dispositivo(self, nombre_campus, nombre_dispositivo):
         if nombre_campus in self.campus:
-            campus = self.campus[nombre_campus]
-            for dispositivo in campus.dispositivos:
-                if dispositivo.nombre == nombre_dispositivo:
-                    campus.dispositivos.remove(dispositivo)
-                    print("Dispositivo eliminado.")
-                    return
+            if self.eliminar_dispositivo(nombre_campus, nombre_dispositivo) is not None:
+                print("Dispositivo eliminado.")
+                return
             print("El dispositivo especificado no existe en el campus.")
         else:
             print("El campus especificado no existe.")
@@ -285,11 +542,13 @@ class AdministradorRedes:
             while True:
                 ip = input(f"Ingrese la dirección IP para la interfaz {interfaz}: ")
                 mask = input(f"Ingrese la máscara de red para la interfaz {interfaz}: ")
-                if self.es_direccion_ipv4(ip):
+                if not self.es_direccion_ipv4(ip):
+                    print("La dirección IP ingresada no es válida. Inténtelo nuevamente.")
+                elif not self.es_mascara_valida(mask):
+                    print("La máscara ingresada no es válida. Inténtelo nuevamente.")
+                else:
                     ips_masks[interfaz] = (ip, mask)
                     break
-                else:
-                    print("La dirección IP ingresada no es válida. Inténtelo nuevamente.")
         return ips_masks
 
     def ingresar_vlans(self):
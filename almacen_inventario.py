@@ -0,0 +1,86 @@
+import json
+import os
+from .diario_cambios import escribir_atomico
+from .json_incremental import iterar_subarboles
+
+FORMATO = 2
+TAMANO_LECTURA = 64 * 1024
+_CABECERA = (json.dumps({"formato": FORMATO}) + "\n").encode("utf-8")
+
+
+# Formato indexado (una línea JSON por registro):
+#   {"formato": 2}
+#   {"campus": <nombre>, "dispositivos": [...]}     una línea por campus
+#   {"indice": {<nombre>: [descripcion, inicio, longitud], ...}}
+#   {"posicion_indice": <byte donde empieza la línea del índice>}
+# Al iniciar solo se leen la última línea y el índice; los dispositivos de cada campus
+# se leen de su rango de bytes la primera vez que se accede a ellos.
+class AlmacenInventario:
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self.indice = {}
+
+    def es_formato_indexado(self):
+        with open(self.ruta, "rb") as archivo:
+            return archivo.readline() == _CABECERA
+
+    def leer_indice(self):
+        with open(self.ruta, "rb") as archivo:
+            archivo.seek(0, os.SEEK_END)
+            tamano = archivo.tell()
+            archivo.seek(max(tamano - 128, 0))
+            cola = json.loads(archivo.read().rstrip(b"\n").rsplit(b"\n", 1)[-1])
+            archivo.seek(cola["posicion_indice"])
+            self.indice = json.loads(archivo.readline())["indice"]
+        return {nombre: datos[0] for nombre, datos in self.indice.items()}
+
+    def _fragmentos(self, inicio, longitud):
+        with open(self.ruta, "rb") as archivo:
+            archivo.seek(inicio)
+            while longitud > 0:
+                fragmento = archivo.read(min(TAMANO_LECTURA, longitud))
+                if not fragmento:
+                    break
+                longitud -= len(fragmento)
+                yield fragmento
+
+    def leer_dispositivos(self, nombre_campus):
+        _, inicio, longitud = self.indice[nombre_campus]
+        for _, dispositivo_info in iterar_subarboles(self._fragmentos(inicio, longitud), "dispositivos"):
+            yield dispositivo_info
+
+    def leer_crudo(self, nombre_campus):
+        _, inicio, longitud = self.indice[nombre_campus]
+        return b"".join(self._fragmentos(inicio, longitud))
+
+    def leer_formato_anterior(self):
+        # Formato original: {"campus": {nombre: descripcion}, "dispositivos": {}, nombre: [dispositivos], ...}
+        # Se decodifica por fragmentos, materializando un dispositivo a la vez
+        with open(self.ruta, "rb") as archivo:
+            fragmentos = iter(lambda: archivo.read(TAMANO_LECTURA), b"")
+            for clave, valor in iterar_subarboles(fragmentos, "*"):
+                if clave == "campus":
+                    for nombre, descripcion in valor.items():
+                        yield "campus", nombre, descripcion
+                elif clave != "dispositivos":
+                    yield "dispositivo", clave, valor
+
+    def escribir(self, campus):
+        # campus: iterable de (nombre, descripcion, dispositivos) donde dispositivos es una lista de
+        # diccionarios o None para copiar sin decodificar la línea ya almacenada de un campus no cargado
+        indice = {}
+
+        def escribir_archivo(archivo):
+            posicion = archivo.write(_CABECERA)
+            for nombre, descripcion, dispositivos in campus:
+                if dispositivos is None:
+                    linea = self.leer_crudo(nombre)
+                else:
+                    linea = (json.dumps({"campus": nombre, "dispositivos": dispositivos}, ensure_ascii=False) + "\n").encode("utf-8")
+                indice[nombre] = [descripcion, posicion, len(linea)]
+                posicion += archivo.write(linea)
+            archivo.write((json.dumps({"indice": indice}, ensure_ascii=False) + "\n").encode("utf-8"))
+            archivo.write((json.dumps({"posicion_indice": posicion}) + "\n").encode("utf-8"))
+
+        escribir_atomico(self.ruta, escribir_archivo, binario=True)
+        self.indice = indice
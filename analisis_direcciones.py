@@ -0,0 +1,162 @@
+import bisect
+import operator
+from array import array
+from itertools import repeat
+from .direcciones_ip import entero_a_ip
+
+# Las claves de ordenamiento empaquetan el valor en los bits altos y el índice o el prefijo en los bajos,
+# así se ordenan enteros simples en lugar de tuplas
+_BITS_INDICE = 24
+_MASCARA_INDICE = (1 << _BITS_INDICE) - 1
+_PREFIJO_INVALIDO = 255
+# Valor con bits no contiguos que se usa en lugar de una máscara que no se pudo interpretar
+_MASCARA_NO_INTERPRETABLE = 0x00000001
+
+
+class _TablaPrefijos(dict):
+    # Hay pocas máscaras distintas en un inventario: cada una se convierte a prefijo una sola vez
+    def __missing__(self, mascara):
+        invertida = ~mascara & 0xFFFFFFFF
+        prefijo = _PREFIJO_INVALIDO if invertida & (invertida + 1) else 32 - invertida.bit_length()
+        self[mascara] = prefijo
+        return prefijo
+
+
+class ResultadoAnalisis:
+    def __init__(self):
+        self.interfaces = 0
+        # [(campus, dispositivo, interfaz, ip, mascara)]
+        self.direcciones_invalidas = []
+        # {ip: [(campus, dispositivo, interfaz)]}
+        self.ips_duplicadas = {}
+        # [(subred_mayor, subred_menor, [(campus, dispositivo, interfaz)], [(campus, dispositivo, interfaz)])]
+        self.subredes_en_conflicto = []
+
+    @property
+    def hay_problemas(self):
+        return bool(self.direcciones_invalidas or self.ips_duplicadas or self.subredes_en_conflicto)
+
+    @staticmethod
+    def _describir_usos(usos, limite=3):
+        texto = ", ".join(f"[{campus}] {dispositivo} {interfaz}" for campus, dispositivo, interfaz in usos[:limite])
+        return texto + (f" y {len(usos) - limite} más" if len(usos) > limite else "")
+
+    def resumen(self, limite=10):
+        lineas = [
+            f"Interfaces analizadas: {self.interfaces}",
+            f"Direcciones o máscaras inválidas: {len(self.direcciones_invalidas)}",
+            f"Direcciones IP duplicadas: {len(self.ips_duplicadas)}",
+            f"Subredes en conflicto: {len(self.subredes_en_conflicto)}",
+        ]
+        for campus, dispositivo, interfaz, ip, mascara in self.direcciones_invalidas[:limite]:
+            lineas.append(f"- Inválida: [{campus}] {dispositivo} {interfaz}: IP {ip}, máscara {mascara}")
+        for ip, usos in list(self.ips_duplicadas.items())[:limite]:
+            lineas.append(f"- IP duplicada {ip}: {self._describir_usos(usos)}")
+        for mayor, menor, usos_mayor, usos_menor in self.subredes_en_conflicto[:limite]:
+            lineas.append(f"- {menor} ({self._describir_usos(usos_menor)}) se solapa con {mayor} ({self._describir_usos(usos_mayor)})")
+        return lineas
+
+
+def analizar(campus):
+    # Todas las direcciones pasan a arreglos de enteros; los cálculos por interfaz se hacen con map
+    # sobre los arreglos y solo se recorre en Python lo que resulta sospechoso.
+    dispositivos = []
+    inicios = array("I")
+    # Para los pocos dispositivos con direcciones en texto: posiciones de las interfaces que sí se agregaron
+    posiciones_parciales = {}
+    ips = array("I")
+    mascaras = array("I")
+    resultado = ResultadoAnalisis()
+    for nombre_campus, datos_campus in campus.items():
+        for dispositivo in datos_campus.dispositivos:
+            inicios.append(len(ips))
+            dispositivos.append((nombre_campus, dispositivo))
+            empaquetadas = dispositivo.direcciones_empaquetadas()
+            if empaquetadas is not None:
+                ips.extend(empaquetadas[0::2])
+                mascaras.extend(empaquetadas[1::2])
+                continue
+            posiciones = posiciones_parciales[len(dispositivos) - 1] = []
+            for posicion, (ip, mascara) in enumerate(dispositivo.direcciones_enteras()):
+                if ip is None:
+                    interfaz, (ip_texto, mascara_texto) = list(dispositivo.ips_masks.items())[posicion]
+                    resultado.direcciones_invalidas.append((nombre_campus, dispositivo.nombre, interfaz, ip_texto, mascara_texto))
+                    continue
+                posiciones.append(posicion)
+                ips.append(ip)
+                mascaras.append(_MASCARA_NO_INTERPRETABLE if mascara is None else mascara)
+    total = len(ips)
+    resultado.interfaces = total + len(resultado.direcciones_invalidas)
+    if total > _MASCARA_INDICE:
+        raise ValueError(f"Demasiadas interfaces para analizar: {total}")
+
+    nombres_interfaces = {}
+
+    def ubicar(i):
+        indice = bisect.bisect_right(inicios, i) - 1
+        nombre_campus, dispositivo = dispositivos[indice]
+        posicion = i - inicios[indice]
+        if indice in posiciones_parciales:
+            posicion = posiciones_parciales[indice][posicion]
+        if indice not in nombres_interfaces:
+            nombres_interfaces[indice] = list(dispositivo.ips_masks)
+        return nombre_campus, dispositivo, nombres_interfaces[indice][posicion]
+
+    def describir(i):
+        nombre_campus, dispositivo, interfaz = ubicar(i)
+        return nombre_campus, dispositivo.nombre, interfaz
+
+    prefijos = array("B", map(_TablaPrefijos().__getitem__, mascaras))
+    if _PREFIJO_INVALIDO in prefijos:
+        for i, prefijo in enumerate(prefijos):
+            if prefijo == _PREFIJO_INVALIDO:
+                nombre_campus, dispositivo, interfaz = ubicar(i)
+                ip_texto, mascara_texto = dispositivo.ips_masks[interfaz]
+                resultado.direcciones_invalidas.append((nombre_campus, dispositivo.nombre, interfaz, ip_texto, mascara_texto))
+
+    # IP duplicadas: solo si hay repetidas se ordena con el índice para agruparlas
+    if len(set(ips)) != total:
+        claves = sorted(map(operator.or_, map(operator.lshift, ips, repeat(_BITS_INDICE)), range(total)))
+        anterior = primera = -1
+        grupo = None
+        for clave in claves:
+            ip = clave >> _BITS_INDICE
+            if ip != anterior:
+                anterior, primera, grupo = ip, clave, None
+                continue
+            if grupo is None:
+                grupo = resultado.ips_duplicadas[entero_a_ip(ip)] = [describir(primera & _MASCARA_INDICE)]
+            grupo.append(describir(clave & _MASCARA_INDICE))
+
+    # Subredes distintas ordenadas por inicio y, con el mismo inicio, de mayor a menor tamaño.
+    # Dos bloques CIDR o son disjuntos o uno contiene al otro, así que basta una pila de bloques abiertos.
+    redes = array("I", map(operator.and_, ips, mascaras))
+    claves_subred = set(map(operator.or_, map(operator.lshift, redes, repeat(8)), prefijos))
+    abiertas = []
+    conflictos = []
+    for subred in sorted(claves_subred):
+        red, prefijo = subred >> 8, subred & 0xFF
+        if prefijo == _PREFIJO_INVALIDO:
+            continue
+        while abiertas and abiertas[-1][1] <= red:
+            abiertas.pop()
+        if abiertas:
+            conflictos.append((abiertas[-1][0], subred))
+        abiertas.append((subred, red + (1 << (32 - prefijo))))
+    if conflictos:
+        involucradas = {}
+        for subred_mayor, subred_menor in conflictos:
+            involucradas[subred_mayor] = []
+            involucradas[subred_menor] = []
+        for i, subred in enumerate(map(operator.or_, map(operator.lshift, redes, repeat(8)), prefijos)):
+            usos = involucradas.get(subred)
+            if usos is not None:
+                usos.append(describir(i))
+        for subred_mayor, subred_menor in conflictos:
+            resultado.subredes_en_conflicto.append((
+                f"{entero_a_ip(subred_mayor >> 8)}/{subred_mayor & 0xFF}",
+                f"{entero_a_ip(subred_menor >> 8)}/{subred_menor & 0xFF}",
+                involucradas[subred_mayor],
+                involucradas[subred_menor],
+            ))
+    return resultado
@@ -0,0 +1,129 @@
+import argparse
+import gc
+import os
+import random
+import shutil
+import tempfile
+import time
+import tracemalloc
+from modules.administrador_redes import AdministradorRedes
+from modules.dispositivo import Dispositivo
+from modules.resultados_benchmark import comparar_resultados, guardar_resultados
+
+MODELOS = ["C9300-48P", "C9500-24Y4C", "ISR4431", "C9200L-24T", "N9K-C93180YC"]
+CAPAS = ["Núcleo", "Distribución", "Acceso"]
+SERVICIOS = ["ssh", "snmp", "ntp", "dhcp", "syslog", "netflow"]
+METRICAS_COMPARADAS = ["importar_s", "guardar_s", "abrir_s", "cargar_todo_s", "tamano_archivo_mib", "memoria_cargado_mib"]
+
+
+def generar_registros(cantidad, dispositivos_por_campus, semilla=1):
+    # Mismo tipo de datos que benchmark_memoria, producidos de a uno para no duplicar el inventario en memoria
+    aleatorio = random.Random(semilla)
+    for i in range(cantidad):
+        nombre_campus = f"campus-{i // dispositivos_por_campus:04d}"
+        interfaces = [f"GigabitEthernet1/0/{n}" for n in range(1, aleatorio.randint(2, 6))]
+        dispositivo = Dispositivo(
+            nombre=f"sw-{i:07d}",
+            modelo=aleatorio.choice(MODELOS),
+            capa=aleatorio.choice(CAPAS),
+            interfaces=interfaces,
+            ips_masks={
+                interfaz: [f"{10 + (i >> 16)}.{(i >> 8) & 255}.{i & 255}.{n + 1}", "255.255.255.0"]
+                for n, interfaz in enumerate(interfaces)
+            },
+            vlans={f"VLAN{v}": str(v) for v in aleatorio.sample(range(10, 60), 3)},
+            servicios=aleatorio.sample(SERVICIOS, 3),
+        )
+        yield nombre_campus, None, dispositivo
+
+
+def cronometrar(funcion):
+    gc.collect()
+    inicio = time.perf_counter()
+    valor = funcion()
+    return valor, time.perf_counter() - inicio
+
+
+def abrir_y_cargar(ruta):
+    administrador = AdministradorRedes(ruta)
+    administrador.cargar_todo()
+    return administrador
+
+
+def medir(cantidad, dispositivos_por_campus, directorio, con_memoria):
+    ruta = os.path.join(directorio, f"inventario-{cantidad}.json")
+    administrador = AdministradorRedes(ruta)
+    importados, importar = cronometrar(lambda: administrador.importar(generar_registros(cantidad, dispositivos_por_campus)))
+    # Segundo guardado con todo el inventario ya en memoria: solo serialización y escritura
+    _, guardar = cronometrar(administrador.guardar_en_archivo)
+    administrador.diario.cerrar()
+    del administrador
+
+    # Apertura: solo el índice de campus; cargar_todo lee los dispositivos de todos los campus
+    administrador, abrir = cronometrar(lambda: AdministradorRedes(ruta))
+    _, cargar_todo = cronometrar(administrador.cargar_todo)
+    administrador.diario.cerrar()
+    del administrador
+
+    resultado = {
+        "caso": f"dispositivos={cantidad}",
+        "dispositivos": importados,
+        "campus": -(-cantidad // dispositivos_por_campus),
+        "importar_s": round(importar, 4),
+        "guardar_s": round(guardar, 4),
+        "abrir_s": round(abrir, 4),
+        "cargar_todo_s": round(cargar_todo, 4),
+        "tamano_archivo_mib": round(os.path.getsize(ruta) / 2 ** 20, 3),
+    }
+    if con_memoria:
+        # En una pasada aparte, porque tracemalloc hace mucho más lenta la carga
+        gc.collect()
+        tracemalloc.start()
+        administrador = abrir_y_cargar(ruta)
+        gc.collect()
+        actual, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        administrador.diario.cerrar()
+        del administrador
+        resultado["memoria_cargado_mib"] = round(actual / 2 ** 20, 2)
+        resultado["memoria_pico_mib"] = round(pico / 2 ** 20, 2)
+        resultado["bytes_por_dispositivo"] = round(actual / max(cantidad, 1))
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mide la importación, el guardado, la carga y la memoria del inventario")
+    parser.add_argument("--cantidades", default="100,1000,10000,100000",
+                        help="Cantidades de dispositivos separadas por comas (hasta 1000000)")
+    parser.add_argument("--dispositivos-por-campus", type=int, default=5000)
+    parser.add_argument("--sin-memoria", action="store_true", help="Omite la medición de memoria con tracemalloc")
+    parser.add_argument("--directorio", help="Directorio para los archivos de inventario (por defecto uno temporal)")
+    parser.add_argument("--salida", default="resultados_inventario.json")
+    parser.add_argument("--comparar", metavar="ANTERIOR", help="Resultados de otra ejecución con los que comparar")
+    args = parser.parse_args()
+    cantidades = [int(valor) for valor in args.cantidades.split(",")]
+
+    directorio = args.directorio or tempfile.mkdtemp(prefix="benchmark-inventario-")
+    resultados = []
+    try:
+        for cantidad in cantidades:
+            resultado = medir(cantidad, args.dispositivos_por_campus, directorio, not args.sin_memoria)
+            resultados.append(resultado)
+            memoria = f", memoria {resultado['memoria_cargado_mib']} MiB" if "memoria_cargado_mib" in resultado else ""
+            print(f"{resultado['caso']}: importar {resultado['importar_s']} s, guardar {resultado['guardar_s']} s, "
+                  f"abrir {resultado['abrir_s']} s, cargar todo {resultado['cargar_todo_s']} s, "
+                  f"archivo {resultado['tamano_archivo_mib']} MiB{memoria}", flush=True)
+    finally:
+        if args.directorio is None:
+            shutil.rmtree(directorio, ignore_errors=True)
+
+    parametros = {clave: valor for clave, valor in vars(args).items() if clave not in ("salida", "comparar", "directorio")}
+    guardar_resultados(args.salida, "inventario", parametros, resultados)
+    print(f"Resultados guardados en {args.salida}")
+    if args.comparar:
+        for linea in comparar_resultados(args.comparar, resultados, METRICAS_COMPARADAS):
+            print(linea)
+
+
+if __name__ == "__main__":
+    main()
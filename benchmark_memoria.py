@@ -0,0 +1,75 @@
+import argparse
+import gc
+import json
+import random
+import tracemalloc
+from modules.dispositivo import Dispositivo
+
+
+# Representación original basada en __dict__, conservada como referencia de comparación
+class DispositivoAnterior:
+    def __init__(self, nombre, modelo, capa, interfaces, ips_masks, vlans, servicios):
+        self.nombre = nombre
+        self.modelo = modelo
+        self.capa = capa
+        self.interfaces = interfaces
+        self.ips_masks = ips_masks
+        self.vlans = vlans
+        self.servicios = servicios
+
+
+MODELOS = ["C9300-48P", "C9500-24Y4C", "ISR4431", "C9200L-24T", "N9K-C93180YC"]
+CAPAS = ["Núcleo", "Distribución", "Acceso"]
+SERVICIOS = ["ssh", "snmp", "ntp", "dhcp", "syslog", "netflow"]
+
+
+def generar_datos(cantidad, semilla=1):
+    aleatorio = random.Random(semilla)
+    datos = []
+    for i in range(cantidad):
+        interfaces = [f"GigabitEthernet1/0/{n}" for n in range(1, aleatorio.randint(2, 6))]
+        datos.append({
+            "nombre": f"sw-{i:07d}",
+            "modelo": aleatorio.choice(MODELOS),
+            "capa": aleatorio.choice(CAPAS),
+            "interfaces": interfaces,
+            "ips_masks": {
+                interfaz: [f"10.{(i >> 8) & 255}.{i & 255}.{n + 1}", "255.255.255.0"]
+                for n, interfaz in enumerate(interfaces)
+            },
+            "vlans": {f"VLAN{v}": str(v) for v in aleatorio.sample(range(10, 60), 3)},
+            "servicios": aleatorio.sample(SERVICIOS, 3),
+        })
+    # Se pasa por JSON para que cada cadena sea un objeto distinto, como al cargar el archivo
+    return json.loads(json.dumps(datos))
+
+
+def medir(clase, cantidad):
+    gc.collect()
+    tracemalloc.start()
+    inicial = tracemalloc.get_traced_memory()[0]
+    datos = generar_datos(cantidad)
+    instancias = [clase(**info) for info in datos]
+    # Solo queda en memoria lo que retienen las instancias
+    del datos
+    gc.collect()
+    actual = tracemalloc.get_traced_memory()[0] - inicial
+    tracemalloc.stop()
+    del instancias
+    return actual
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara el uso de memoria de la representación de dispositivos")
+    parser.add_argument("--cantidad", type=int, default=100000)
+    args = parser.parse_args()
+    anterior = medir(DispositivoAnterior, args.cantidad)
+    compacta = medir(Dispositivo, args.cantidad)
+    print(f"Dispositivos: {args.cantidad}")
+    print(f"Representación anterior: {anterior / 2 ** 20:.1f} MiB ({anterior / args.cantidad:.0f} bytes/dispositivo)")
+    print(f"Representación compacta: {compacta / 2 ** 20:.1f} MiB ({compacta / args.cantidad:.0f} bytes/dispositivo)")
+    print(f"Reducción: {100 * (1 - compacta / anterior):.1f}%")
+
+
+if __name__ == "__main__":
+    main()
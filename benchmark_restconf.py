@@ -0,0 +1,183 @@
+import argparse
+import asyncio
+import contextlib
+import itertools
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import aiohttp
+import requests
+from modules.resiliencia import PoliticaReintentos
+from modules.restconf_operations import RESTCONFOperations
+from modules.restconf_operations_async import RESTCONFOperationsAsync
+from modules.resultados_benchmark import comparar_resultados, guardar_resultados
+
+SERVIDOR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "servidor_restconf_simulado.py")
+USUARIO = CONTRASENA = "admin"
+# Método del cliente y argumentos con que se invoca
+OPERACIONES = {
+    "es_dispositivo_operativo": (),
+    "obtener_configuracion_running": (),
+    "obtener_tabla_enrutamiento": (),
+    "crear_interfaz": ("GigabitEthernet1/0/1", "Benchmark", "10.0.0.1", "255.255.255.0"),
+}
+METRICAS_COMPARADAS = ["solicitudes_por_segundo", "latencia_p50_ms", "latencia_p99_ms", "errores"]
+
+
+def iniciar_servidor(args):
+    # El servidor corre en otro proceso para no competir por el GIL con el cliente que se mide
+    proceso = subprocess.Popen(
+        [sys.executable, SERVIDOR, "--latencia", str(args.latencia), "--variacion", str(args.variacion),
+         "--tamano", str(args.tamano), "--tasa-error", str(args.tasa_error), "--semilla", str(args.semilla),
+         "--usuario", USUARIO, "--contrasena", CONTRASENA],
+        stdout=subprocess.PIPE, text=True,
+    )
+    linea = proceso.stdout.readline()
+    if not linea.startswith("Escuchando en "):
+        proceso.kill()
+        raise RuntimeError("No se pudo iniciar el servidor RESTCONF simulado")
+    return proceso, linea.split()[-1]
+
+
+def percentil(ordenadas, fraccion):
+    if not ordenadas:
+        return None
+    return ordenadas[min(len(ordenadas) - 1, int(fraccion * len(ordenadas)))]
+
+
+def resumir(modo, operacion, concurrencia, latencias, errores, duracion):
+    ordenadas = sorted(latencias)
+    return {
+        "caso": f"{modo}/{operacion}/c{concurrencia}",
+        "modo": modo,
+        "operacion": operacion,
+        "concurrencia": concurrencia,
+        "solicitudes": len(latencias),
+        "errores": errores,
+        "duracion_s": round(duracion, 4),
+        "solicitudes_por_segundo": round(len(latencias) / duracion, 1) if duracion else None,
+        "latencia_media_ms": round(1000 * statistics.fmean(ordenadas), 3) if ordenadas else None,
+        "latencia_p50_ms": round(1000 * percentil(ordenadas, 0.50), 3) if ordenadas else None,
+        "latencia_p90_ms": round(1000 * percentil(ordenadas, 0.90), 3) if ordenadas else None,
+        "latencia_p99_ms": round(1000 * percentil(ordenadas, 0.99), 3) if ordenadas else None,
+        "latencia_maxima_ms": round(1000 * ordenadas[-1], 3) if ordenadas else None,
+    }
+
+
+def medir_sincrono(direccion, operacion, concurrencia, solicitudes, reintentos):
+    # Un cliente (con su pool de conexiones) por hilo, como en EjecutorFlota
+    argumentos = OPERACIONES[operacion]
+    siguiente = itertools.count()
+    latencias = []
+    errores = [0]
+    lock = threading.Lock()
+
+    def trabajar():
+        propias, fallidas = [], 0
+        with RESTCONFOperations(direccion, USUARIO, CONTRASENA, cache=None, interruptores=None,
+                                reintentos=reintentos, esquema="http") as restconf:
+            funcion = getattr(restconf, operacion)
+            while next(siguiente) < solicitudes:
+                inicio = time.perf_counter()
+                try:
+                    exitoso = funcion(*argumentos) not in (None, False)
+                except requests.RequestException:
+                    exitoso = False
+                propias.append(time.perf_counter() - inicio)
+                fallidas += not exitoso
+        with lock:
+            latencias.extend(propias)
+            errores[0] += fallidas
+
+    hilos = [threading.Thread(target=trabajar) for _ in range(concurrencia)]
+    inicio = time.perf_counter()
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    return latencias, errores[0], time.perf_counter() - inicio
+
+
+async def _medir_asincrono(direccion, operacion, concurrencia, solicitudes, reintentos):
+    # Un solo cliente con tantas conexiones y tareas como el nivel de concurrencia
+    argumentos = OPERACIONES[operacion]
+    siguiente = itertools.count()
+    latencias = []
+    errores = 0
+
+    async with RESTCONFOperationsAsync(direccion, USUARIO, CONTRASENA, tamano_pool=concurrencia, cache=None,
+                                       interruptores=None, reintentos=reintentos, esquema="http") as restconf:
+        funcion = getattr(restconf, operacion)
+
+        async def trabajar():
+            nonlocal errores
+            while next(siguiente) < solicitudes:
+                inicio = time.perf_counter()
+                try:
+                    exitoso = await funcion(*argumentos) not in (None, False)
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    exitoso = False
+                latencias.append(time.perf_counter() - inicio)
+                errores += not exitoso
+
+        inicio = time.perf_counter()
+        await asyncio.gather(*(trabajar() for _ in range(concurrencia)))
+        return latencias, errores, time.perf_counter() - inicio
+
+
+def medir_asincrono(*argumentos):
+    return asyncio.run(_medir_asincrono(*argumentos))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mide el rendimiento de los clientes RESTCONF contra un dispositivo simulado")
+    parser.add_argument("--concurrencias", default="1,4,16,64", help="Niveles de concurrencia separados por comas")
+    parser.add_argument("--solicitudes", type=int, default=2000, help="Solicitudes por nivel de concurrencia")
+    parser.add_argument("--operacion", choices=sorted(OPERACIONES), action="append",
+                        help="Se puede repetir; por defecto obtener_configuracion_running")
+    parser.add_argument("--modo", choices=["sincrono", "asincrono", "ambos"], default="ambos")
+    parser.add_argument("--latencia", type=float, default=0.005, help="Latencia simulada del dispositivo en segundos")
+    parser.add_argument("--variacion", type=float, default=0.0)
+    parser.add_argument("--tamano", type=int, default=16 * 1024, help="Bytes aproximados de las respuestas GET")
+    parser.add_argument("--tasa-error", type=float, default=0.0)
+    parser.add_argument("--reintentos", type=int, default=1, help="Intentos por solicitud (1 mide cada solicitud sin reintentar)")
+    parser.add_argument("--semilla", type=int, default=1)
+    parser.add_argument("--salida", default="resultados_restconf.json")
+    parser.add_argument("--comparar", metavar="ANTERIOR", help="Resultados de otra ejecución con los que comparar")
+    args = parser.parse_args()
+    concurrencias = [int(valor) for valor in args.concurrencias.split(",")]
+    operaciones = args.operacion or ["obtener_configuracion_running"]
+    modos = ["sincrono", "asincrono"] if args.modo == "ambos" else [args.modo]
+    reintentos = PoliticaReintentos(intentos=args.reintentos, espera_base=0.01)
+
+    proceso, direccion = iniciar_servidor(args)
+    resultados = []
+    try:
+        # Los clientes informan cada respuesta de error por consola; durante la medición se descarta
+        with open(os.devnull, "w") as nulo:
+            for modo, operacion, concurrencia in itertools.product(modos, operaciones, concurrencias):
+                medir = medir_sincrono if modo == "sincrono" else medir_asincrono
+                with contextlib.redirect_stdout(nulo):
+                    resultado = resumir(modo, operacion, concurrencia,
+                                        *medir(direccion, operacion, concurrencia, args.solicitudes, reintentos))
+                resultados.append(resultado)
+                print(f"{resultado['caso']}: {resultado['solicitudes_por_segundo']} sol/s, "
+                      f"p50 {resultado['latencia_p50_ms']} ms, p99 {resultado['latencia_p99_ms']} ms, "
+                      f"errores {resultado['errores']}", flush=True)
+    finally:
+        proceso.terminate()
+        proceso.wait()
+
+    parametros = {clave: valor for clave, valor in vars(args).items() if clave not in ("salida", "comparar")}
+    guardar_resultados(args.salida, "restconf", parametros, resultados)
+    print(f"Resultados guardados en {args.salida}")
+    if args.comparar:
+        for linea in comparar_resultados(args.comparar, resultados, METRICAS_COMPARADAS):
+            print(linea)
+
+
+if __name__ == "__main__":
+    main()
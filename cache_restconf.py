@@ -0,0 +1,92 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+
+
+class EntradaCache:
+    def __init__(self, texto, tamano, expira, etag=None, ultima_modificacion=None):
+        # Se guarda el JSON como texto: cada lectura obtiene su propia copia y nadie puede alterar la cache
+        self.texto = texto
+        self.tamano = tamano
+        self.expira = expira
+        self.etag = etag
+        self.ultima_modificacion = ultima_modificacion
+
+    @property
+    def valor(self):
+        return json.loads(self.texto)
+
+    def vigente(self):
+        return time.monotonic() < self.expira
+
+    def revalidable(self):
+        return self.etag is not None or self.ultima_modificacion is not None
+
+
+class CacheRESTCONF:
+    def __init__(self, ttl=30, max_entradas=128, max_bytes=256 * 1024 * 1024):
+        self.ttl = ttl
+        self.max_entradas = max_entradas
+        self.max_bytes = max_bytes
+        self._entradas = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+        self.revalidaciones = 0
+
+    def obtener(self, ip, ruta, usuario=None):
+        # La clave incluye el usuario: un cliente con otras credenciales no recibe lo que leyó otro
+        clave = (ip, ruta, usuario)
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is None:
+                self.fallos += 1
+                return None
+            self._entradas.move_to_end(clave)
+            if entrada.vigente():
+                self.aciertos += 1
+            return entrada
+
+    def guardar(self, ip, ruta, texto, tamano, etag=None, ultima_modificacion=None, usuario=None):
+        if tamano > self.max_bytes:
+            return
+        clave = (ip, ruta, usuario)
+        with self._lock:
+            self._quitar(clave)
+            self._entradas[clave] = EntradaCache(texto, tamano, time.monotonic() + self.ttl, etag, ultima_modificacion)
+            self._bytes += tamano
+            # Desalojo LRU por cantidad de entradas y por tamaño total
+            while len(self._entradas) > self.max_entradas or self._bytes > self.max_bytes:
+                clave = next(iter(self._entradas))
+                self._quitar(clave)
+
+    def refrescar(self, entrada):
+        with self._lock:
+            entrada.expira = time.monotonic() + self.ttl
+            self.revalidaciones += 1
+
+    def invalidar(self, ip, rutas=None):
+        with self._lock:
+            for clave in list(self._entradas):
+                # Una escritura cambia la configuración para todos los usuarios del dispositivo
+                if clave[0] != ip:
+                    continue
+                # Se invalida la ruta escrita junto con sus ancestros y descendientes en el árbol YANG
+                if rutas is None or any(clave[1].startswith(ruta) or ruta.startswith(clave[1]) for ruta in rutas):
+                    self._quitar(clave)
+
+    def limpiar(self):
+        with self._lock:
+            self._entradas.clear()
+            self._bytes = 0
+
+    def _quitar(self, clave):
+        entrada = self._entradas.pop(clave, None)
+        if entrada is not None:
+            self._bytes -= entrada.tamano
+
+
+# Cache compartida por todas las instancias de RESTCONFOperations del proceso
+cache_compartida = CacheRESTCONF()
@@ -1,5 +1,37 @@
 class Campus:
-    def __init__(self, nombre, descripcion):
+    __slots__ = ("nombre", "descripcion", "_dispositivos", "_cargador")
+
+    def __init__(self, nombre, descripcion, cargador=None):
         self.nombre = nombre
         self.descripcion = descripcion
-        self.dispositivos = []
+        self._dispositivos = {}
+        # Si hay cargador, los dispositivos se leen del almacenamiento en el primer acceso
+        self._cargador = cargador
+
+    @property
+    def cargado(self):
+        return self._cargador is None
+
+    def cargar(self):
+        if self._cargador is not None:
+            cargador, self._cargador = self._cargador, None
+            cargador(self)
+
+    @property
+    def dispositivos(self):
+        # Lista nueva en cada acceso, como la lista original: indexarla funciona, pero agregarle elementos
+        # no cambia el campus (para eso está agregar_dispositivo o AdministradorRedes.registrar_dispositivo)
+        self.cargar()
+        return list(self._dispositivos.values())
+
+    def agregar_dispositivo(self, dispositivo):
+        self.cargar()
+        self._dispositivos[dispositivo.nombre] = dispositivo
+
+    def obtener_dispositivo(self, nombre):
+        self.cargar()
+        return self._dispositivos.get(nombre)
+
+    def quitar_dispositivo(self, nombre):
+        self.cargar()
+        return self._dispositivos.pop(nombre, None)
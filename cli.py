@@ -0,0 +1,280 @@
+import argparse
+import json
+import os
+import sys
+from modules.administrador_redes import AdministradorRedes
+from modules.campus import Campus
+from modules.dispositivo import Dispositivo
+from modules.ejecutor_flota import EjecutorFlota
+from modules.importacion import FORMATOS_IMPORTACION, leer_registros
+from modules.metricas import metricas
+from modules.reportes import FORMATOS_REPORTE, generar_reporte, escribir_reporte
+
+# Operaciones RESTCONF disponibles y los argumentos que recibe cada una
+OPERACIONES = {
+    "es_dispositivo_operativo": [],
+    "obtener_configuracion_running": [],
+    "obtener_tabla_enrutamiento": [],
+    "crear_interfaz": ["nombre_interfaz", "descripcion", "direccion_ip", "mascara"],
+    "borrar_interfaz": ["nombre_interfaz"],
+    "crear_ruta": ["destino", "mascara", "siguiente_salto"],
+    "configurar_protocolo_enrutamiento": ["protocolo", "instancia", "parametros_json"],
+}
+ARGUMENTOS_IPV4 = {"direccion_ip", "mascara", "destino", "siguiente_salto"}
+
+
+def error(mensaje):
+    print(mensaje, file=sys.stderr)
+
+
+def entero_positivo(valor):
+    numero = int(valor)
+    if numero < 1:
+        raise argparse.ArgumentTypeError(f"debe ser al menos 1: {valor}")
+    return numero
+
+
+def formato_por_extension(ruta, formatos, por_defecto):
+    extension = os.path.splitext(ruta)[1].lstrip(".").lower()
+    return extension if extension in formatos else por_defecto
+
+
+def comando_importar(administrador, args):
+    formato = args.formato or formato_por_extension(args.entrada, FORMATOS_IMPORTACION, "jsonl")
+    archivo = sys.stdin if args.entrada == "-" else open(args.entrada, "r", encoding="utf-8", newline="")
+    errores = 0
+
+    def registros_validos():
+        nonlocal errores
+        for linea, nombre_campus, descripcion, info, mensaje in leer_registros(archivo, formato, administrador.es_direccion_ipv4):
+            if mensaje is not None:
+                errores += 1
+                error(f"{args.entrada}:{linea}: {mensaje}")
+            elif info is None:
+                yield nombre_campus, descripcion, None
+            else:
+                yield nombre_campus, None, Dispositivo(**info)
+
+    try:
+        cantidad = administrador.importar(registros_validos())
+    finally:
+        if archivo is not sys.stdin:
+            archivo.close()
+    print(f"Dispositivos importados: {cantidad}, registros con errores: {errores}")
+    resultado = administrador.analizar_direcciones()
+    if resultado.hay_problemas:
+        for linea in resultado.resumen():
+            error(linea)
+    return 1 if errores else 0
+
+
+def comando_analizar(administrador, args):
+    resultado = administrador.analizar_direcciones()
+    for linea in resultado.resumen(args.limite):
+        print(linea)
+    return 1 if resultado.hay_problemas else 0
+
+
+def comando_exportar(administrador, args):
+    formato = args.formato or formato_por_extension(args.salida, FORMATOS_REPORTE, "texto")
+    if args.campus is not None and args.campus not in administrador.campus:
+        error(f"El campus {args.campus} no existe.")
+        return 1
+    if args.salida == "-":
+        sys.stdout.writelines(generar_reporte(administrador.campus, formato, args.campus, args.capa))
+    else:
+        escribir_reporte(args.salida, administrador.campus, formato, args.campus, args.capa)
+    return 0
+
+
+def seleccionar_campus(administrador, nombres_campus, capa, nombres_dispositivos):
+    # Copias de los campus con solo los dispositivos seleccionados, para el ejecutor de flota
+    seleccion = []
+    for nombre in nombres_campus or list(administrador.campus):
+        if nombre not in administrador.campus:
+            error(f"El campus {nombre} no existe.")
+            continue
+        origen = administrador.campus[nombre]
+        campus = Campus(nombre, origen.descripcion)
+        for dispositivo in origen.dispositivos:
+            if capa is not None and dispositivo.capa != capa:
+                continue
+            if nombres_dispositivos and dispositivo.nombre not in nombres_dispositivos:
+                continue
+            campus.agregar_dispositivo(dispositivo)
+        seleccion.append(campus)
+    return seleccion
+
+
+def argumentos_operacion(administrador, operacion, valores):
+    nombres = OPERACIONES[operacion]
+    if len(valores) != len(nombres):
+        raise ValueError(f"{operacion} espera los argumentos: {' '.join(nombres) or '(ninguno)'}")
+    argumentos = []
+    for nombre, valor in zip(nombres, valores):
+        if nombre in ARGUMENTOS_IPV4 and not administrador.es_direccion_ipv4(valor):
+            raise ValueError(f"El valor {valor!r} de {nombre} no es una dirección IPv4 válida")
+        if nombre == "mascara" and not administrador.es_mascara_valida(valor):
+            raise ValueError(f"La máscara {valor!r} no tiene los bits en uno contiguos")
+        if nombre == "parametros_json":
+            valor = json.loads(valor)
+        argumentos.append(valor)
+    return argumentos
+
+
+def comando_restconf(administrador, args):
+    try:
+        argumentos = argumentos_operacion(administrador, args.operacion, args.argumentos)
+    except ValueError as excepcion:
+        error(str(excepcion))
+        return 2
+    contrasena = args.contrasena or os.environ.get("RESTCONF_CONTRASENA")
+    if contrasena is None:
+        error("Indique la contraseña con --contrasena o la variable de entorno RESTCONF_CONTRASENA.")
+        return 2
+    lista_campus = seleccionar_campus(administrador, args.campus, args.capa, set(args.dispositivo or ()))
+    ejecutor = EjecutorFlota(args.usuario, contrasena, max_global=args.concurrencia,
+                             max_por_campus=args.concurrencia_campus, timeout=args.timeout)
+    guardar_instantaneas = args.instantaneas and args.operacion == "obtener_configuracion_running"
+    if guardar_instantaneas:
+        # refrescar=True: la instantánea debe registrar la configuración actual, no la guardada en caché
+        argumentos = [True]
+    fallidos = 0
+    for resultado in ejecutor.ejecutar(lista_campus, args.operacion, *argumentos):
+        exitoso = resultado.exitoso and bool(resultado.resultado)
+        if not exitoso:
+            fallidos += 1
+        registro = {
+            "campus": resultado.campus,
+            "dispositivo": resultado.dispositivo,
+            "ip": resultado.ip,
+            "exitoso": exitoso,
+            "error": resultado.error,
+            "duracion": round(resultado.duracion, 3),
+            "resultado": resultado.resultado,
+        }
+        if guardar_instantaneas and exitoso:
+            # En lugar de la configuración completa se informan las rutas que cambiaron desde la última instantánea
+            registro.update(instantanea_y_cambios(administrador.instantaneas, resultado.ip, resultado.resultado))
+            registro["resultado"] = True
+        print(json.dumps(registro, ensure_ascii=False, default=str), flush=True)
+    return 1 if fallidos else 0
+
+
+def instantanea_y_cambios(almacen, ip, configuracion):
+    anteriores = almacen.listar(ip)
+    id_instantanea, _, _ = almacen.guardar(ip, configuracion)
+    cambios = almacen.comparar(ip, anteriores[-1]["id"], id_instantanea) if anteriores else []
+    return {"instantanea": id_instantanea, "cambios": [f"{tipo} {ruta}" for ruta, tipo, _, _ in cambios]}
+
+
+def comando_instantaneas(administrador, args):
+    almacen = administrador.instantaneas
+    if args.comparar is None:
+        for entrada in almacen.listar(args.ip):
+            print(json.dumps(entrada))
+        return 0
+    try:
+        cambios = almacen.comparar(args.ip, *args.comparar)
+    except KeyError as excepcion:
+        error(excepcion.args[0])
+        return 2
+    for ruta, tipo, antes, despues in cambios:
+        print(json.dumps({"ruta": ruta, "tipo": tipo, "antes": antes, "despues": despues}, ensure_ascii=False))
+    return 1 if cambios else 0
+
+
+def comando_buscar(administrador, args):
+    inventario = administrador.inventario
+    if args.nombre is not None:
+        encontrados = inventario.buscar_por_nombre(args.nombre)
+    elif args.ip is not None:
+        encontrados = inventario.buscar_por_ip(args.ip)
+    elif args.vlan is not None:
+        encontrados = inventario.buscar_por_vlan(args.vlan)
+    elif args.servicio is not None:
+        encontrados = inventario.buscar_por_servicio(args.servicio)
+    elif args.capa is not None:
+        encontrados = inventario.buscar_por_capa(args.capa)
+    else:
+        red, _, mascara = args.subred.partition("/")
+        encontrados = inventario.buscar_en_subred(red, mascara or "32")
+    for nombre_campus, dispositivo in encontrados:
+        registro = {"campus": nombre_campus}
+        registro.update(dispositivo.a_diccionario())
+        print(json.dumps(registro, ensure_ascii=False))
+    return 0 if encontrados else 1
+
+
+def crear_parser():
+    parser = argparse.ArgumentParser(description="Administrador de Redes en modo no interactivo")
+    parser.add_argument("archivo", help="Archivo de inventario a cargar o crear")
+    parser.add_argument("--metricas", metavar="RUTA",
+                        help="Registra latencias y errores y los exporta al terminar (.json o formato de texto de Prometheus)")
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+
+    importar = subparsers.add_parser("importar", help="Importa campus y dispositivos desde CSV o JSON Lines")
+    importar.add_argument("entrada", help="Archivo de entrada ('-' para la entrada estándar)")
+    importar.add_argument("--formato", choices=sorted(FORMATOS_IMPORTACION))
+    importar.set_defaults(funcion=comando_importar)
+
+    exportar = subparsers.add_parser("exportar", help="Exporta el inventario como reporte")
+    exportar.add_argument("salida", help="Archivo de salida ('-' para la salida estándar)")
+    exportar.add_argument("--formato", choices=sorted(FORMATOS_REPORTE))
+    exportar.add_argument("--campus")
+    exportar.add_argument("--capa")
+    exportar.set_defaults(funcion=comando_exportar)
+
+    restconf = subparsers.add_parser("restconf", help="Ejecuta una operación RESTCONF en los dispositivos seleccionados")
+    restconf.add_argument("operacion", choices=sorted(OPERACIONES))
+    restconf.add_argument("argumentos", nargs="*")
+    restconf.add_argument("--usuario", required=True)
+    restconf.add_argument("--contrasena")
+    restconf.add_argument("--campus", action="append", help="Se puede repetir; por defecto todos los campus")
+    restconf.add_argument("--capa")
+    restconf.add_argument("--dispositivo", action="append", help="Se puede repetir")
+    restconf.add_argument("--concurrencia", type=entero_positivo, default=32)
+    restconf.add_argument("--concurrencia-campus", type=entero_positivo, default=8)
+    restconf.add_argument("--timeout", type=float, default=30)
+    restconf.add_argument("--instantaneas", action="store_true",
+                          help="Con obtener_configuracion_running, guarda una instantánea por dispositivo e informa los cambios")
+    restconf.set_defaults(funcion=comando_restconf)
+
+    analizar = subparsers.add_parser("analizar", help="Busca direcciones inválidas, IP duplicadas y subredes solapadas")
+    analizar.add_argument("--limite", type=int, default=10, help="Cantidad máxima de casos a mostrar por tipo")
+    analizar.set_defaults(funcion=comando_analizar)
+
+    instantaneas = subparsers.add_parser("instantaneas", help="Lista o compara instantáneas de configuración de un dispositivo")
+    instantaneas.add_argument("ip")
+    instantaneas.add_argument("--comparar", nargs=2, type=int, metavar=("ORIGEN", "DESTINO"))
+    instantaneas.set_defaults(funcion=comando_instantaneas)
+
+    buscar = subparsers.add_parser("buscar", help="Busca dispositivos en el inventario")
+    criterio = buscar.add_mutually_exclusive_group(required=True)
+    criterio.add_argument("--nombre")
+    criterio.add_argument("--ip")
+    criterio.add_argument("--vlan")
+    criterio.add_argument("--servicio")
+    criterio.add_argument("--capa")
+    criterio.add_argument("--subred", help="Red en formato 10.0.0.0/24 o 10.0.0.0/255.255.255.0")
+    buscar.set_defaults(funcion=comando_buscar)
+    return parser
+
+
+def main(argv=None):
+    args = crear_parser().parse_args(argv)
+    if args.metricas:
+        metricas.habilitar()
+    try:
+        administrador = AdministradorRedes(args.archivo)
+        try:
+            return args.funcion(administrador, args)
+        finally:
+            administrador.diario.cerrar()
+    finally:
+        if args.metricas:
+            metricas.exportar(args.metricas)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+import json
+import os
+import tempfile
+
+
+def escribir_atomico(ruta, escribir, binario=False):
+    # Se escribe en un temporal del mismo directorio y se reemplaza con rename, que es atómico
+    directorio = os.path.dirname(os.path.abspath(ruta))
+    descriptor, ruta_temporal = tempfile.mkstemp(dir=directorio, prefix=".tmp-", suffix=os.path.basename(ruta))
+    try:
+        archivo = os.fdopen(descriptor, "wb") if binario else os.fdopen(descriptor, "w", encoding="utf-8")
+        with archivo:
+            escribir(archivo)
+            archivo.flush()
+            os.fsync(archivo.fileno())
+        os.replace(ruta_temporal, ruta)
+    except BaseException:
+        if os.path.exists(ruta_temporal):
+            os.remove(ruta_temporal)
+        raise
+    _sincronizar_directorio(directorio)
+
+
+def _sincronizar_directorio(directorio):
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    descriptor = os.open(directorio, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
+
+class DiarioCambios:
+    def __init__(self, ruta, sincronizar=True):
+        self.ruta = ruta
+        self.sincronizar = sincronizar
+        self.entradas = 0
+        self._archivo = None
+
+    def registrar(self, operacion, **datos):
+        if self._archivo is None:
+            self._archivo = open(self.ruta, "a", encoding="utf-8")
+        datos["op"] = operacion
+        self._archivo.write(json.dumps(datos, ensure_ascii=False) + "\n")
+        self._archivo.flush()
+        if self.sincronizar:
+            os.fsync(self._archivo.fileno())
+        self.entradas += 1
+
+    def leer(self):
+        if not os.path.exists(self.ruta):
+            return
+        with open(self.ruta, "r", encoding="utf-8") as archivo:
+            for linea in archivo:
+                try:
+                    entrada = json.loads(linea)
+                except json.JSONDecodeError:
+                    # Una línea incompleta solo puede ser la última, escrita durante una caída
+                    print(f"Se descartó una entrada incompleta del diario {self.ruta}.")
+                    break
+                self.entradas += 1
+                yield entrada
+
+    def vaciar(self):
+        self.cerrar()
+        escribir_atomico(self.ruta, lambda archivo: None)
+        self.entradas = 0
+
+    def cerrar(self):
+        if self._archivo is not None:
+            self._archivo.close()
+            self._archivo = None
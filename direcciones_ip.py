@@ -0,0 +1,35 @@
+import functools
+import socket
+import struct
+
+
+def ip_a_entero(direccion):
+    try:
+        return struct.unpack("!I", socket.inet_aton(direccion.strip()))[0]
+    except (OSError, AttributeError):
+        return None
+
+
+def entero_a_ip(valor):
+    return socket.inet_ntoa(struct.pack("!I", valor))
+
+
+@functools.lru_cache(maxsize=256)
+def mascara_a_prefijo(mascara):
+    # Acepta máscaras en formato decimal punteado ("255.255.255.0") o como longitud de prefijo ("24" o "/24")
+    texto = str(mascara).strip().lstrip("/")
+    if texto.isdigit():
+        prefijo = int(texto)
+        return prefijo if prefijo <= 32 else None
+    valor = ip_a_entero(texto)
+    if valor is None:
+        return None
+    invertida = ~valor & 0xFFFFFFFF
+    # Una máscara válida tiene todos sus bits en uno contiguos a la izquierda
+    if invertida & (invertida + 1):
+        return None
+    return 32 - invertida.bit_length()
+
+
+def prefijo_a_mascara(prefijo):
+    return (0xFFFFFFFF << (32 - prefijo)) & 0xFFFFFFFF
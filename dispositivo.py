@@ -1,4 +1,33 @@
+import sys
+from array import array
+from .direcciones_ip import ip_a_entero, entero_a_ip, mascara_a_prefijo, prefijo_a_mascara
+
+# Las capas se guardan como índice en esta tabla compartida por todas las instancias
+CAPAS = ["Núcleo", "Distribución", "Acceso", "Desconocida"]
+_INDICE_CAPAS = {capa: indice for indice, capa in enumerate(CAPAS)}
+
+
+def _indice_capa(capa):
+    indice = _INDICE_CAPAS.get(capa)
+    if indice is None:
+        indice = _INDICE_CAPAS[capa] = len(CAPAS)
+        CAPAS.append(capa)
+    return indice
+
+
+def _internar(valor):
+    return sys.intern(valor) if isinstance(valor, str) else valor
+
+
+def _empaquetar_ipv4(texto):
+    # Solo se empaqueta si el texto se puede reconstruir exactamente a partir del entero
+    valor = ip_a_entero(texto)
+    return valor if valor is not None and entero_a_ip(valor) == texto else None
+
+
 class Dispositivo:
+    __slots__ = ("nombre", "_modelo", "_capa", "_interfaces", "_claves_ip", "_direcciones", "_vlans", "_servicios")
+
     def __init__(self, nombre, modelo, capa, interfaces, ips_masks, vlans, servicios):
         self.nombre = nombre
         self.modelo = modelo
@@ -7,3 +36,97 @@ class Dispositivo:
         self.ips_masks = ips_masks
         self.vlans = vlans
         self.servicios = servicios
+
+    @property
+    def modelo(self):
+        return self._modelo
+
+    @modelo.setter
+    def modelo(self, valor):
+        self._modelo = _internar(valor)
+
+    @property
+    def capa(self):
+        return CAPAS[self._capa]
+
+    @capa.setter
+    def capa(self, valor):
+        self._capa = _indice_capa(valor)
+
+    # Las colecciones se guardan compactas y se devuelven como listas y diccionarios nuevos, con los mismos
+    # tipos que los atributos originales. Modificar la copia no cambia el dispositivo: para eso se asigna
+    # el atributo completo (o se usa AdministradorRedes.actualizar_dispositivo, que además actualiza los índices).
+    @property
+    def interfaces(self):
+        return list(self._interfaces)
+
+    @interfaces.setter
+    def interfaces(self, valor):
+        self._interfaces = tuple(_internar(interfaz) for interfaz in valor)
+
+    @property
+    def ips_masks(self):
+        if isinstance(self._direcciones, tuple):
+            return dict(zip(self._claves_ip, self._direcciones))
+        direcciones = self._direcciones
+        return {
+            interfaz: (entero_a_ip(direcciones[2 * i]), entero_a_ip(direcciones[2 * i + 1]))
+            for i, interfaz in enumerate(self._claves_ip)
+        }
+
+    @ips_masks.setter
+    def ips_masks(self, valor):
+        self._claves_ip = tuple(_internar(interfaz) for interfaz in valor)
+        empaquetadas = array("I")
+        for ip, mascara in valor.values():
+            ip_entera = _empaquetar_ipv4(ip)
+            mascara_entera = _empaquetar_ipv4(mascara)
+            if ip_entera is None or mascara_entera is None:
+                # Valores que no son IPv4 canónicas se conservan como texto
+                self._direcciones = tuple((ip, _internar(mascara)) for ip, mascara in valor.values())
+                return
+            empaquetadas.append(ip_entera)
+            empaquetadas.append(mascara_entera)
+        self._direcciones = empaquetadas
+
+    def direcciones_enteras(self):
+        # Pares (ip, máscara) como enteros de 32 bits; None en lo que no se pueda interpretar como IPv4
+        if isinstance(self._direcciones, tuple):
+            pares = []
+            for ip, mascara in self._direcciones:
+                prefijo = mascara_a_prefijo(mascara)
+                pares.append((ip_a_entero(ip), prefijo_a_mascara(prefijo) if prefijo is not None else None))
+            return pares
+        direcciones = self._direcciones
+        return [(direcciones[i], direcciones[i + 1]) for i in range(0, len(direcciones), 2)]
+
+    def direcciones_empaquetadas(self):
+        # Arreglo intercalado ip, máscara, ip, máscara... sin copiar; None si hay direcciones guardadas como texto
+        return None if isinstance(self._direcciones, tuple) else self._direcciones
+
+    @property
+    def vlans(self):
+        return dict(zip(self._vlans[::2], self._vlans[1::2]))
+
+    @vlans.setter
+    def vlans(self, valor):
+        self._vlans = tuple(_internar(dato) for par in valor.items() for dato in par)
+
+    @property
+    def servicios(self):
+        return list(self._servicios)
+
+    @servicios.setter
+    def servicios(self, valor):
+        self._servicios = tuple(_internar(servicio) for servicio in valor)
+
+    def a_diccionario(self):
+        return {
+            "nombre": self.nombre,
+            "modelo": self.modelo,
+            "capa": self.capa,
+            "interfaces": list(self._interfaces),
+            "ips_masks": self.ips_masks,
+            "vlans": self.vlans,
+            "servicios": list(self._servicios),
+        }
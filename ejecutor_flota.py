@@ -0,0 +1,150 @@
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from .restconf_operations import RESTCONFOperations
+from .resiliencia import TIMEOUT_CONEXION
+
+# Operaciones que se pueden ejecutar en la flota: devuelven un resultado completo antes de cerrar la sesión.
+# Las variantes *_stream producen datos después de cerrarla y fuera de los límites, por eso no están.
+OPERACIONES = (
+    "es_dispositivo_operativo",
+    "obtener_configuracion_running",
+    "obtener_tabla_enrutamiento",
+    "crear_interfaz",
+    "crear_interfaces",
+    "borrar_interfaz",
+    "crear_ruta",
+    "crear_rutas",
+    "configurar_protocolo_enrutamiento",
+)
+
+
+class ResultadoFlota:
+    def __init__(self, campus, dispositivo, ip, resultado=None, error=None, duracion=0.0):
+        self.campus = campus
+        self.dispositivo = dispositivo
+        self.ip = ip
+        self.resultado = resultado
+        self.error = error
+        self.duracion = duracion
+
+    @property
+    def exitoso(self):
+        return self.error is None
+
+
+class EjecutorFlota:
+    def __init__(self, usuario, contrasena, max_global=32, max_por_campus=8, timeout=30):
+        # Con un límite menor que 1 nunca se despacharía nada y la planificación no terminaría
+        if max_global < 1 or max_por_campus < 1:
+            raise ValueError("max_global y max_por_campus deben ser al menos 1")
+        self.usuario = usuario
+        self.contrasena = contrasena
+        self.max_global = max_global
+        self.max_por_campus = max_por_campus
+        self.timeout = timeout
+
+    @staticmethod
+    def ip_de_gestion(dispositivo):
+        # Se usa la IP de la primera interfaz registrada como dirección de gestión
+        for interfaz in dispositivo.interfaces:
+            ip_mask = dispositivo.ips_masks.get(interfaz)
+            if ip_mask:
+                return ip_mask[0]
+        return None
+
+    def ejecutar_en_campus(self, campus, operacion, *args):
+        return self.ejecutar([campus], operacion, *args)
+
+    def ejecutar(self, lista_campus, operacion, *args):
+        if operacion not in OPERACIONES:
+            raise ValueError(f"Operación RESTCONF no válida: {operacion}")
+        pendientes = {}
+        for campus in lista_campus:
+            tareas = deque()
+            for dispositivo in campus.dispositivos:
+                ip = self.ip_de_gestion(dispositivo)
+                if ip is None:
+                    yield ResultadoFlota(campus.nombre, dispositivo.nombre, None, error="El dispositivo no tiene dirección IP")
+                else:
+                    tareas.append((dispositivo.nombre, ip))
+            if tareas:
+                pendientes[campus.nombre] = tareas
+        yield from self._planificar(pendientes, operacion, args)
+
+    def _planificar(self, pendientes, operacion, args):
+        en_curso = {nombre: 0 for nombre in pendientes}
+        activos = {}
+        # Vencidos: ya se informaron como agotados, pero su hilo sigue ocupando el lugar hasta que termina
+        vencidos = {}
+        pool = ThreadPoolExecutor(max_workers=self.max_global)
+        try:
+            while pendientes or activos or vencidos:
+                self._despachar(pool, pendientes, en_curso, activos, vencidos, operacion, args)
+                hechos, _ = wait([*activos, *vencidos], timeout=self._espera_maxima(activos), return_when=FIRST_COMPLETED)
+                for futuro in hechos:
+                    if futuro in vencidos:
+                        en_curso[vencidos.pop(futuro)] -= 1
+                        continue
+                    nombre_campus, nombre_dispositivo, ip, inicio = activos.pop(futuro)
+                    en_curso[nombre_campus] -= 1
+                    yield self._resultado(futuro, nombre_campus, nombre_dispositivo, ip, inicio)
+                yield from self._expirar(activos, vencidos)
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _despachar(self, pool, pendientes, en_curso, activos, vencidos, operacion, args):
+        # Reparto round-robin entre campus respetando el límite global y el límite por campus
+        while len(activos) + len(vencidos) < self.max_global:
+            despachado = False
+            for nombre_campus in list(pendientes):
+                if len(activos) + len(vencidos) >= self.max_global:
+                    break
+                if en_curso[nombre_campus] >= self.max_por_campus:
+                    continue
+                nombre_dispositivo, ip = pendientes[nombre_campus].popleft()
+                if not pendientes[nombre_campus]:
+                    del pendientes[nombre_campus]
+                inicio = [None]
+                futuro = pool.submit(self._operar, ip, operacion, args, inicio)
+                activos[futuro] = (nombre_campus, nombre_dispositivo, ip, inicio)
+                en_curso[nombre_campus] += 1
+                despachado = True
+            if not despachado:
+                break
+
+    def _operar(self, ip, operacion, args, inicio):
+        inicio[0] = time.monotonic()
+        # Un dispositivo apagado se detecta con el timeout de conexión corto, sin esperar todo el plazo;
+        # la fecha límite evita que los reintentos sigan después de que el dispositivo se dio por agotado
+        timeout = (min(TIMEOUT_CONEXION, self.timeout), self.timeout) if self.timeout is not None else None
+        fecha_limite = inicio[0] + self.timeout if self.timeout is not None else None
+        with RESTCONFOperations(ip, self.usuario, self.contrasena, timeout=timeout, fecha_limite=fecha_limite) as restconf:
+            return getattr(restconf, operacion)(*args)
+
+    def _espera_maxima(self, activos):
+        if self.timeout is None:
+            return None
+        ahora = time.monotonic()
+        limites = [inicio[0] + self.timeout for _, _, _, inicio in activos.values() if inicio[0] is not None]
+        if not limites:
+            return self.timeout
+        return max(min(limites) - ahora, 0)
+
+    def _expirar(self, activos, vencidos):
+        if self.timeout is None:
+            return
+        ahora = time.monotonic()
+        for futuro, (nombre_campus, nombre_dispositivo, ip, inicio) in list(activos.items()):
+            if inicio[0] is not None and ahora - inicio[0] >= self.timeout:
+                del activos[futuro]
+                vencidos[futuro] = nombre_campus
+                yield ResultadoFlota(nombre_campus, nombre_dispositivo, ip, error="Tiempo de espera agotado", duracion=ahora - inicio[0])
+
+    @staticmethod
+    def _resultado(futuro, nombre_campus, nombre_dispositivo, ip, inicio):
+        duracion = time.monotonic() - inicio[0] if inicio[0] is not None else 0.0
+        try:
+            return ResultadoFlota(nombre_campus, nombre_dispositivo, ip, resultado=futuro.result(), duracion=duracion)
+        except Exception as e:
+            return ResultadoFlota(nombre_campus, nombre_dispositivo, ip, error=str(e), duracion=duracion)
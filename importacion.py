@@ -0,0 +1,126 @@
+import csv
+import json
+from .direcciones_ip import mascara_a_prefijo
+
+
+def _lista(valor, separador=";"):
+    if isinstance(valor, list):
+        return valor
+    return [elemento.strip() for elemento in valor.split(separador) if elemento.strip()] if valor else []
+
+
+def _vlans(valor):
+    if isinstance(valor, dict):
+        return valor
+    vlans = {}
+    for par in _lista(valor):
+        nombre, _, numero = par.partition("=")
+        vlans[nombre.strip()] = numero.strip()
+    return vlans
+
+
+def registros_csv(archivo):
+    # Mismas columnas que el reporte CSV: una fila por interfaz, las filas consecutivas
+    # del mismo campus y dispositivo se agrupan en un solo registro.
+    # Una fila sin dispositivo es un campus; la columna descripcion es opcional.
+    lector = csv.DictReader(archivo)
+    actual = None
+    info = None
+    linea = 0
+    for fila in lector:
+        if not fila.get("dispositivo"):
+            if info is not None:
+                yield linea, actual[0], None, info
+            actual = info = None
+            yield lector.line_num, fila.get("campus", ""), fila.get("descripcion"), None
+            continue
+        clave = (fila.get("campus", ""), fila.get("dispositivo", ""))
+        if clave != actual:
+            if info is not None:
+                yield linea, actual[0], None, info
+            actual = clave
+            linea = lector.line_num
+            info = {
+                "nombre": clave[1],
+                "modelo": fila.get("modelo", ""),
+                "capa": fila.get("capa", ""),
+                "interfaces": [],
+                "ips_masks": {},
+                "vlans": _vlans(fila.get("vlans", "")),
+                "servicios": _lista(fila.get("servicios", "")),
+            }
+        interfaz = fila.get("interfaz", "")
+        if interfaz:
+            info["interfaces"].append(interfaz)
+            if fila.get("ip") or fila.get("mascara"):
+                info["ips_masks"][interfaz] = (fila.get("ip", ""), fila.get("mascara", ""))
+    if info is not None:
+        yield linea, actual[0], None, info
+
+
+def registros_jsonl(archivo):
+    # Una línea por dispositivo ({"campus": ..., "nombre": ..., ...}) o por campus ({"campus": ..., "descripcion": ...})
+    for linea, texto in enumerate(archivo, 1):
+        if not texto.strip():
+            continue
+        try:
+            registro = json.loads(texto)
+        except json.JSONDecodeError as error:
+            yield linea, None, None, f"JSON no válido: {error}"
+            continue
+        if not isinstance(registro, dict):
+            yield linea, None, None, "Se esperaba un objeto JSON"
+            continue
+        nombre_campus = registro.pop("campus", None)
+        if "nombre" not in registro:
+            yield linea, nombre_campus, registro.get("descripcion", ""), None
+            continue
+        try:
+            info = {
+                "nombre": registro["nombre"],
+                "modelo": registro.get("modelo", ""),
+                "capa": registro.get("capa", ""),
+                "interfaces": _lista(registro.get("interfaces", []), ","),
+                "ips_masks": {interfaz: tuple(ip_mask) for interfaz, ip_mask in registro.get("ips_masks", {}).items()},
+                "vlans": _vlans(registro.get("vlans", {})),
+                "servicios": _lista(registro.get("servicios", []), ","),
+            }
+        except (AttributeError, TypeError):
+            yield linea, None, None, "Los campos del dispositivo no tienen el tipo esperado"
+            continue
+        yield linea, nombre_campus, None, info
+
+
+FORMATOS_IMPORTACION = {
+    "csv": registros_csv,
+    "jsonl": registros_jsonl,
+}
+
+
+def validar_dispositivo(info, es_direccion_ipv4):
+    if not info["nombre"]:
+        return "El dispositivo no tiene nombre"
+    for interfaz, ip_mask in info["ips_masks"].items():
+        if len(ip_mask) != 2:
+            return f"La interfaz {interfaz} debe tener IP y máscara"
+        ip, mascara = ip_mask
+        if not isinstance(ip, str) or not es_direccion_ipv4(ip):
+            return f"La dirección IP {ip!r} de la interfaz {interfaz} no es válida"
+        if not isinstance(mascara, str) or not es_direccion_ipv4(mascara) or mascara_a_prefijo(mascara) is None:
+            return f"La máscara {mascara!r} de la interfaz {interfaz} no es válida"
+    return None
+
+
+def leer_registros(archivo, formato, es_direccion_ipv4):
+    # Genera (linea, campus, descripcion, dispositivo_info, error) sin leer el archivo completo
+    if formato not in FORMATOS_IMPORTACION:
+        raise ValueError(f"Formato de importación no válido: {formato}")
+    for linea, nombre_campus, descripcion, info in FORMATOS_IMPORTACION[formato](archivo):
+        if isinstance(info, str):
+            yield linea, None, None, None, info
+        elif not nombre_campus:
+            yield linea, None, None, None, "El registro no indica el campus"
+        elif info is None:
+            yield linea, nombre_campus, descripcion, None, None
+        else:
+            yield linea, nombre_campus, None, info, validar_dispositivo(info, es_direccion_ipv4)
@@ -0,0 +1,185 @@
+import hashlib
+import json
+import os
+import time
+import zlib
+from .diario_cambios import escribir_atomico
+
+# Campos que suelen ser la clave de las listas YANG; se usan para identificar los elementos
+# de una lista por su clave y no por su posición
+CLAVES_LISTA = ("name", "id", "number", "index", "vlan-id", "destination-prefix", "prefix", "ip", "address")
+# Los subárboles más pequeños que esto (en bytes de JSON) no tienen nodo propio en el árbol de hashes
+TAMANO_MINIMO_NODO = 4096
+_AUSENTE = object()
+
+
+def _hash(datos):
+    return hashlib.blake2b(datos, digest_size=8).hexdigest()
+
+
+def _etiquetas_lista(lista):
+    # Etiqueta de cada elemento de una lista de objetos: "clave=valor" si hay un campo que los identifique
+    for clave in CLAVES_LISTA:
+        valores = [elemento.get(clave) for elemento in lista]
+        if all(isinstance(valor, (str, int)) for valor in valores) and len(set(valores)) == len(valores):
+            return [f"{clave}={valor}" for valor in valores]
+    return [f"[{indice}]" for indice in range(len(lista))]
+
+
+def _es_contenedor(valor):
+    # Los objetos y las listas de objetos forman el árbol; el resto (incluidas las listas de valores) son hojas
+    if isinstance(valor, dict):
+        return True
+    return isinstance(valor, list) and bool(valor) and all(isinstance(elemento, dict) for elemento in valor)
+
+
+def _elementos(valor):
+    # (etiqueta, clave o posición, hijo) de un contenedor
+    if isinstance(valor, dict):
+        return [(clave, clave, hijo) for clave, hijo in valor.items()]
+    return list(zip(_etiquetas_lista(valor), range(len(valor)), valor))
+
+
+def _es_misma_clase(antes, despues):
+    return _es_contenedor(antes) and _es_contenedor(despues) and isinstance(antes, dict) == isinstance(despues, dict)
+
+
+def arbol_de_hashes(valor):
+    # Árbol de Merkle: cada contenedor es [hash, {etiqueta: nodo hijo}, clave o posición en el padre].
+    # Solo se guardan nodos para los subárboles grandes; los pequeños entran en el hash del padre
+    # y se comparan directamente por valor, así el árbol ocupa poco frente a la configuración.
+    return _nodo(valor)[0]
+
+
+def _nodo(valor):
+    hijos = {}
+    partes = []
+    tamano = 0
+    for etiqueta, acceso, hijo in _elementos(valor):
+        if _es_contenedor(hijo):
+            nodo, tamano_hijo = _nodo(hijo)
+            tamano += tamano_hijo
+            if tamano_hijo >= TAMANO_MINIMO_NODO:
+                nodo[2] = acceso
+                hijos[etiqueta] = nodo
+            partes.append((etiqueta, nodo[0]))
+        else:
+            partes.append((etiqueta, hijo))
+    partes.sort(key=lambda parte: parte[0])
+    texto = json.dumps(partes, sort_keys=True)
+    return [_hash(texto.encode("utf-8")), hijos, None], tamano + len(texto)
+
+
+def comparar_arboles(valor_a, arbol_a, valor_b, arbol_b, ruta=""):
+    # Con árbol en ambos lados solo se desciende si el hash difiere; sin árbol (subárboles pequeños)
+    # se compara por valor antes de descender
+    if arbol_a is not None and arbol_b is not None:
+        if arbol_a[0] == arbol_b[0]:
+            return
+    elif valor_a == valor_b:
+        return
+    hijos_a = arbol_a[1] if arbol_a is not None else {}
+    hijos_b = arbol_b[1] if arbol_b is not None else {}
+    elementos_a = {etiqueta: hijo for etiqueta, _, hijo in _elementos(valor_a)}
+    elementos_b = {etiqueta: hijo for etiqueta, _, hijo in _elementos(valor_b)}
+    for etiqueta in dict.fromkeys(list(elementos_a) + list(elementos_b)):
+        ruta_hijo = f"{ruta}/{etiqueta}" if ruta else etiqueta
+        antes = elementos_a.get(etiqueta, _AUSENTE)
+        despues = elementos_b.get(etiqueta, _AUSENTE)
+        if antes is _AUSENTE:
+            yield ruta_hijo, "agregado", None, despues
+        elif despues is _AUSENTE:
+            yield ruta_hijo, "eliminado", antes, None
+        elif _es_misma_clase(antes, despues):
+            yield from comparar_arboles(antes, hijos_a.get(etiqueta), despues, hijos_b.get(etiqueta), ruta_hijo)
+        elif antes != despues:
+            yield ruta_hijo, "modificado", antes, despues
+
+
+def describir_cambio(ruta, tipo, antes, despues, largo_maximo=80):
+    def compacto(valor):
+        texto = json.dumps(valor, ensure_ascii=False)
+        return texto if len(texto) <= largo_maximo else texto[:largo_maximo - 3] + "..."
+
+    if tipo == "agregado":
+        return f"+ {ruta}: {compacto(despues)}"
+    if tipo == "eliminado":
+        return f"- {ruta}: {compacto(antes)}"
+    return f"~ {ruta}: {compacto(antes)} -> {compacto(despues)}"
+
+
+class AlmacenInstantaneas:
+    # Estructura en disco, un directorio por dispositivo:
+    #   <raiz>/<dispositivo>/indice.jsonl          una línea por instantánea tomada (id, fecha, hash)
+    #   <raiz>/<dispositivo>/objetos/<hash>.json.z configuración comprimida, una sola vez por contenido
+    #   <raiz>/<dispositivo>/objetos/<hash>.arbol.z árbol de hashes de la configuración
+    def __init__(self, raiz):
+        self.raiz = raiz
+
+    def _directorio(self, dispositivo):
+        return os.path.join(self.raiz, str(dispositivo).replace(os.sep, "_").replace(":", "_"))
+
+    def _ruta_objeto(self, dispositivo, hash_contenido, tipo):
+        return os.path.join(self._directorio(dispositivo), "objetos", f"{hash_contenido}.{tipo}.z")
+
+    def _escribir_objeto(self, ruta, valor):
+        datos = zlib.compress(json.dumps(valor, separators=(",", ":"), ensure_ascii=False).encode("utf-8"), 6)
+        escribir_atomico(ruta, lambda archivo: archivo.write(datos), binario=True)
+
+    @staticmethod
+    def _leer_objeto(ruta):
+        with open(ruta, "rb") as archivo:
+            return json.loads(zlib.decompress(archivo.read()))
+
+    def guardar(self, dispositivo, configuracion):
+        # Devuelve (id, hash, nueva); nueva es False si el contenido ya estaba almacenado
+        contenido = json.dumps(configuracion, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        hash_contenido = _hash(contenido)
+        ruta_configuracion = self._ruta_objeto(dispositivo, hash_contenido, "json")
+        nueva = not os.path.exists(ruta_configuracion)
+        if nueva:
+            os.makedirs(os.path.dirname(ruta_configuracion), exist_ok=True)
+            # El árbol se escribe antes que la configuración: si existe la configuración, existe su árbol
+            self._escribir_objeto(self._ruta_objeto(dispositivo, hash_contenido, "arbol"), arbol_de_hashes(configuracion))
+            self._escribir_objeto(ruta_configuracion, configuracion)
+        instantaneas = self.listar(dispositivo)
+        id_instantanea = instantaneas[-1]["id"] + 1 if instantaneas else 1
+        entrada = {"id": id_instantanea, "fecha": time.strftime("%Y-%m-%dT%H:%M:%S"), "hash": hash_contenido}
+        with open(os.path.join(self._directorio(dispositivo), "indice.jsonl"), "a", encoding="utf-8") as archivo:
+            archivo.write(json.dumps(entrada) + "\n")
+        return id_instantanea, hash_contenido, nueva
+
+    def listar(self, dispositivo):
+        ruta = os.path.join(self._directorio(dispositivo), "indice.jsonl")
+        if not os.path.exists(ruta):
+            return []
+        instantaneas = []
+        with open(ruta, "r", encoding="utf-8") as archivo:
+            for linea in archivo:
+                try:
+                    instantaneas.append(json.loads(linea))
+                except json.JSONDecodeError:
+                    break
+        return instantaneas
+
+    def _hash_de(self, dispositivo, id_instantanea):
+        for entrada in self.listar(dispositivo):
+            if entrada["id"] == id_instantanea:
+                return entrada["hash"]
+        raise KeyError(f"No existe la instantánea {id_instantanea} del dispositivo {dispositivo}")
+
+    def cargar(self, dispositivo, id_instantanea):
+        return self._leer_objeto(self._ruta_objeto(dispositivo, self._hash_de(dispositivo, id_instantanea), "json"))
+
+    def comparar(self, dispositivo, id_a, id_b):
+        # Lista de (ruta, tipo, antes, despues) con tipo "agregado", "eliminado" o "modificado"
+        hash_a, hash_b = self._hash_de(dispositivo, id_a), self._hash_de(dispositivo, id_b)
+        if hash_a == hash_b:
+            return []
+        arbol_a = self._leer_objeto(self._ruta_objeto(dispositivo, hash_a, "arbol"))
+        arbol_b = self._leer_objeto(self._ruta_objeto(dispositivo, hash_b, "arbol"))
+        if arbol_a[0] == arbol_b[0]:
+            return []
+        valor_a = self._leer_objeto(self._ruta_objeto(dispositivo, hash_a, "json"))
+        valor_b = self._leer_objeto(self._ruta_objeto(dispositivo, hash_b, "json"))
+        return list(comparar_arboles(valor_a, arbol_a, valor_b, arbol_b))
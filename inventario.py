@@ -0,0 +1,159 @@
+import bisect
+from .direcciones_ip import ip_a_entero, entero_a_ip, mascara_a_prefijo, prefijo_a_mascara
+
+
+def _normalizar_vlan(numero):
+    try:
+        return int(numero)
+    except (TypeError, ValueError):
+        return str(numero).strip()
+
+
+class Inventario:
+    def __init__(self):
+        self._dispositivos = {}
+        self._indexado = {}
+        self.por_nombre = {}
+        self.por_ip = {}
+        self.por_vlan = {}
+        self.por_servicio = {}
+        self.por_capa = {}
+        # Subredes agrupadas por longitud de prefijo: {prefijo: {red: claves}}
+        self.por_subred = {}
+        # Direcciones distintas ordenadas para consultas de rango; se construye en la primera
+        # consulta y luego se mantiene de forma incremental
+        self._ips_ordenadas = None
+        self.preparar = None
+
+    def __len__(self):
+        return len(self._dispositivos)
+
+    def agregar(self, nombre_campus, dispositivo):
+        clave = (nombre_campus, dispositivo.nombre)
+        if clave in self._dispositivos:
+            self.quitar(nombre_campus, dispositivo.nombre)
+        ips, subredes = [], []
+        for ip, mascara in dispositivo.direcciones_enteras():
+            if ip is None:
+                continue
+            ips.append(ip)
+            if mascara is None:
+                # Máscara vacía o ilegible (los inventarios anteriores no la validaban): sin subred
+                continue
+            invertida = ~mascara & 0xFFFFFFFF
+            # Solo las máscaras con bits contiguos definen una subred
+            if not invertida & (invertida + 1):
+                subredes.append((32 - invertida.bit_length(), ip & mascara))
+        ips, subredes = list(dict.fromkeys(ips)), list(dict.fromkeys(subredes))
+        vlans = list(dict.fromkeys(_normalizar_vlan(numero) for numero in dispositivo.vlans.values()))
+        servicios = list(dict.fromkeys(servicio.strip() for servicio in dispositivo.servicios if servicio.strip()))
+        # Se guarda lo indexado para poder retirarlo aunque el dispositivo cambie después
+        self._indexado[clave] = (ips, subredes, vlans, servicios, dispositivo.capa)
+        self._dispositivos[clave] = dispositivo
+        self.por_nombre.setdefault(dispositivo.nombre, set()).add(clave)
+        self.por_capa.setdefault(dispositivo.capa, set()).add(clave)
+        for ip in ips:
+            if ip not in self.por_ip and self._ips_ordenadas is not None:
+                bisect.insort(self._ips_ordenadas, ip)
+            self.por_ip.setdefault(ip, set()).add(clave)
+        for prefijo, red in subredes:
+            self.por_subred.setdefault(prefijo, {}).setdefault(red, set()).add(clave)
+        for vlan in vlans:
+            self.por_vlan.setdefault(vlan, set()).add(clave)
+        for servicio in servicios:
+            self.por_servicio.setdefault(servicio, set()).add(clave)
+
+    def quitar(self, nombre_campus, nombre_dispositivo):
+        clave = (nombre_campus, nombre_dispositivo)
+        dispositivo = self._dispositivos.pop(clave, None)
+        if dispositivo is None:
+            return None
+        ips, subredes, vlans, servicios, capa = self._indexado.pop(clave)
+        self._desindexar(self.por_nombre, nombre_dispositivo, clave)
+        self._desindexar(self.por_capa, capa, clave)
+        for ip in ips:
+            self._desindexar(self.por_ip, ip, clave)
+            if ip not in self.por_ip and self._ips_ordenadas is not None:
+                del self._ips_ordenadas[bisect.bisect_left(self._ips_ordenadas, ip)]
+        for prefijo, red in subredes:
+            self._desindexar(self.por_subred[prefijo], red, clave)
+            if not self.por_subred[prefijo]:
+                del self.por_subred[prefijo]
+        for vlan in vlans:
+            self._desindexar(self.por_vlan, vlan, clave)
+        for servicio in servicios:
+            self._desindexar(self.por_servicio, servicio, clave)
+        return dispositivo
+
+    def quitar_campus(self, nombre_campus, nombres_dispositivos):
+        for nombre in list(nombres_dispositivos):
+            self.quitar(nombre_campus, nombre)
+
+    def obtener(self, nombre_campus, nombre_dispositivo):
+        return self._dispositivos.get((nombre_campus, nombre_dispositivo))
+
+    def buscar_por_nombre(self, nombre):
+        self._preparar()
+        return self._resolver(self.por_nombre.get(nombre, ()))
+
+    def buscar_por_ip(self, direccion):
+        self._preparar()
+        return self._resolver(self.por_ip.get(ip_a_entero(direccion), ()))
+
+    def buscar_por_vlan(self, numero):
+        self._preparar()
+        return self._resolver(self.por_vlan.get(_normalizar_vlan(numero), ()))
+
+    def buscar_por_servicio(self, servicio):
+        self._preparar()
+        return self._resolver(self.por_servicio.get(servicio.strip(), ()))
+
+    def buscar_por_capa(self, capa):
+        self._preparar()
+        return self._resolver(self.por_capa.get(capa, ()))
+
+    def buscar_en_subred(self, red, mascara):
+        self._preparar()
+        prefijo = mascara_a_prefijo(mascara)
+        inicio = ip_a_entero(red)
+        if prefijo is None or inicio is None:
+            return []
+        inicio &= prefijo_a_mascara(prefijo)
+        fin = inicio + (1 << (32 - prefijo))
+        if self._ips_ordenadas is None:
+            self._ips_ordenadas = sorted(self.por_ip)
+        claves = set()
+        desde = bisect.bisect_left(self._ips_ordenadas, inicio)
+        hasta = bisect.bisect_left(self._ips_ordenadas, fin)
+        for ip in self._ips_ordenadas[desde:hasta]:
+            claves.update(self.por_ip[ip])
+        return self._resolver(claves)
+
+    def subredes_que_contienen(self, direccion):
+        self._preparar()
+        # Coincidencia de prefijo más largo: una consulta de hash por cada longitud de prefijo registrada
+        ip = ip_a_entero(direccion)
+        if ip is None:
+            return []
+        resultado = []
+        for prefijo in sorted(self.por_subred, reverse=True):
+            claves = self.por_subred[prefijo].get(ip & prefijo_a_mascara(prefijo))
+            if claves:
+                red = f"{entero_a_ip(ip & prefijo_a_mascara(prefijo))}/{prefijo}"
+                resultado.append((red, self._resolver(claves)))
+        return resultado
+
+    def _preparar(self):
+        if self.preparar is not None:
+            self.preparar()
+
+    def _resolver(self, claves):
+        return [(clave[0], self._dispositivos[clave]) for clave in sorted(claves)]
+
+    @staticmethod
+    def _desindexar(indice, valor, clave):
+        claves = indice.get(valor)
+        if claves is not None:
+            claves.discard(clave)
+            if not claves:
+                del indice[valor]
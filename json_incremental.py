@@ -0,0 +1,166 @@
+import codecs
+import json
+import re
+from json.decoder import scanstring
+
+_TOKEN = re.compile(r'\s*(?:([{}\[\]:,])|("[^"\\]*(?:\\.[^"\\]*)*")|([^\s{}\[\]:,"]+))')
+# Para saltar o capturar contenedores solo interesan las cadenas y los corchetes/llaves
+_ESTRUCTURA = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*(")?|[{}\[\]]')
+_ESPACIOS = re.compile(r'\s*')
+_DECODIFICADOR = json.JSONDecoder()
+
+
+class _Lector:
+    def __init__(self, fragmentos):
+        self._fragmentos = iter(fragmentos)
+        self._decodificador = codecs.getincrementaldecoder("utf-8")()
+        self._agotado = False
+        self.buffer = ""
+        self.pos = 0
+
+    def _leer_mas(self):
+        if self._agotado:
+            return False
+        fragmento = next(self._fragmentos, None)
+        if fragmento is None:
+            self._agotado = True
+            fragmento = self._decodificador.decode(b"", final=True)
+        elif isinstance(fragmento, bytes):
+            fragmento = self._decodificador.decode(fragmento)
+        self.buffer = self.buffer[self.pos:] + fragmento
+        self.pos = 0
+        return True
+
+    def token(self):
+        while True:
+            m = _TOKEN.match(self.buffer, self.pos)
+            # Un escalar al final del buffer puede continuar en el siguiente fragmento
+            if m is not None and (m.group(3) is None or m.end() < len(self.buffer) or self._agotado):
+                self.pos = m.end()
+                return m.group(m.lastindex)
+            if not self._leer_mas():
+                if _ESPACIOS.match(self.buffer, self.pos).end() != len(self.buffer):
+                    raise ValueError(f"JSON inválido cerca de: {self.buffer[self.pos:self.pos + 40]!r}")
+                return None
+
+    def siguiente(self):
+        token = self.token()
+        if token is None:
+            raise ValueError("JSON incompleto")
+        return token
+
+    def valor_contenedor(self, apertura):
+        # Camino rápido: si el valor completo ya está en el buffer se decodifica directamente en C
+        try:
+            valor, fin = _DECODIFICADOR.raw_decode(self.buffer, self.pos - 1)
+        except json.JSONDecodeError:
+            return json.loads(self.contenedor(apertura))
+        self.pos = fin
+        return valor
+
+    def contenedor(self, apertura, conservar=True):
+        # Recorre un objeto o lista ya abierto hasta su cierre sin decodificarlo
+        partes = [apertura]
+        profundidad = 1
+        inicio = self.pos
+        while True:
+            for m in _ESTRUCTURA.finditer(self.buffer, self.pos):
+                caracter = m.group(0)[0]
+                if caracter == '"':
+                    if m.group(1) is None:
+                        self.pos = m.start()
+                        break
+                elif caracter in "{[":
+                    profundidad += 1
+                else:
+                    profundidad -= 1
+                    if profundidad == 0:
+                        self.pos = m.end()
+                        if conservar:
+                            partes.append(self.buffer[inicio:self.pos])
+                        return "".join(partes) if conservar else None
+            else:
+                self.pos = len(self.buffer)
+            if conservar:
+                partes.append(self.buffer[inicio:self.pos])
+            if not self._leer_mas():
+                raise ValueError("JSON incompleto")
+            inicio = self.pos
+
+
+def _coincide(clave, patron):
+    # Los nodos YANG pueden llevar prefijo de módulo ("modulo:nombre"); se acepta el nombre sin prefijo
+    return patron == "*" or patron == clave or clave.split(":", 1)[-1] == patron
+
+
+def _decodificar(lector, token):
+    return lector.valor_contenedor(token) if token in ("{", "[") else json.loads(token)
+
+
+def _recorrer(lector, token, filtro, nivel, ruta):
+    if nivel == len(filtro) and token == "[":
+        # Cada elemento de la lista seleccionada se produce en cuanto termina de llegar
+        token = lector.siguiente()
+        while token != "]":
+            yield "/".join(ruta), _decodificar(lector, token)
+            token = lector.siguiente()
+            if token == ",":
+                token = lector.siguiente()
+    elif nivel == len(filtro):
+        yield "/".join(ruta), _decodificar(lector, token)
+    elif token == "{":
+        token = lector.siguiente()
+        while token != "}":
+            clave = scanstring(token, 1)[0]
+            if lector.siguiente() != ":":
+                raise ValueError(f"Se esperaba ':' después de la clave {clave!r}")
+            token = lector.siguiente()
+            if _coincide(clave, filtro[nivel]):
+                yield from _recorrer(lector, token, filtro, nivel + 1, ruta + [clave])
+            elif token in ("{", "["):
+                lector.contenedor(token, conservar=False)
+            token = lector.siguiente()
+            if token == ",":
+                token = lector.siguiente()
+    elif token == "[":
+        # Las listas YANG son transparentes: el filtro se aplica a cada elemento
+        token = lector.siguiente()
+        while token != "]":
+            yield from _recorrer(lector, token, filtro, nivel, ruta)
+            token = lector.siguiente()
+            if token == ",":
+                token = lector.siguiente()
+
+
+# Decodifica un documento JSON por fragmentos y produce (ruta, valor) para cada subárbol
+# que coincide con el filtro ("a/b/*/c"). Solo se materializan los subárboles seleccionados;
+# si el nodo final es una lista se produce cada uno de sus elementos.
+def iterar_subarboles(fragmentos, filtro=None):
+    partes_filtro = filtro.strip("/").split("/") if filtro else []
+    lector = _Lector(fragmentos)
+    token = lector.token()
+    while token is not None:
+        yield from _recorrer(lector, token, partes_filtro, 0, [])
+        token = lector.token()
+
+
+def iterar_subarboles_objeto(valor, filtro=None, ruta=None):
+    # Equivalente a iterar_subarboles sobre un árbol ya decodificado
+    partes_filtro = filtro.strip("/").split("/") if filtro else []
+    yield from _recorrer_objeto(valor, partes_filtro, 0, ruta or [])
+
+
+def _recorrer_objeto(valor, filtro, nivel, ruta):
+    if nivel == len(filtro):
+        if isinstance(valor, list):
+            for elemento in valor:
+                yield "/".join(ruta), elemento
+        else:
+            yield "/".join(ruta), valor
+    elif isinstance(valor, dict):
+        for clave, hijo in valor.items():
+            if _coincide(clave, filtro[nivel]):
+                yield from _recorrer_objeto(hijo, filtro, nivel + 1, ruta + [clave])
+    elif isinstance(valor, list):
+        for elemento in valor:
+            yield from _recorrer_objeto(elemento, filtro, nivel, ruta)
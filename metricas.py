@@ -0,0 +1,152 @@
+import bisect
+import json
+import re
+import threading
+import time
+from contextlib import nullcontext
+from .diario_cambios import escribir_atomico
+
+# Límites superiores (en segundos) de los intervalos de los histogramas de duración
+LIMITES_DURACION = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+# nombre: (tipo, descripción, etiquetas)
+METRICAS = {
+    "restconf_duracion_dispositivo_segundos": ("histogram", "Duración de las solicitudes RESTCONF por dispositivo", ("dispositivo",)),
+    "restconf_duracion_endpoint_segundos": ("histogram", "Duración de las solicitudes RESTCONF por método y ruta YANG", ("metodo", "endpoint")),
+    "restconf_solicitudes_total": ("counter", "Solicitudes RESTCONF enviadas, incluidos los reintentos", ("dispositivo", "metodo", "codigo")),
+    "restconf_errores_total": ("counter", "Respuestas de error y fallos de red por dispositivo y ruta YANG", ("dispositivo", "endpoint", "codigo")),
+    "restconf_bytes_enviados_total": ("counter", "Bytes de cuerpo enviados a cada dispositivo", ("dispositivo",)),
+    "restconf_bytes_recibidos_total": ("counter", "Bytes de cuerpo recibidos de cada dispositivo", ("dispositivo",)),
+    "inventario_duracion_segundos": ("histogram", "Duración de la carga y el guardado del inventario", ("operacion",)),
+}
+
+# Las claves de las listas YANG (interface=Gi1, rib=ipv4) se reemplazan para no crear una serie por elemento
+_CLAVE_LISTA = re.compile(r"=[^/]*")
+_sin_medicion = nullcontext()
+
+
+def normalizar_endpoint(ruta):
+    return _CLAVE_LISTA.sub("=*", ruta) or "/"
+
+
+def _escapar(valor):
+    return str(valor).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _etiquetas(nombres, valores, extra=""):
+    partes = [f'{nombre}="{_escapar(valor)}"' for nombre, valor in zip(nombres, valores)]
+    if extra:
+        partes.append(extra)
+    return "{" + ",".join(partes) + "}" if partes else ""
+
+
+class _Medicion:
+    __slots__ = ("registro", "operacion", "inicio")
+
+    def __init__(self, registro, operacion):
+        self.registro = registro
+        self.operacion = operacion
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        self.registro.observar("inventario_duracion_segundos", (self.operacion,), time.perf_counter() - self.inicio)
+
+
+class RegistroMetricas:
+    # Deshabilitado por defecto: quien instrumenta consulta "habilitado" antes de tomar tiempos,
+    # así el costo sin métricas es una comparación por solicitud
+    def __init__(self, habilitado=False):
+        self.habilitado = habilitado
+        self._lock = threading.Lock()
+        self._series = {nombre: {} for nombre in METRICAS}
+
+    def habilitar(self, habilitado=True):
+        self.habilitado = habilitado
+
+    def reiniciar(self):
+        with self._lock:
+            self._series = {nombre: {} for nombre in METRICAS}
+
+    def observar(self, nombre, etiquetas, valor):
+        # Histograma: [conteo por intervalo..., conteo en +Inf, suma]
+        with self._lock:
+            serie = self._series[nombre].get(etiquetas)
+            if serie is None:
+                serie = self._series[nombre][etiquetas] = [0] * (len(LIMITES_DURACION) + 1) + [0.0]
+            serie[bisect.bisect_left(LIMITES_DURACION, valor)] += 1
+            serie[-1] += valor
+
+    def sumar(self, nombre, etiquetas, valor=1):
+        with self._lock:
+            series = self._series[nombre]
+            series[etiquetas] = series.get(etiquetas, 0) + valor
+
+    def medir(self, operacion):
+        if not self.habilitado:
+            return _sin_medicion
+        return _Medicion(self, operacion)
+
+    def registrar_solicitud(self, dispositivo, metodo, ruta, codigo, duracion, enviados=0, recibidos=0):
+        # codigo es el estado HTTP o el nombre de la excepción si la solicitud no obtuvo respuesta
+        endpoint = normalizar_endpoint(ruta)
+        self.observar("restconf_duracion_dispositivo_segundos", (dispositivo,), duracion)
+        self.observar("restconf_duracion_endpoint_segundos", (metodo, endpoint), duracion)
+        self.sumar("restconf_solicitudes_total", (dispositivo, metodo, str(codigo)))
+        if not isinstance(codigo, int) or codigo >= 400:
+            self.sumar("restconf_errores_total", (dispositivo, endpoint, str(codigo)))
+        if enviados:
+            self.sumar("restconf_bytes_enviados_total", (dispositivo,), enviados)
+        if recibidos:
+            self.sumar("restconf_bytes_recibidos_total", (dispositivo,), recibidos)
+
+    def _copiar(self):
+        with self._lock:
+            return {nombre: {etiquetas: list(valor) if isinstance(valor, list) else valor
+                             for etiquetas, valor in series.items()}
+                    for nombre, series in self._series.items()}
+
+    def lineas_prometheus(self):
+        # Formato de exposición de texto de Prometheus, apto para el colector de archivos de node_exporter
+        for nombre, series in self._copiar().items():
+            tipo, descripcion, nombres_etiquetas = METRICAS[nombre]
+            yield f"# HELP {nombre} {descripcion}\n"
+            yield f"# TYPE {nombre} {tipo}\n"
+            for etiquetas, valor in sorted(series.items()):
+                if tipo == "counter":
+                    yield f"{nombre}{_etiquetas(nombres_etiquetas, etiquetas)} {valor}\n"
+                    continue
+                acumulado = 0
+                for limite, conteo in zip(LIMITES_DURACION + ("+Inf",), valor):
+                    acumulado += conteo
+                    intervalo = f'le="{limite}"'
+                    yield f"{nombre}_bucket{_etiquetas(nombres_etiquetas, etiquetas, intervalo)} {acumulado}\n"
+                yield f"{nombre}_sum{_etiquetas(nombres_etiquetas, etiquetas)} {valor[-1]}\n"
+                yield f"{nombre}_count{_etiquetas(nombres_etiquetas, etiquetas)} {acumulado}\n"
+
+    def a_diccionario(self):
+        resultado = {"limites_duracion": list(LIMITES_DURACION), "metricas": {}}
+        for nombre, series in self._copiar().items():
+            tipo, _, nombres_etiquetas = METRICAS[nombre]
+            muestras = []
+            for etiquetas, valor in sorted(series.items()):
+                muestra = {"etiquetas": dict(zip(nombres_etiquetas, etiquetas))}
+                if tipo == "counter":
+                    muestra["valor"] = valor
+                else:
+                    muestra.update(conteos=valor[:-1], conteo=sum(valor[:-1]), suma=valor[-1])
+                muestras.append(muestra)
+            resultado["metricas"][nombre] = {"tipo": tipo, "muestras": muestras}
+        return resultado
+
+    def exportar(self, ruta):
+        # El formato se elige por extensión: .json para el volcado JSON, cualquier otra para Prometheus
+        if ruta.endswith(".json"):
+            escribir_atomico(ruta, lambda archivo: json.dump(self.a_diccionario(), archivo, ensure_ascii=False, indent=2))
+        else:
+            escribir_atomico(ruta, lambda archivo: archivo.writelines(self.lineas_prometheus()))
+
+
+metricas = RegistroMetricas()
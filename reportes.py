@@ -0,0 +1,80 @@
+import csv
+import io
+import json
+
+
+def _seleccionar(campus, nombre_campus=None, capa=None):
+    for nombre, datos_campus in campus.items():
+        if nombre_campus is not None and nombre != nombre_campus:
+            continue
+        dispositivos = (dispositivo for dispositivo in datos_campus.dispositivos if capa is None or dispositivo.capa == capa)
+        yield nombre, datos_campus, dispositivos
+
+
+def lineas_texto(campus, nombre_campus=None, capa=None):
+    for nombre, datos_campus, dispositivos in _seleccionar(campus, nombre_campus, capa):
+        yield f"Campus: {nombre}\nDescripción: {datos_campus.descripcion}\n"
+        for dispositivo in dispositivos:
+            ips_masks = dispositivo.ips_masks
+            yield f"\nDispositivo: {dispositivo.nombre}\nModelo: {dispositivo.modelo}\nCapa: {dispositivo.capa}\n"
+            # Una interfaz puede no tener dirección asignada (por ejemplo, importada desde una fila CSV sin IP)
+            direcciones = (ips_masks.get(interface, ("", "")) for interface in dispositivo.interfaces)
+            yield "Interfaces:\n" + "\n".join(f"- {interface}: IP: {ip}, Máscara: {mascara}" for interface, (ip, mascara) in zip(dispositivo.interfaces, direcciones)) + "\n"
+            yield "VLANs:\n" + "\n".join(f"- {vlan}: {numero}" for vlan, numero in dispositivo.vlans.items()) + "\n"
+            yield f"Servicios: {', '.join(dispositivo.servicios)}\n" + "-" * 30 + "\n"
+
+
+def lineas_csv(campus, nombre_campus=None, capa=None):
+    # Una fila por campus con su descripción y el dispositivo vacío, seguida de una fila por interfaz;
+    # los dispositivos sin interfaces ocupan una fila con la interfaz vacía
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer, lineterminator="\n")
+
+    def fila(valores):
+        escritor.writerow(valores)
+        linea = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+        return linea
+
+    yield fila(["campus", "descripcion", "dispositivo", "modelo", "capa", "interfaz", "ip", "mascara", "vlans", "servicios"])
+    for nombre, datos_campus, dispositivos in _seleccionar(campus, nombre_campus, capa):
+        yield fila([nombre, datos_campus.descripcion] + [""] * 8)
+        for dispositivo in dispositivos:
+            ips_masks = dispositivo.ips_masks
+            vlans = ";".join(f"{vlan}={numero}" for vlan, numero in dispositivo.vlans.items())
+            servicios = ";".join(dispositivo.servicios)
+            comunes = [nombre, "", dispositivo.nombre, dispositivo.modelo, dispositivo.capa]
+            interfaces = dispositivo.interfaces or [""]
+            for interfaz in interfaces:
+                ip, mascara = ips_masks.get(interfaz, ("", ""))
+                yield fila(comunes + [interfaz, ip, mascara, vlans, servicios])
+
+
+def lineas_jsonl(campus, nombre_campus=None, capa=None):
+    # Cada campus se escribe antes que sus dispositivos, así se conservan la descripción y los campus vacíos
+    for nombre, datos_campus, dispositivos in _seleccionar(campus, nombre_campus, capa):
+        yield json.dumps({"campus": nombre, "descripcion": datos_campus.descripcion}, ensure_ascii=False) + "\n"
+        for dispositivo in dispositivos:
+            registro = {"campus": nombre}
+            registro.update(dispositivo.a_diccionario())
+            yield json.dumps(registro, ensure_ascii=False) + "\n"
+
+
+FORMATOS_REPORTE = {
+    "texto": lineas_texto,
+    "csv": lineas_csv,
+    "jsonl": lineas_jsonl,
+}
+
+
+def generar_reporte(campus, formato="texto", nombre_campus=None, capa=None):
+    if formato not in FORMATOS_REPORTE:
+        raise ValueError(f"Formato de reporte no válido: {formato}")
+    return FORMATOS_REPORTE[formato](campus, nombre_campus, capa)
+
+
+def escribir_reporte(ruta, campus, formato="texto", nombre_campus=None, capa=None):
+    # Las líneas se escriben a medida que se generan, sin construir el reporte completo en memoria
+    with open(ruta, "w", encoding="utf-8", newline="") as archivo:
+        archivo.writelines(generar_reporte(campus, formato, nombre_campus, capa))
@@ -0,0 +1,126 @@
+import email.utils
+import random
+import threading
+import time
+from datetime import datetime, timezone
+
+TIMEOUT_CONEXION = 5
+TIMEOUT_LECTURA = 30
+# Respuestas que indican un problema pasajero del dispositivo
+CODIGOS_TRANSITORIOS = (429, 500, 502, 503, 504)
+# Solo se reintentan los métodos que se pueden repetir sin cambiar el resultado
+METODOS_IDEMPOTENTES = ("GET", "HEAD", "PUT", "DELETE")
+
+
+class CircuitoAbierto(Exception):
+    pass
+
+
+def segundos_retry_after(valor):
+    # Retry-After puede venir en segundos o como fecha HTTP
+    if valor is None:
+        return None
+    try:
+        return max(float(valor), 0.0)
+    except ValueError:
+        pass
+    try:
+        fecha = email.utils.parsedate_to_datetime(valor)
+    except (TypeError, ValueError):
+        return None
+    if fecha.tzinfo is None:
+        fecha = fecha.replace(tzinfo=timezone.utc)
+    return max((fecha - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+class PoliticaReintentos:
+    def __init__(self, intentos=3, espera_base=0.5, espera_maxima=10, retry_after_maximo=60):
+        self.intentos = intentos
+        self.espera_base = espera_base
+        self.espera_maxima = espera_maxima
+        self.retry_after_maximo = retry_after_maximo
+
+    def reintentable(self, metodo, intento):
+        return metodo in METODOS_IDEMPOTENTES and intento + 1 < self.intentos
+
+    @staticmethod
+    def es_transitorio(codigo):
+        return codigo in CODIGOS_TRANSITORIOS
+
+    def espera(self, intento, retry_after=None):
+        # Segundos antes del siguiente intento, o None si el dispositivo pide esperar más de lo razonable
+        segundos = segundos_retry_after(retry_after)
+        if segundos is not None:
+            return segundos if segundos <= self.retry_after_maximo else None
+        # Retroceso exponencial con jitter completo, para que los clientes no reintenten todos a la vez
+        return random.uniform(0, min(self.espera_maxima, self.espera_base * 2 ** intento))
+
+
+class _Interruptor:
+    __slots__ = ("estado", "fallos", "aperturas", "hasta")
+
+    def __init__(self):
+        self.estado = RegistroInterruptores.CERRADO
+        self.fallos = 0
+        self.aperturas = 0
+        self.hasta = 0.0
+
+
+class RegistroInterruptores:
+    # Un interruptor por dispositivo, compartido por todos los clientes RESTCONF del proceso.
+    # Cerrado: las solicitudes pasan. Abierto: fallan de inmediato hasta que vence el plazo.
+    # Semiabierto: pasa una sola solicitud de prueba; si funciona se cierra, si falla se vuelve a abrir
+    # con un plazo que se duplica en cada apertura consecutiva.
+    CERRADO = "cerrado"
+    ABIERTO = "abierto"
+    SEMIABIERTO = "semiabierto"
+
+    def __init__(self, umbral_fallos=5, tiempo_apertura=30, tiempo_apertura_maximo=300):
+        self.umbral_fallos = umbral_fallos
+        self.tiempo_apertura = tiempo_apertura
+        self.tiempo_apertura_maximo = tiempo_apertura_maximo
+        self._interruptores = {}
+        self._lock = threading.Lock()
+
+    def permitir(self, ip):
+        with self._lock:
+            interruptor = self._interruptores.get(ip)
+            if interruptor is None or interruptor.estado == self.CERRADO:
+                return True
+            ahora = time.monotonic()
+            if ahora < interruptor.hasta:
+                return False
+            # Esta solicitud es la prueba; si no informa su resultado, el plazo permite otra más adelante
+            interruptor.estado = self.SEMIABIERTO
+            interruptor.hasta = ahora + self.tiempo_apertura
+            return True
+
+    def registrar_exito(self, ip):
+        with self._lock:
+            self._interruptores.pop(ip, None)
+
+    def registrar_fallo(self, ip):
+        with self._lock:
+            interruptor = self._interruptores.setdefault(ip, _Interruptor())
+            interruptor.fallos += 1
+            if interruptor.estado == self.SEMIABIERTO or interruptor.fallos >= self.umbral_fallos:
+                interruptor.estado = self.ABIERTO
+                interruptor.aperturas += 1
+                plazo = min(self.tiempo_apertura * 2 ** (interruptor.aperturas - 1), self.tiempo_apertura_maximo)
+                interruptor.hasta = time.monotonic() + plazo
+
+    def estado(self, ip):
+        with self._lock:
+            interruptor = self._interruptores.get(ip)
+            return self.CERRADO if interruptor is None else interruptor.estado
+
+    def reiniciar(self, ip=None):
+        with self._lock:
+            if ip is None:
+                self._interruptores.clear()
+            else:
+                self._interruptores.pop(ip, None)
+
+
+reintentos_predeterminados = PoliticaReintentos()
+interruptores_compartidos = RegistroInterruptores()
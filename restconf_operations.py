@@ -1,76 +1,124 @@
 import requests
 import json
+import time
+from requests.adapters import HTTPAdapter
+from .cache_restconf import cache_compartida
+from .resiliencia import (CircuitoAbierto, TIMEOUT_CONEXION, TIMEOUT_LECTURA, interruptores_compartidos,
+                          reintentos_predeterminados)
+from .json_incremental import iterar_subarboles, iterar_subarboles_objeto
+from .metricas import metricas
 
 # Desactivar las advertencias de seguridad SSL
 requests.packages.urllib3.disable_warnings()
 
-class RESTCONFOperations:
-    def __init__(self, ip, usuario, contrasena):
+RUTA_CONFIGURACION_RUNNING = "Cisco-IOS-XE-native:native"
+RUTA_TABLA_ENRUTAMIENTO = "Cisco-IOS-XE-routing:routing-state"
+RUTA_INTERFACES = "ietf-interfaces:interfaces"
+# El PATCH de un lote debe apuntar al contenedor static-routes, que es la raíz del cuerpo enviado
+RUTA_CONTENEDOR_RUTAS_ESTATICAS = "ietf-routing:routing/routing-instance=default/ribs/rib=ipv4/ipv4-routes/static-routes"
+RUTA_RUTAS_ESTATICAS = RUTA_CONTENEDOR_RUTAS_ESTATICAS + "/static"
+TAMANO_FRAGMENTO = 64 * 1024
+MAX_BYTES_LOTE = 256 * 1024
+MAX_ELEMENTOS_LOTE = 200
+
+class _CopiaCuerpo:
+    # Acumula los fragmentos de una respuesta mientras se analizan, mientras no superen el tamaño máximo de la caché
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.fragmentos = []
+        self.tamano = 0
+        self.completa = True
+
+    def copiar(self, fragmentos):
+        for fragmento in fragmentos:
+            if self.completa:
+                self.tamano += len(fragmento)
+                if self.tamano > self.max_bytes:
+                    self.completa = False
+                    self.fragmentos = []
+                else:
+                    self.fragmentos.append(fragmento)
+            yield fragmento
+
+    def texto(self):
+        return b"".join(self.fragmentos).decode("utf-8")
+
+
+class RESTCONFBase:
+    def __init__(self, ip, usuario, contrasena, timeout=None, cache=cache_compartida,
+                 reintentos=reintentos_predeterminados, interruptores=interruptores_compartidos, esquema="https"):
         self.ip = ip
         self.usuario = usuario
         self.contrasena = contrasena
-        self.base_url = f"https://{ip}/restconf/data"
-
-    def es_dispositivo_operativo(self):
-        try:
-            response = requests.get(self.base_url, auth=(self.usuario, self.contrasena), verify=False)
-            return response.status_code == 200
-        except requests.RequestException as e:
-            print(f"Error al verificar el dispositivo: {e}")
-            return False
+        # Segundos para conectar y para cada lectura, o una tupla (conexion, lectura)
+        self.timeout = (TIMEOUT_CONEXION, TIMEOUT_LECTURA) if timeout is None else timeout
+        self.cache = cache
+        self.reintentos = reintentos
+        self.interruptores = interruptores
+        # esquema="http" solo tiene sentido para pruebas contra un dispositivo simulado
+        self.base_url = f"{esquema}://{ip}/restconf/data"
 
-    def obtener_configuracion_running(self):
-        api_url = f"{self.base_url}/Cisco-IOS-XE-native:native"
+    def obtener_configuracion_running(self, refrescar=False):
+        # refrescar=True consulta siempre al dispositivo (por ejemplo, para una instantánea) y actualiza la caché
+        api_url = f"{self.base_url}/{RUTA_CONFIGURACION_RUNNING}"
         headers = {"Accept": "application/yang-data+json"}
-        return self._realizar_solicitud_get(api_url, headers)
+        return self._realizar_solicitud_get(api_url, headers, refrescar)
 
     def obtener_tabla_enrutamiento(self):
-        api_url = f"{self.base_url}/Cisco-IOS-XE-routing:routing-state"
+        api_url = f"{self.base_url}/{RUTA_TABLA_ENRUTAMIENTO}"
         headers = {"Accept": "application/yang-data+json"}
         return self._realizar_solicitud_get(api_url, headers)
 
     def crear_interfaz(self, nombre_interfaz, descripcion, direccion_ip, mascara):
-        api_url = f"{self.base_url}/ietf-interfaces:interfaces/interface={nombre_interfaz}"
+        api_url = f"{self.base_url}/{RUTA_INTERFACES}/interface={nombre_interfaz}"
         headers = {"Content-Type": "application/yang-data+json"}
         data = {
-            "ietf-interfaces:interface": {
-                "name": nombre_interfaz,
-                "description": descripcion,
-                "type": "iana-if-type:ethernetCsmacd",
-                "enabled": True,
-                "ietf-ip:ipv4": {
-                    "address": [
-                        {
-                            "ip": direccion_ip,
-                            "netmask": mascara
-                        }
-                    ]
-                }
-            }
+            "ietf-interfaces:interface": self._datos_interfaz(nombre_interfaz, descripcion, direccion_ip, mascara)
         }
         return self._realizar_solicitud_put(api_url, headers, data)
 
+    @staticmethod
+    def _datos_interfaz(nombre_interfaz, descripcion, direccion_ip, mascara):
+        return {
+            "name": nombre_interfaz,
+            "description": descripcion,
+            "type": "iana-if-type:ethernetCsmacd",
+            "enabled": True,
+            "ietf-ip:ipv4": {
+                "address": [
+                    {
+                        "ip": direccion_ip,
+                        "netmask": mascara
+                    }
+                ]
+            }
+        }
+
     def borrar_interfaz(self, nombre_interfaz):
-        api_url = f"{self.base_url}/ietf-interfaces:interfaces/interface={nombre_interfaz}"
+        api_url = f"{self.base_url}/{RUTA_INTERFACES}/interface={nombre_interfaz}"
         return self._realizar_solicitud_delete(api_url)
 
     def crear_ruta(self, destino, mascara, siguiente_salto):
-        api_url = f"{self.base_url}/ietf-routing:routing/routing-instance=default/ribs/rib=ipv4/ipv4-routes/static-routes/static"
+        api_url = f"{self.base_url}/{RUTA_RUTAS_ESTATICAS}"
         headers = {"Content-Type": "application/yang-data+json"}
         data = {
             "ietf-routing:static-routes": {
                 "route": [
-                    {
-                        "destination-prefix": f"{destino}/{mascara}",
-                        "next-hop": {
-                            "next-hop-address": siguiente_salto
-                        }
-                    }
+                    self._datos_ruta(destino, mascara, siguiente_salto)
                 ]
             }
         }
         return self._realizar_solicitud_post(api_url, headers, data)
 
+    @staticmethod
+    def _datos_ruta(destino, mascara, siguiente_salto):
+        return {
+            "destination-prefix": f"{destino}/{mascara}",
+            "next-hop": {
+                "next-hop-address": siguiente_salto
+            }
+        }
+
     def configurar_protocolo_enrutamiento(self, protocolo, instancia, parametros):
         api_url = f"{self.base_url}/ietf-routing:routing/routing-instance={instancia}/routing-protocols/routing-protocol={protocolo}"
         headers = {"Content-Type": "application/yang-data+json"}
@@ -79,42 +127,339 @@ class RESTCONFOperations:
         }
         return self._realizar_solicitud_put(api_url, headers, data)
 
-    def _realizar_solicitud_get(self, url, headers):
-        response = requests.get(url, auth=(self.usuario, self.contrasena), headers=headers, verify=False)
-        if response.status_code == 200:
+    @staticmethod
+    def _dividir_en_lotes(elementos, datos, max_bytes=MAX_BYTES_LOTE, max_elementos=MAX_ELEMENTOS_LOTE):
+        # Agrupa los elementos en lotes cuyo cuerpo JSON no supere max_bytes ni max_elementos
+        lote, datos_lote, tamano = [], [], 0
+        for elemento, dato in zip(elementos, datos):
+            tamano_dato = len(json.dumps(dato)) + 1
+            if lote and (tamano + tamano_dato > max_bytes or len(lote) >= max_elementos):
+                yield lote, datos_lote
+                lote, datos_lote, tamano = [], [], 0
+            lote.append(elemento)
+            datos_lote.append(dato)
+            tamano += tamano_dato
+        if lote:
+            yield lote, datos_lote
+
+    def _verificar_circuito(self, metodo, url):
+        if self.interruptores is not None and not self.interruptores.permitir(self.ip):
+            if metricas.habilitado:
+                metricas.registrar_solicitud(self.ip, metodo, self._ruta_yang(url), "CircuitoAbierto", 0.0)
+            raise CircuitoAbierto(f"El dispositivo {self.ip} falló repetidamente; se volverá a probar más tarde")
+
+    def _registrar_resultado(self, exitoso):
+        # Las respuestas 4xx (incluida 429) indican que el dispositivo responde: no cuentan como fallo
+        if self.interruptores is None:
+            return
+        if exitoso:
+            self.interruptores.registrar_exito(self.ip)
+        else:
+            self.interruptores.registrar_fallo(self.ip)
+
+    def _medir_solicitud(self, metodo, url, codigo, inicio, enviados=0, recibidos=0):
+        metricas.registrar_solicitud(self.ip, metodo, self._ruta_yang(url), codigo, time.perf_counter() - inicio, enviados, recibidos)
+
+    def _ruta_yang(self, url):
+        return url[len(self.base_url) + 1:]
+
+    def _consultar_cache(self, url, headers, refrescar=False):
+        if self.cache is None or refrescar:
+            return None, headers
+        entrada = self.cache.obtener(self.ip, self._ruta_yang(url), self.usuario)
+        if entrada is not None and not entrada.vigente() and entrada.revalidable():
+            # Revalidación condicional: el dispositivo responde 304 si el contenido no cambió
+            headers = dict(headers)
+            if entrada.etag is not None:
+                headers["If-None-Match"] = entrada.etag
+            if entrada.ultima_modificacion is not None:
+                headers["If-Modified-Since"] = entrada.ultima_modificacion
+        return entrada, headers
+
+    def _procesar_respuesta_get_cache(self, url, entrada, codigo, razon, texto, cabeceras):
+        if codigo == 304 and entrada is not None:
+            self.cache.refrescar(entrada)
+            return entrada.valor
+        valor = self._procesar_respuesta_get(codigo, razon, texto)
+        if valor is not None and self.cache is not None:
+            self.cache.guardar(self.ip, self._ruta_yang(url), texto, len(texto), cabeceras.get("ETag"), cabeceras.get("Last-Modified"),
+                               self.usuario)
+        return valor
+
+    def _invalidar_cache(self, url):
+        if self.cache is not None:
+            # Toda escritura altera la configuración running y puede alterar el estado de enrutamiento
+            self.cache.invalidar(self.ip, [self._ruta_yang(url), RUTA_CONFIGURACION_RUNNING, RUTA_TABLA_ENRUTAMIENTO])
+
+    def _procesar_respuesta_get(self, codigo, razon, texto):
+        if codigo == 200:
             try:
-                return response.json()
+                return json.loads(texto)
             except json.JSONDecodeError as e:
                 print('Error al decodificar el JSON:', str(e))
                 return None
         else:
-            print(f"Error: {response.status_code} - {response.reason}")
-            print(response.text)
+            self._informar_error(codigo, razon, texto)
             return None
 
-    def _realizar_solicitud_put(self, url, headers, data):
-        response = requests.put(url, auth=(self.usuario, self.contrasena), headers=headers, json=data, verify=False)
-        if response.status_code in [200, 201]:
-            return response.json()
+    def _procesar_respuesta_escritura(self, url, codigo, razon, texto):
+        if codigo in [200, 201, 204]:
+            self._invalidar_cache(url)
+            # Las escrituras RESTCONF suelen responder 201 o 204 sin cuerpo
+            if not texto.strip():
+                return True
+            try:
+                return json.loads(texto)
+            except json.JSONDecodeError:
+                return True
         else:
-            print(f"Error: {response.status_code} - {response.reason}")
-            print(response.text)
+            self._informar_error(codigo, razon, texto)
             return None
 
-    def _realizar_solicitud_post(self, url, headers, data):
-        response = requests.post(url, auth=(self.usuario, self.contrasena), headers=headers, json=data, verify=False)
-        if response.status_code in [200, 201]:
-            return response.json()
+    def _procesar_respuesta_patch(self, url, codigo, razon, texto):
+        if codigo in [200, 201, 204]:
+            self._invalidar_cache(url)
+            return True
         else:
-            print(f"Error: {response.status_code} - {response.reason}")
-            print(response.text)
-            return None
+            self._informar_error(codigo, razon, texto)
+            return False
 
-    def _realizar_solicitud_delete(self, url):
-        response = requests.delete(url, auth=(self.usuario, self.contrasena), verify=False)
-        if response.status_code == 204:
+    def _procesar_respuesta_delete(self, url, codigo, razon, texto):
+        if codigo == 204:
+            self._invalidar_cache(url)
             return True
         else:
-            print(f"Error: {response.status_code} - {response.reason}")
-            print(response.text)
-            return False
\ No newline at end of file
+            self._informar_error(codigo, razon, texto)
+            return False
+
+    @staticmethod
+    def _informar_error(codigo, razon, texto):
+        print(f"Error: {codigo} - {razon}")
+        print(texto)
+
+
+class RESTCONFOperations(RESTCONFBase):
+    def __init__(self, ip, usuario, contrasena, timeout=None, tamano_pool=4, inactividad_maxima=60, cache=cache_compartida,
+                 reintentos=reintentos_predeterminados, interruptores=interruptores_compartidos, esquema="https", fecha_limite=None):
+        super().__init__(ip, usuario, contrasena, timeout, cache, reintentos, interruptores, esquema)
+        self.tamano_pool = tamano_pool
+        # Instante absoluto (time.monotonic()) a partir del cual ninguna solicitud ni reintento puede empezar
+        self.fecha_limite = fecha_limite
+        self.inactividad_maxima = inactividad_maxima
+        self._sesion = None
+        self._ultimo_uso = 0.0
+        self._handshakes_previos = 0
+        self._solicitudes_previas = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        self.cerrar()
+
+    @property
+    def sesion(self):
+        ahora = time.monotonic()
+        # Las conexiones inactivas por más de inactividad_maxima segundos se descartan
+        if self._sesion is not None and self.inactividad_maxima is not None and ahora - self._ultimo_uso > self.inactividad_maxima:
+            self.cerrar()
+        if self._sesion is None:
+            self._sesion = self._crear_sesion()
+        self._ultimo_uso = ahora
+        return self._sesion
+
+    def _crear_sesion(self):
+        sesion = requests.Session()
+        sesion.auth = (self.usuario, self.contrasena)
+        # verify se pasa en cada solicitud: en la sesión lo reemplazaría REQUESTS_CA_BUNDLE del entorno
+        sesion.headers.update({"Accept": "application/yang-data+json", "Connection": "keep-alive"})
+        adaptador = HTTPAdapter(pool_connections=1, pool_maxsize=self.tamano_pool)
+        sesion.mount("https://", adaptador)
+        sesion.mount("http://", adaptador)
+        return sesion
+
+    def cerrar(self):
+        if self._sesion is not None:
+            handshakes, solicitudes = self._contadores_pool()
+            self._handshakes_previos += handshakes
+            self._solicitudes_previas += solicitudes
+            self._sesion.close()
+            self._sesion = None
+
+    def _contadores_pool(self):
+        handshakes = solicitudes = 0
+        if self._sesion is None:
+            return handshakes, solicitudes
+        adaptador = self._sesion.get_adapter(self.base_url)
+        pools = adaptador.poolmanager.pools
+        for clave in pools.keys():
+            pool = pools.get(clave)
+            if pool is not None:
+                handshakes += pool.num_connections
+                solicitudes += pool.num_requests
+        return handshakes, solicitudes
+
+    def estadisticas_conexion(self):
+        handshakes, solicitudes = self._contadores_pool()
+        handshakes += self._handshakes_previos
+        solicitudes += self._solicitudes_previas
+        return {
+            "solicitudes": solicitudes,
+            "handshakes_realizados": handshakes,
+            "handshakes_evitados": max(solicitudes - handshakes, 0),
+        }
+
+    def _tiempo_restante(self):
+        # Timeout de la próxima solicitud, recortado para no pasar de la fecha límite
+        if self.fecha_limite is None:
+            return self.timeout
+        restante = self.fecha_limite - time.monotonic()
+        if restante <= 0:
+            raise requests.Timeout("Se alcanzó la fecha límite de la operación")
+        conexion, lectura = self.timeout if isinstance(self.timeout, tuple) else (self.timeout, self.timeout)
+        return min(conexion, restante), min(lectura, restante)
+
+    def _hay_tiempo_para(self, espera):
+        return self.fecha_limite is None or time.monotonic() + espera < self.fecha_limite
+
+    def _enviar(self, metodo, url, **kwargs):
+        # Aplica el interruptor del dispositivo y, en métodos idempotentes, reintenta los errores de red
+        # y las respuestas transitorias con retroceso exponencial o lo que indique Retry-After
+        self._verificar_circuito(metodo, url)
+        medir = metricas.habilitado
+        intento = 0
+        while True:
+            timeout = self._tiempo_restante()
+            inicio = time.perf_counter() if medir else 0.0
+            try:
+                response = self.sesion.request(metodo, url, verify=False, timeout=timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if medir:
+                    self._medir_solicitud(metodo, url, type(e).__name__, inicio)
+                espera = self.reintentos.espera(intento)
+                if not self.reintentos.reintentable(metodo, intento) or not self._hay_tiempo_para(espera):
+                    self._registrar_resultado(False)
+                    raise
+            else:
+                if medir:
+                    # Con stream=True el cuerpo todavía no se leyó: se usa Content-Length si el dispositivo lo informa
+                    recibidos = int(response.headers.get("Content-Length", 0)) if kwargs.get("stream") else len(response.content)
+                    self._medir_solicitud(metodo, url, response.status_code, inicio, len(response.request.body or b""), recibidos)
+                if not self.reintentos.es_transitorio(response.status_code):
+                    self._registrar_resultado(True)
+                    return response
+                espera = self.reintentos.espera(intento, response.headers.get("Retry-After"))
+                if espera is None or not self.reintentos.reintentable(metodo, intento) or not self._hay_tiempo_para(espera):
+                    self._registrar_resultado(response.status_code < 500)
+                    return response
+                response.close()
+            intento += 1
+            time.sleep(espera)
+
+    def es_dispositivo_operativo(self):
+        try:
+            response = self._enviar("GET", self.base_url)
+            return response.status_code == 200
+        except (requests.RequestException, CircuitoAbierto) as e:
+            print(f"Error al verificar el dispositivo: {e}")
+            return False
+
+    def obtener_configuracion_running_stream(self, filtro="*/*"):
+        # Por defecto produce cada sección de primer nivel (interface, ip, router, ...) a medida que llega
+        api_url = f"{self.base_url}/{RUTA_CONFIGURACION_RUNNING}"
+        headers = {"Accept": "application/yang-data+json"}
+        return self._realizar_solicitud_get_stream(api_url, headers, filtro)
+
+    def obtener_tabla_enrutamiento_stream(self, filtro="*/routing-instance/ribs/rib/routes/route"):
+        api_url = f"{self.base_url}/{RUTA_TABLA_ENRUTAMIENTO}"
+        headers = {"Accept": "application/yang-data+json"}
+        return self._realizar_solicitud_get_stream(api_url, headers, filtro)
+
+    def _realizar_solicitud_get_stream(self, url, headers, filtro):
+        entrada, headers = self._consultar_cache(url, headers)
+        if entrada is not None and entrada.vigente():
+            yield from iterar_subarboles_objeto(entrada.valor, filtro)
+            return
+        with self._enviar("GET", url, headers=headers, stream=True) as response:
+            if response.status_code == 304 and entrada is not None:
+                self.cache.refrescar(entrada)
+                yield from iterar_subarboles_objeto(entrada.valor, filtro)
+            elif response.status_code == 200:
+                fragmentos = response.iter_content(TAMANO_FRAGMENTO)
+                # El cuerpo se copia mientras se analiza; solo se guarda en la caché si se leyó completo y es válido
+                copia = _CopiaCuerpo(self.cache.max_bytes) if self.cache is not None else None
+                if copia is not None:
+                    fragmentos = copia.copiar(fragmentos)
+                try:
+                    yield from iterar_subarboles(fragmentos, filtro)
+                except ValueError as e:
+                    print('Error al decodificar el JSON:', str(e))
+                    return
+                if copia is not None and copia.completa:
+                    texto = copia.texto()
+                    self.cache.guardar(self.ip, self._ruta_yang(url), texto, len(texto), response.headers.get("ETag"),
+                                       response.headers.get("Last-Modified"), self.usuario)
+            else:
+                self._informar_error(response.status_code, response.reason, response.text)
+
+    def crear_interfaces(self, interfaces, individual_si_falla=True, max_bytes=MAX_BYTES_LOTE):
+        # interfaces: lista de tuplas (nombre_interfaz, descripcion, direccion_ip, mascara)
+        api_url = f"{self.base_url}/{RUTA_INTERFACES}"
+        datos = [self._datos_interfaz(*interfaz) for interfaz in interfaces]
+        return self._escribir_en_lotes(api_url, "ietf-interfaces:interfaces", "interface", interfaces, datos,
+                                       self.crear_interfaz, individual_si_falla, max_bytes)
+
+    def crear_rutas(self, rutas, individual_si_falla=True, max_bytes=MAX_BYTES_LOTE):
+        # rutas: lista de tuplas (destino, mascara, siguiente_salto)
+        api_url = f"{self.base_url}/{RUTA_CONTENEDOR_RUTAS_ESTATICAS}"
+        datos = [self._datos_ruta(*ruta) for ruta in rutas]
+        return self._escribir_en_lotes(api_url, "ietf-routing:static-routes", "route", rutas, datos,
+                                       self.crear_ruta, individual_si_falla, max_bytes)
+
+    def _escribir_en_lotes(self, api_url, contenedor, lista, elementos, datos, operacion_individual, individual_si_falla, max_bytes):
+        headers = {"Content-Type": "application/yang-data+json"}
+        resultados = []
+        for lote, datos_lote in self._dividir_en_lotes(elementos, datos, max_bytes):
+            try:
+                aplicado = self._realizar_solicitud_patch(api_url, headers, {contenedor: {lista: datos_lote}})
+            except (requests.RequestException, CircuitoAbierto) as e:
+                # Un lote fallido no debe perder los resultados de los lotes ya aplicados
+                print(f"Error al aplicar un lote de {len(lote)} elementos: {e}")
+                aplicado = False
+            if aplicado:
+                resultados.extend((elemento, True) for elemento in lote)
+            elif individual_si_falla:
+                # El dispositivo rechazó el lote completo: se reintenta elemento por elemento
+                for elemento in lote:
+                    try:
+                        exitoso = operacion_individual(*elemento) is not None
+                    except (requests.RequestException, json.JSONDecodeError, CircuitoAbierto) as e:
+                        print(f"Error al aplicar {elemento}: {e}")
+                        exitoso = False
+                    resultados.append((elemento, exitoso))
+            else:
+                resultados.extend((elemento, False) for elemento in lote)
+        return resultados
+
+    def _realizar_solicitud_get(self, url, headers, refrescar=False):
+        entrada, headers = self._consultar_cache(url, headers, refrescar)
+        if entrada is not None and entrada.vigente():
+            return entrada.valor
+        response = self._enviar("GET", url, headers=headers)
+        return self._procesar_respuesta_get_cache(url, entrada, response.status_code, response.reason, response.text, response.headers)
+
+    def _realizar_solicitud_put(self, url, headers, data):
+        response = self._enviar("PUT", url, headers=headers, json=data)
+        return self._procesar_respuesta_escritura(url, response.status_code, response.reason, response.text)
+
+    def _realizar_solicitud_post(self, url, headers, data):
+        response = self._enviar("POST", url, headers=headers, json=data)
+        return self._procesar_respuesta_escritura(url, response.status_code, response.reason, response.text)
+
+    def _realizar_solicitud_patch(self, url, headers, data):
+        response = self._enviar("PATCH", url, headers=headers, json=data)
+        return self._procesar_respuesta_patch(url, response.status_code, response.reason, response.text)
+
+    def _realizar_solicitud_delete(self, url):
+        response = self._enviar("DELETE", url)
+        return self._procesar_respuesta_delete(url, response.status_code, response.reason, response.text)
@@ -0,0 +1,162 @@
+import asyncio
+import json
+import time
+import aiohttp
+from .restconf_operations import RESTCONFBase
+from .cache_restconf import cache_compartida
+from .resiliencia import CircuitoAbierto, interruptores_compartidos, reintentos_predeterminados
+from .metricas import metricas
+
+
+class RESTCONFOperationsAsync(RESTCONFBase):
+    def __init__(self, ip, usuario, contrasena, timeout=None, limite=None, tamano_pool=4, fecha_limite=None, cache=cache_compartida,
+                 reintentos=reintentos_predeterminados, interruptores=interruptores_compartidos, esquema="https"):
+        super().__init__(ip, usuario, contrasena, timeout, cache, reintentos, interruptores, esquema)
+        # limite puede ser un número o un asyncio.Semaphore compartido entre varios clientes
+        self.limite = asyncio.Semaphore(limite) if isinstance(limite, int) else limite
+        self.tamano_pool = tamano_pool
+        # Instante absoluto (loop.time()) a partir del cual ninguna solicitud puede continuar
+        self.fecha_limite = fecha_limite
+        self._sesion = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, tipo, valor, traza):
+        await self.cerrar()
+
+    def _obtener_sesion(self):
+        if self._sesion is None or self._sesion.closed:
+            conector = aiohttp.TCPConnector(limit=self.tamano_pool, ssl=False)
+            conexion, lectura = self.timeout if isinstance(self.timeout, tuple) else (self.timeout, self.timeout)
+            self._sesion = aiohttp.ClientSession(
+                connector=conector,
+                auth=aiohttp.BasicAuth(self.usuario, self.contrasena),
+                headers={"Accept": "application/yang-data+json"},
+                timeout=aiohttp.ClientTimeout(total=None, sock_connect=conexion, sock_read=lectura),
+            )
+        return self._sesion
+
+    async def cerrar(self):
+        if self._sesion is not None:
+            await self._sesion.close()
+            self._sesion = None
+
+    def _tiempo_restante(self):
+        # Un timeout numérico limita además cada solicitud completa; una tupla solo limita cada fase
+        timeout = None if isinstance(self.timeout, tuple) else self.timeout
+        if self.fecha_limite is not None:
+            restante = self.fecha_limite - asyncio.get_running_loop().time()
+            if restante <= 0:
+                raise asyncio.TimeoutError("Se alcanzó la fecha límite de la operación")
+            timeout = restante if timeout is None else min(timeout, restante)
+        return timeout
+
+    def _hay_tiempo_para(self, espera):
+        return self.fecha_limite is None or asyncio.get_running_loop().time() + espera < self.fecha_limite
+
+    async def _solicitar(self, metodo, url, headers=None, data=None):
+        # Mismo interruptor y misma política de reintentos que el cliente síncrono
+        self._verificar_circuito(metodo, url)
+        medir = metricas.habilitado
+        # El cuerpo se serializa una sola vez para todos los intentos
+        cuerpo = None if data is None else json.dumps(data).encode("utf-8")
+        intento = 0
+        while True:
+            # La espera en la cola queda fuera del timeout de la solicitud y de los reintentos
+            await self._esperar_turno()
+            try:
+                timeout = self._tiempo_restante()
+                inicio = time.perf_counter() if medir else 0.0
+                try:
+                    codigo, razon, texto, cabeceras, recibidos = await asyncio.wait_for(self._enviar(metodo, url, headers, cuerpo), timeout)
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                    if medir:
+                        self._medir_solicitud(metodo, url, type(e).__name__, inicio)
+                    espera = self.reintentos.espera(intento)
+                    if not self.reintentos.reintentable(metodo, intento) or not self._hay_tiempo_para(espera):
+                        self._registrar_resultado(False)
+                        raise
+                else:
+                    if medir:
+                        self._medir_solicitud(metodo, url, codigo, inicio, len(cuerpo or b""), recibidos)
+                    respuesta = codigo, razon, texto, cabeceras
+                    if not self.reintentos.es_transitorio(codigo):
+                        self._registrar_resultado(True)
+                        return respuesta
+                    espera = self.reintentos.espera(intento, cabeceras.get("Retry-After"))
+                    if espera is None or not self.reintentos.reintentable(metodo, intento) or not self._hay_tiempo_para(espera):
+                        self._registrar_resultado(codigo < 500)
+                        return respuesta
+            finally:
+                if self.limite is not None:
+                    self.limite.release()
+            intento += 1
+            await asyncio.sleep(espera)
+
+    async def _esperar_turno(self):
+        # Solo la fecha límite acota la espera por el semáforo; agotarla no es un fallo del dispositivo,
+        # así que el TimeoutError sale sin pasar por el interruptor ni por los reintentos
+        if self.limite is None:
+            return
+        if self.fecha_limite is None:
+            await self.limite.acquire()
+            return
+        restante = self.fecha_limite - asyncio.get_running_loop().time()
+        if restante <= 0:
+            raise asyncio.TimeoutError("Se alcanzó la fecha límite de la operación")
+        await asyncio.wait_for(self.limite.acquire(), restante)
+
+    async def _enviar(self, metodo, url, headers, cuerpo):
+        if cuerpo is not None:
+            headers = {"Content-Type": "application/json", **(headers or {})}
+        async with self._obtener_sesion().request(metodo, url, headers=headers, data=cuerpo) as response:
+            contenido = await response.read()
+            texto = await response.text()
+            return response.status, response.reason, texto, response.headers, len(contenido)
+
+    async def es_dispositivo_operativo(self):
+        try:
+            codigo, _, _, _ = await self._solicitar("GET", self.base_url)
+            return codigo == 200
+        except (aiohttp.ClientError, asyncio.TimeoutError, CircuitoAbierto) as e:
+            print(f"Error al verificar el dispositivo: {e}")
+            return False
+
+    async def _realizar_solicitud_get(self, url, headers, refrescar=False):
+        entrada, headers = self._consultar_cache(url, headers, refrescar)
+        if entrada is not None and entrada.vigente():
+            return entrada.valor
+        return self._procesar_respuesta_get_cache(url, entrada, *await self._solicitar("GET", url, headers))
+
+    async def _realizar_solicitud_put(self, url, headers, data):
+        codigo, razon, texto, _ = await self._solicitar("PUT", url, headers, data)
+        return self._procesar_respuesta_escritura(url, codigo, razon, texto)
+
+    async def _realizar_solicitud_post(self, url, headers, data):
+        codigo, razon, texto, _ = await self._solicitar("POST", url, headers, data)
+        return self._procesar_respuesta_escritura(url, codigo, razon, texto)
+
+    async def _realizar_solicitud_delete(self, url):
+        codigo, razon, texto, _ = await self._solicitar("DELETE", url)
+        return self._procesar_respuesta_delete(url, codigo, razon, texto)
+
+
+async def ejecutar_en_dispositivos(ips, usuario, contrasena, operacion, *args, concurrencia=100, timeout=30):
+    limite = asyncio.Semaphore(concurrencia)
+
+    async def operar(ip):
+        async with RESTCONFOperationsAsync(ip, usuario, contrasena, timeout=timeout, limite=limite) as restconf:
+            try:
+                return ip, await getattr(restconf, operacion)(*args), None
+            except (aiohttp.ClientError, asyncio.TimeoutError, CircuitoAbierto) as e:
+                return ip, None, str(e) or "Tiempo de espera agotado"
+
+    tareas = [asyncio.ensure_future(operar(ip)) for ip in ips]
+    try:
+        for siguiente in asyncio.as_completed(tareas):
+            yield await siguiente
+    finally:
+        # Si el consumidor se detiene o es cancelado, se cancelan las solicitudes pendientes
+        for tarea in tareas:
+            tarea.cancel()
@@ -0,0 +1,56 @@
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from .diario_cambios import escribir_atomico
+
+
+def _git(*argumentos):
+    try:
+        salida = subprocess.run(["git", *argumentos], cwd=os.path.dirname(os.path.abspath(__file__)),
+                                capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return salida.stdout.strip() if salida.returncode == 0 else None
+
+
+def metadatos():
+    # Lo necesario para saber contra qué código y en qué máquina se midió
+    cambios = _git("status", "--porcelain", "--untracked-files=no")
+    return {
+        "commit": _git("rev-parse", "HEAD"),
+        "cambios_sin_confirmar": None if cambios is None else bool(cambios),
+        "fecha": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "implementacion": platform.python_implementation(),
+        "plataforma": platform.platform(),
+        "procesadores": os.cpu_count(),
+    }
+
+
+def guardar_resultados(ruta, nombre, parametros, resultados):
+    # resultados: lista de diccionarios, cada uno con una clave "caso" que lo identifica entre ejecuciones
+    datos = {"benchmark": nombre, "entorno": metadatos(), "parametros": parametros, "resultados": resultados}
+    escribir_atomico(ruta, lambda archivo: json.dump(datos, archivo, ensure_ascii=False, indent=2))
+    return datos
+
+
+def comparar_resultados(ruta_anterior, resultados, metricas_comparadas):
+    # Líneas con la variación de cada métrica en los casos presentes en ambas ejecuciones
+    with open(ruta_anterior, "r", encoding="utf-8") as archivo:
+        anterior = json.load(archivo)
+    commit = (anterior.get("entorno", {}).get("commit") or "desconocido")[:12]
+    yield f"Comparación con {ruta_anterior} (commit {commit}):"
+    casos_anteriores = {resultado["caso"]: resultado for resultado in anterior.get("resultados", [])}
+    for resultado in resultados:
+        previo = casos_anteriores.get(resultado["caso"])
+        if previo is None:
+            continue
+        for metrica in metricas_comparadas:
+            antes, despues = previo.get(metrica), resultado.get(metrica)
+            if not isinstance(antes, (int, float)) or not isinstance(despues, (int, float)):
+                continue
+            variacion = f"{100 * (despues - antes) / antes:+.1f}%" if antes else "n/a"
+            yield f"  {resultado['caso']} {metrica}: {antes:g} -> {despues:g} ({variacion})"
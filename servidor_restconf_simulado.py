@@ -0,0 +1,216 @@
+import argparse
+import base64
+import hashlib
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Dispositivo IOS-XE simulado para pruebas y benchmarks: responde las rutas RESTCONF que usa
+# RESTCONFOperations con una latencia, un tamaño de respuesta y una tasa de errores configurables.
+# Solo usa la biblioteca estándar, así se puede lanzar en un proceso aparte sin instalar nada.
+PREFIJO = "/restconf/data"
+RUTA_CONFIGURACION_RUNNING = "Cisco-IOS-XE-native:native"
+RUTA_TABLA_ENRUTAMIENTO = "Cisco-IOS-XE-routing:routing-state"
+
+
+def configuracion_running(tamano):
+    # Configuración con tantas interfaces como hagan falta para llegar aproximadamente a "tamano" bytes
+    interfaces = []
+    configuracion = {RUTA_CONFIGURACION_RUNNING: {
+        "version": "17.9",
+        "hostname": "csr-simulado",
+        "interface": {"GigabitEthernet": interfaces},
+    }}
+    total = len(json.dumps(configuracion))
+    while total < tamano:
+        n = len(interfaces)
+        interfaz = {
+            "name": f"1/0/{n + 1}",
+            "description": f"Enlace simulado {n + 1}",
+            "ip": {"address": {"primary": {"address": f"10.{(n >> 8) & 255}.{n & 255}.1", "mask": "255.255.255.0"}}},
+        }
+        interfaces.append(interfaz)
+        total += len(json.dumps(interfaz)) + 2
+    return configuracion
+
+
+def tabla_enrutamiento(tamano):
+    rutas = []
+    tabla = {RUTA_TABLA_ENRUTAMIENTO: {"routing-instance": [
+        {"name": "default", "ribs": {"rib": [{"name": "ipv4-default", "routes": {"route": rutas}}]}},
+    ]}}
+    total = len(json.dumps(tabla))
+    while total < tamano:
+        n = len(rutas)
+        ruta = {
+            "destination-prefix": f"10.{(n >> 8) & 255}.{n & 255}.0/24",
+            "route-preference": 1,
+            "source-protocol": "static",
+            "next-hop": {"outgoing-interface": "GigabitEthernet1/0/1", "next-hop-address": "10.0.0.1"},
+        }
+        rutas.append(ruta)
+        total += len(json.dumps(ruta)) + 2
+    return tabla
+
+
+class ServidorRESTCONFSimulado(ThreadingHTTPServer):
+    daemon_threads = True
+    # Con la cola por defecto (5) las pruebas con mucha concurrencia ven conexiones rechazadas
+    request_queue_size = 1024
+
+    def __init__(self, direccion=("127.0.0.1", 0), latencia=0.0, variacion=0.0, tamano_respuesta=16 * 1024,
+                 tasa_error=0.0, codigo_error=503, usuario="admin", contrasena="admin", semilla=None):
+        super().__init__(direccion, ManejadorRESTCONF)
+        self.latencia = latencia
+        self.variacion = variacion
+        self.tasa_error = tasa_error
+        self.codigo_error = codigo_error
+        self.autorizacion = "Basic " + base64.b64encode(f"{usuario}:{contrasena}".encode("utf-8")).decode("ascii")
+        self.aleatorio = random.Random(semilla)
+        self._lock = threading.Lock()
+        self.solicitudes = 0
+        self.respuestas = {}
+        for ruta, contenido in ((RUTA_CONFIGURACION_RUNNING, configuracion_running(tamano_respuesta)),
+                                (RUTA_TABLA_ENRUTAMIENTO, tabla_enrutamiento(tamano_respuesta))):
+            cuerpo = json.dumps(contenido).encode("utf-8")
+            self.respuestas[ruta] = cuerpo, '"' + hashlib.blake2b(cuerpo, digest_size=8).hexdigest() + '"'
+
+    @property
+    def puerto(self):
+        return self.server_address[1]
+
+    def sortear(self):
+        # (segundos de espera, si la solicitud debe fallar)
+        with self._lock:
+            self.solicitudes += 1
+            espera = self.latencia + (self.aleatorio.uniform(0, self.variacion) if self.variacion else 0.0)
+            return espera, self.tasa_error > 0 and self.aleatorio.random() < self.tasa_error
+
+    def handle_error(self, solicitud, direccion_cliente):
+        # Un cliente que corta la conexión (timeout, lectura por partes abandonada) no es un error del servidor
+        if isinstance(sys.exc_info()[1], ConnectionError):
+            return
+        super().handle_error(solicitud, direccion_cliente)
+
+    def iniciar(self):
+        hilo = threading.Thread(target=self.serve_forever, daemon=True)
+        hilo.start()
+        return self
+
+    def detener(self):
+        self.shutdown()
+        self.server_close()
+
+
+class ManejadorRESTCONF(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "nginx"
+    # Cabeceras y cuerpo se escriben por separado; con Nagle activo cada respuesta esperaría el ACK retardado
+    disable_nagle_algorithm = True
+
+    def log_message(self, formato, *argumentos):
+        pass
+
+    def _responder(self, codigo, cuerpo=b"", cabeceras=()):
+        self.send_response(codigo)
+        if cuerpo:
+            self.send_header("Content-Type", "application/yang-data+json")
+        for nombre, valor in cabeceras:
+            self.send_header(nombre, valor)
+        self.send_header("Content-Length", str(len(cuerpo)))
+        self.end_headers()
+        if cuerpo and self.command != "HEAD":
+            self.wfile.write(cuerpo)
+
+    def _error(self, codigo, etiqueta, mensaje):
+        cuerpo = json.dumps({"ietf-restconf:errors": {"error": [
+            {"error-type": "application", "error-tag": etiqueta, "error-message": mensaje},
+        ]}}).encode("utf-8")
+        self._responder(codigo, cuerpo)
+
+    def _preparar(self):
+        # Lee el cuerpo, aplica la latencia y decide si la solicitud falla; devuelve la ruta YANG o None
+        longitud = int(self.headers.get("Content-Length") or 0)
+        if longitud:
+            self.rfile.read(longitud)
+        espera, fallar = self.server.sortear()
+        if espera:
+            time.sleep(espera)
+        if self.headers.get("Authorization") != self.server.autorizacion:
+            self._responder(401, cabeceras=[("WWW-Authenticate", 'Basic realm="restconf"')])
+            return None
+        if fallar:
+            self._error(self.server.codigo_error, "resource-denied", "Error simulado")
+            return None
+        ruta = self.path.split("?", 1)[0]
+        if ruta != PREFIJO and not ruta.startswith(PREFIJO + "/"):
+            self._error(404, "invalid-value", "Ruta desconocida")
+            return None
+        return ruta[len(PREFIJO) + 1:]
+
+    def do_GET(self):
+        ruta = self._preparar()
+        if ruta is None:
+            return
+        if ruta == "":
+            self._responder(200, b'{"ietf-restconf:data": {}}')
+            return
+        respuesta = self.server.respuestas.get(ruta)
+        if respuesta is None:
+            self._error(404, "invalid-value", "uri keypath not found")
+            return
+        cuerpo, etag = respuesta
+        if self.headers.get("If-None-Match") == etag:
+            self._responder(304, cabeceras=[("ETag", etag)])
+        else:
+            self._responder(200, cuerpo, [("ETag", etag)])
+
+    do_HEAD = do_GET
+
+    def do_PUT(self):
+        if self._preparar() is not None:
+            self._responder(201)
+
+    def do_POST(self):
+        if self._preparar() is not None:
+            self._responder(201)
+
+    def do_PATCH(self):
+        if self._preparar() is not None:
+            self._responder(204)
+
+    def do_DELETE(self):
+        if self._preparar() is not None:
+            self._responder(204)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dispositivo IOS-XE simulado que responde RESTCONF por HTTP")
+    parser.add_argument("--direccion", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=0, help="0 elige un puerto libre")
+    parser.add_argument("--latencia", type=float, default=0.0, help="Segundos de espera por solicitud")
+    parser.add_argument("--variacion", type=float, default=0.0, help="Segundos adicionales aleatorios, entre 0 y este valor")
+    parser.add_argument("--tamano", type=int, default=16 * 1024, help="Bytes aproximados de las respuestas GET")
+    parser.add_argument("--tasa-error", type=float, default=0.0, help="Fracción de solicitudes que responden con error")
+    parser.add_argument("--codigo-error", type=int, default=503)
+    parser.add_argument("--usuario", default="admin")
+    parser.add_argument("--contrasena", default="admin")
+    parser.add_argument("--semilla", type=int)
+    args = parser.parse_args()
+    servidor = ServidorRESTCONFSimulado((args.direccion, args.puerto), args.latencia, args.variacion, args.tamano,
+                                        args.tasa_error, args.codigo_error, args.usuario, args.contrasena, args.semilla)
+    # La primera línea indica el puerto a quien lanzó el proceso
+    print(f"Escuchando en {args.direccion}:{servidor.puerto}", flush=True)
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+
+
+if __name__ == "__main__":
+    main()
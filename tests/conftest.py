@@ -0,0 +1,30 @@
+import os
+import sys
+import types
+import pytest
+
+# Los módulos del repositorio se importan como paquete "modules" (igual que en main.py y cli.py);
+# el directorio raíz se registra con ese nombre para que funcionen los imports relativos
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if "modules" not in sys.modules:
+    paquete = types.ModuleType("modules")
+    paquete.__path__ = [RAIZ]
+    sys.modules["modules"] = paquete
+
+from modules.servidor_restconf_simulado import ServidorRESTCONFSimulado
+
+
+@pytest.fixture
+def servidor_simulado():
+    # Fábrica de dispositivos simulados en este mismo proceso; se detienen al terminar la prueba
+    servidores = []
+
+    def iniciar(**opciones):
+        servidor = ServidorRESTCONFSimulado(**opciones).iniciar()
+        servidores.append(servidor)
+        return servidor
+
+    yield iniciar
+    for servidor in servidores:
+        servidor.detener()
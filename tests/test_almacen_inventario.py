@@ -0,0 +1,78 @@
+import json
+from modules.administrador_redes import AdministradorRedes
+from modules.almacen_inventario import AlmacenInventario
+from modules.dispositivo import Dispositivo
+
+
+def escribir_formato_anterior(ruta):
+    # Formato original: las máscaras no se validaban, así que puede haber vacías o inválidas
+    datos = {
+        "campus": {"Central": "Sede central"},
+        "dispositivos": {},
+        "Central": [
+            {"nombre": "sw1", "modelo": "C9300", "capa": "Acceso", "interfaces": ["Gi1", "Gi2"],
+             "ips_masks": {"Gi1": ["10.0.0.1", ""], "Gi2": ["10.0.1.1", "255.0.255.0"]},
+             "vlans": {"V10": "10"}, "servicios": ["ssh"]},
+            {"nombre": "sw2", "modelo": "C9300", "capa": "Núcleo", "interfaces": ["Gi1"],
+             "ips_masks": {"Gi1": ["10.0.2.1", "255.255.255.0"]}, "vlans": {}, "servicios": []},
+        ],
+    }
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        json.dump(datos, archivo)
+
+
+def crear_dispositivo(nombre, ip="10.0.0.1"):
+    return Dispositivo(nombre, "C9300", "Acceso", ["Gi1"], {"Gi1": (ip, "255.255.255.0")}, {"V10": "10"}, ["ssh"])
+
+
+def test_carga_el_formato_anterior_con_mascaras_sin_validar(tmp_path):
+    ruta = str(tmp_path / "inventario.json")
+    escribir_formato_anterior(ruta)
+
+    administrador = AdministradorRedes(ruta)
+    dispositivos = {dispositivo.nombre: dispositivo for dispositivo in administrador.campus["Central"].dispositivos}
+    assert dict(dispositivos["sw1"].ips_masks) == {"Gi1": ("10.0.0.1", ""), "Gi2": ("10.0.1.1", "255.0.255.0")}
+    assert [nombre for nombre, _ in administrador.inventario.buscar_por_ip("10.0.0.1")] == ["Central"]
+    # Las máscaras vacías o no contiguas no definen subred; la válida sí
+    assert administrador.inventario.subredes_que_contienen("10.0.0.7") == []
+    assert administrador.inventario.subredes_que_contienen("10.0.1.7") == []
+    [(red, encontrados)] = administrador.inventario.subredes_que_contienen("10.0.2.7")
+    assert red == "10.0.2.0/24" and [dispositivo.nombre for _, dispositivo in encontrados] == ["sw2"]
+    resultado = administrador.analizar_direcciones()
+    assert len(resultado.direcciones_invalidas) == 2
+    administrador.diario.cerrar()
+
+
+def test_el_formato_anterior_se_migra_al_guardar(tmp_path):
+    ruta = str(tmp_path / "inventario.json")
+    escribir_formato_anterior(ruta)
+    administrador = AdministradorRedes(ruta)
+    administrador.guardar_en_archivo()
+    administrador.diario.cerrar()
+
+    assert AlmacenInventario(ruta).es_formato_indexado()
+    migrado = AdministradorRedes(ruta)
+    assert sorted(dispositivo.a_diccionario()["nombre"] for dispositivo in migrado.campus["Central"].dispositivos) == ["sw1", "sw2"]
+    assert len(migrado.inventario.buscar_por_ip("10.0.0.1")) == 1
+    migrado.diario.cerrar()
+
+
+def test_los_campus_se_cargan_al_usarlos(tmp_path):
+    ruta = str(tmp_path / "inventario.json")
+    administrador = AdministradorRedes(ruta)
+    for nombre in ("Norte", "Sur"):
+        administrador.crear_campus(nombre, f"Campus {nombre}")
+        administrador.registrar_dispositivo(nombre, crear_dispositivo(f"sw-{nombre}"))
+    administrador.guardar_en_archivo()
+    administrador.diario.cerrar()
+
+    reabierto = AdministradorRedes(ruta)
+    assert not reabierto.campus["Norte"].cargado and not reabierto.campus["Sur"].cargado
+    assert [dispositivo.nombre for dispositivo in reabierto.campus["Sur"].dispositivos] == ["sw-Sur"]
+    assert not reabierto.campus["Norte"].cargado
+    # Guardar sin haber cargado un campus conserva sus dispositivos
+    reabierto.guardar_en_archivo()
+    reabierto.diario.cerrar()
+    otra_vez = AdministradorRedes(ruta)
+    assert [dispositivo.nombre for dispositivo in otra_vez.campus["Norte"].dispositivos] == ["sw-Norte"]
+    otra_vez.diario.cerrar()
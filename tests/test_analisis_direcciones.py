@@ -0,0 +1,58 @@
+from modules.administrador_redes import AdministradorRedes
+from modules.analisis_direcciones import analizar
+from modules.campus import Campus
+from modules.dispositivo import Dispositivo
+
+
+def crear_dispositivo(nombre, ips_masks):
+    return Dispositivo(nombre, "C9300", "Acceso", list(ips_masks), ips_masks, {}, [])
+
+
+def crear_inventario():
+    norte = Campus("Norte", "")
+    norte.agregar_dispositivo(crear_dispositivo("sw1", {"Gi1": ("10.0.0.1", "255.255.255.0"), "Gi2": ("10.1.0.1", "255.255.0.0")}))
+    norte.agregar_dispositivo(crear_dispositivo("sw2", {"Gi1": ("10.0.0.1", "255.255.255.0"), "Gi2": ("10.0.0.2", "255.255.255.0")}))
+    sur = Campus("Sur", "")
+    sur.agregar_dispositivo(crear_dispositivo("sw3", {"Gi1": ("10.1.5.1", "255.255.255.0"), "Gi2": ("10.2.0.1", "255.0.255.0"),
+                                                      "Gi3": ("10.3.0.300", "255.255.255.0")}))
+    sur.agregar_dispositivo(crear_dispositivo("sw4", {"Gi1": ("10.0.0.1", "255.255.255.0")}))
+    return {"Norte": norte, "Sur": sur}
+
+
+def test_detecta_duplicadas_solapamientos_e_invalidas():
+    resultado = analizar(crear_inventario())
+    assert resultado.interfaces == 8
+    assert resultado.ips_duplicadas == {"10.0.0.1": [("Norte", "sw1", "Gi1"), ("Norte", "sw2", "Gi1"), ("Sur", "sw4", "Gi1")]}
+    assert [(mayor, menor, usos_menor) for mayor, menor, _, usos_menor in resultado.subredes_en_conflicto] == [
+        ("10.1.0.0/16", "10.1.5.0/24", [("Sur", "sw3", "Gi1")])]
+    assert sorted(invalida[:3] for invalida in resultado.direcciones_invalidas) == [("Sur", "sw3", "Gi2"), ("Sur", "sw3", "Gi3")]
+    assert resultado.hay_problemas
+
+
+def test_un_inventario_sin_problemas():
+    campus = Campus("Norte", "")
+    campus.agregar_dispositivo(crear_dispositivo("sw1", {"Gi1": ("10.0.0.1", "255.255.255.0")}))
+    campus.agregar_dispositivo(crear_dispositivo("sw2", {"Gi1": ("10.0.0.2", "255.255.255.0")}))
+    resultado = analizar({"Norte": campus})
+    assert not resultado.hay_problemas and resultado.interfaces == 2
+
+
+def test_el_reporte_de_un_campus_no_carga_el_resto(tmp_path, capsys):
+    ruta = str(tmp_path / "inventario.json")
+    administrador = AdministradorRedes(ruta)
+    for nombre, datos in crear_inventario().items():
+        administrador.crear_campus(nombre, "")
+        for dispositivo in datos.dispositivos:
+            administrador.registrar_dispositivo(nombre, dispositivo)
+    administrador.guardar_en_archivo()
+    administrador.diario.cerrar()
+
+    reabierto = AdministradorRedes(ruta)
+    reabierto.guardar_en_archivo_texto(str(tmp_path / "norte.txt"), nombre_campus="Norte")
+    assert reabierto.campus["Norte"].cargado and not reabierto.campus["Sur"].cargado
+    salida = capsys.readouterr().out
+    assert "(solo campus cargados)" in salida and "Direcciones IP duplicadas: 1" in salida
+    # El análisis completo sí lee todos los campus
+    assert len(reabierto.analizar_direcciones().ips_duplicadas["10.0.0.1"]) == 3
+    assert reabierto.campus["Sur"].cargado
+    reabierto.diario.cerrar()
@@ -0,0 +1,67 @@
+from modules.cache_restconf import CacheRESTCONF
+from modules.restconf_operations import RESTCONFOperations
+
+
+def test_desaloja_por_cantidad_y_por_tamano_en_orden_lru():
+    cache = CacheRESTCONF(max_entradas=2, max_bytes=100)
+    cache.guardar("10.0.0.1", "a", '{"a": 1}', 10)
+    cache.guardar("10.0.0.1", "b", '{"b": 1}', 10)
+    cache.obtener("10.0.0.1", "a")
+    cache.guardar("10.0.0.1", "c", '{"c": 1}', 10)
+    assert cache.obtener("10.0.0.1", "b") is None
+    assert cache.obtener("10.0.0.1", "a").valor == {"a": 1}
+
+    cache.guardar("10.0.0.1", "d", '{"d": 1}', 95)
+    assert cache.obtener("10.0.0.1", "a") is None and cache.obtener("10.0.0.1", "c") is None
+    # Lo que no entra en la caché no se guarda
+    cache.guardar("10.0.0.1", "e", '{"e": 1}', 101)
+    assert cache.obtener("10.0.0.1", "e") is None and cache.obtener("10.0.0.1", "d") is not None
+
+
+def test_cada_lectura_es_una_copia_y_la_clave_incluye_el_usuario():
+    cache = CacheRESTCONF()
+    cache.guardar("10.0.0.1", "a", '{"lista": [1]}', 14, usuario="admin")
+    cache.obtener("10.0.0.1", "a", "admin").valor["lista"].append(2)
+    assert cache.obtener("10.0.0.1", "a", "admin").valor == {"lista": [1]}
+    assert cache.obtener("10.0.0.1", "a", "operador") is None
+
+
+def test_invalida_la_ruta_sus_ancestros_y_descendientes():
+    cache = CacheRESTCONF()
+    for ruta in ("native", "native/interface", "native/interface/Gi1", "routing-state"):
+        cache.guardar("10.0.0.1", ruta, "{}", 2)
+    cache.guardar("10.0.0.2", "native", "{}", 2)
+    cache.invalidar("10.0.0.1", ["native/interface"])
+    assert [ruta for ruta in ("native", "native/interface", "native/interface/Gi1", "routing-state")
+            if cache.obtener("10.0.0.1", ruta) is not None] == ["routing-state"]
+    assert cache.obtener("10.0.0.2", "native") is not None
+
+
+def cliente(servidor, cache):
+    return RESTCONFOperations(f"127.0.0.1:{servidor.puerto}", "admin", "admin", cache=cache, interruptores=None, esquema="http")
+
+
+def test_revalida_con_etag_cuando_vence_el_ttl(servidor_simulado):
+    servidor = servidor_simulado()
+    cache = CacheRESTCONF(ttl=0)
+    with cliente(servidor, cache) as restconf:
+        primera = restconf.obtener_configuracion_running()
+        segunda = restconf.obtener_configuracion_running()
+    assert primera == segunda
+    assert servidor.solicitudes == 2 and cache.revalidaciones == 1
+
+
+def test_las_escrituras_invalidan_las_lecturas_guardadas(servidor_simulado):
+    servidor = servidor_simulado()
+    cache = CacheRESTCONF(ttl=300)
+    with cliente(servidor, cache) as restconf:
+        restconf.obtener_configuracion_running()
+        restconf.obtener_tabla_enrutamiento()
+        restconf.obtener_configuracion_running()
+        assert servidor.solicitudes == 2 and cache.aciertos == 1
+        assert restconf.crear_interfaz("GigabitEthernet2", "Prueba", "10.9.0.1", "255.255.255.0") is True
+        restconf.obtener_configuracion_running()
+        restconf.obtener_tabla_enrutamiento()
+        # refrescar=True consulta al dispositivo aunque la entrada esté vigente
+        restconf.obtener_configuracion_running(refrescar=True)
+    assert servidor.solicitudes == 6 and cache.revalidaciones == 0
@@ -0,0 +1,52 @@
+import os
+from modules.administrador_redes import AdministradorRedes
+from modules.dispositivo import Dispositivo
+
+
+def crear_dispositivo(nombre, ip="10.0.0.1"):
+    return Dispositivo(nombre, "C9300", "Acceso", ["Gi1"], {"Gi1": (ip, "255.255.255.0")}, {"V10": "10"}, ["ssh"])
+
+
+def test_reproduce_el_diario_despues_de_una_caida(tmp_path):
+    ruta = str(tmp_path / "inventario.json")
+    administrador = AdministradorRedes(ruta)
+    administrador.crear_campus("Central", "Sede central")
+    administrador.registrar_dispositivo("Central", crear_dispositivo("sw1"))
+    administrador.registrar_dispositivo("Central", crear_dispositivo("sw2", "10.0.0.2"))
+    administrador.eliminar_dispositivo("Central", "sw2")
+    # Caída: no hubo compactación y la última línea del diario quedó a medio escribir
+    administrador.diario.cerrar()
+    with open(ruta + ".diario", "a", encoding="utf-8") as archivo:
+        archivo.write('{"op": "registrar_dispositivo", "campus": "Cen')
+    assert not os.path.exists(ruta)
+
+    recuperado = AdministradorRedes(ruta)
+    assert list(recuperado.campus) == ["Central"]
+    assert [dispositivo.nombre for dispositivo in recuperado.campus["Central"].dispositivos] == ["sw1"]
+    assert [nombre for nombre, _ in recuperado.inventario.buscar_por_ip("10.0.0.1")] == ["Central"]
+    # La reproducción termina con una compactación: instantánea escrita y diario vacío
+    assert os.path.exists(ruta)
+    assert os.path.getsize(ruta + ".diario") == 0
+    recuperado.diario.cerrar()
+
+
+def test_reproducir_el_diario_dos_veces_no_duplica(tmp_path):
+    ruta = str(tmp_path / "inventario.json")
+    administrador = AdministradorRedes(ruta)
+    administrador.crear_campus("Central", "Sede central")
+    administrador.guardar_en_archivo()
+    administrador.registrar_dispositivo("Central", crear_dispositivo("sw1"))
+    administrador.diario.cerrar()
+    with open(ruta + ".diario", "r", encoding="utf-8") as archivo:
+        diario = archivo.read()
+
+    # Caída entre la escritura de la instantánea y el vaciado del diario
+    AdministradorRedes(ruta).diario.cerrar()
+    with open(ruta + ".diario", "w", encoding="utf-8") as archivo:
+        archivo.write(diario)
+
+    recuperado = AdministradorRedes(ruta)
+    assert [dispositivo.nombre for dispositivo in recuperado.campus["Central"].dispositivos] == ["sw1"]
+    assert len(recuperado.inventario) == 1
+    recuperado.diario.cerrar()
+
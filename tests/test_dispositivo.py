@@ -0,0 +1,35 @@
+import json
+from modules.dispositivo import Dispositivo
+
+
+def crear_dispositivo():
+    return Dispositivo("sw1", "C9300", "Acceso", ["Gi1", "Gi2"],
+                       {"Gi1": ("10.0.0.1", "255.255.255.0"), "Gi2": ("10.0.1.1", "")}, {"V10": "10"}, ["ssh", "ntp"])
+
+
+def test_los_atributos_conservan_los_tipos_originales():
+    dispositivo = crear_dispositivo()
+    assert dispositivo.interfaces == ["Gi1", "Gi2"] and isinstance(dispositivo.interfaces, list)
+    assert dispositivo.servicios == ["ssh", "ntp"] and isinstance(dispositivo.servicios, list)
+    assert type(dispositivo.ips_masks) is dict and type(dispositivo.vlans) is dict
+    assert json.loads(json.dumps(dispositivo.ips_masks)) == {"Gi1": ["10.0.0.1", "255.255.255.0"], "Gi2": ["10.0.1.1", ""]}
+    assert json.dumps(dispositivo.vlans) == '{"V10": "10"}'
+
+
+def test_las_copias_no_alteran_el_dispositivo_y_asignar_si():
+    dispositivo = crear_dispositivo()
+    servicios = dispositivo.servicios
+    servicios.append("snmp")
+    dispositivo.vlans["V20"] = "20"
+    assert dispositivo.servicios == ["ssh", "ntp"] and dispositivo.vlans == {"V10": "10"}
+    dispositivo.servicios = servicios
+    assert dispositivo.servicios == ["ssh", "ntp", "snmp"]
+
+
+def test_a_diccionario_reconstruye_el_dispositivo():
+    dispositivo = crear_dispositivo()
+    texto = json.dumps(dispositivo.a_diccionario())
+    copia = Dispositivo(**json.loads(texto))
+    assert json.dumps(copia.a_diccionario()) == texto
+    assert copia.direcciones_empaquetadas() is None
+    assert list(crear_dispositivo().direcciones_enteras()) == [(0x0A000001, 0xFFFFFF00), (0x0A000101, None)]
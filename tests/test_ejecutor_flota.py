@@ -0,0 +1,85 @@
+import threading
+import time
+import pytest
+from modules.campus import Campus
+from modules.dispositivo import Dispositivo
+from modules.ejecutor_flota import EjecutorFlota
+from modules.resiliencia import PoliticaReintentos
+from modules.restconf_operations import RESTCONFOperations
+
+
+class EjecutorMedido(EjecutorFlota):
+    # Reemplaza la llamada RESTCONF por una espera y registra cuántas operaciones corren a la vez
+    def __init__(self, duracion, **opciones):
+        super().__init__("admin", "admin", **opciones)
+        self.duracion = duracion
+        self.lock = threading.Lock()
+        self.en_curso = {}
+        self.maximo_por_campus = {}
+        self.maximo_global = 0
+
+    def _operar(self, ip, operacion, args, inicio):
+        inicio[0] = time.monotonic()
+        campus = ip.split(".")[2]
+        with self.lock:
+            self.en_curso[campus] = self.en_curso.get(campus, 0) + 1
+            self.maximo_por_campus[campus] = max(self.maximo_por_campus.get(campus, 0), self.en_curso[campus])
+            self.maximo_global = max(self.maximo_global, sum(self.en_curso.values()))
+        time.sleep(self.duracion)
+        with self.lock:
+            self.en_curso[campus] -= 1
+        return True
+
+
+def crear_campus(numero, cantidad):
+    campus = Campus(f"C{numero}", "")
+    for i in range(cantidad):
+        ip = f"10.0.{numero}.{i + 1}"
+        campus.agregar_dispositivo(Dispositivo(f"sw{numero}-{i}", "C9300", "Acceso", ["Gi1"], {"Gi1": (ip, "255.255.255.0")}, {}, []))
+    return campus
+
+
+def test_respeta_los_limites_global_y_por_campus():
+    ejecutor = EjecutorMedido(0.05, max_global=3, max_por_campus=2)
+    resultados = list(ejecutor.ejecutar([crear_campus(1, 6), crear_campus(2, 6)], "es_dispositivo_operativo"))
+    assert len(resultados) == 12 and all(resultado.exitoso for resultado in resultados)
+    assert ejecutor.maximo_global == 3
+    assert max(ejecutor.maximo_por_campus.values()) == 2
+
+
+def test_un_dispositivo_agotado_ocupa_su_lugar_hasta_que_termina():
+    ejecutor = EjecutorMedido(0.3, max_global=10, max_por_campus=2, timeout=0.1)
+    resultados = list(ejecutor.ejecutar([crear_campus(1, 6)], "es_dispositivo_operativo"))
+    assert [resultado.error for resultado in resultados] == ["Tiempo de espera agotado"] * 6
+    assert ejecutor.maximo_por_campus == {"1": 2}
+    # La ejecución no termina con hilos todavía trabajando
+    assert ejecutor.en_curso == {"1": 0}
+
+
+def test_informa_los_dispositivos_sin_direccion():
+    campus = Campus("C1", "")
+    campus.agregar_dispositivo(Dispositivo("sw", "C9300", "Acceso", ["Gi1"], {}, {}, []))
+    [resultado] = EjecutorMedido(0).ejecutar([campus], "es_dispositivo_operativo")
+    assert resultado.error == "El dispositivo no tiene dirección IP"
+
+
+def test_rechaza_limites_menores_que_uno():
+    with pytest.raises(ValueError):
+        EjecutorFlota("admin", "admin", max_por_campus=0)
+
+
+def test_la_fecha_limite_corta_los_reintentos(servidor_simulado):
+    servidor = servidor_simulado(latencia=0.5)
+    inicio = time.monotonic()
+    with RESTCONFOperations(f"127.0.0.1:{servidor.puerto}", "admin", "admin", timeout=2, cache=None, interruptores=None,
+                            reintentos=PoliticaReintentos(intentos=5, espera_base=0.01), esquema="http",
+                            fecha_limite=inicio + 0.2) as restconf:
+        assert restconf.es_dispositivo_operativo() is False
+    assert time.monotonic() - inicio < 0.45
+    assert servidor.solicitudes == 1
+
+
+@pytest.mark.parametrize("operacion", ["cerrar", "estadisticas_conexion", "obtener_configuracion_running_stream", "_enviar"])
+def test_solo_acepta_las_operaciones_permitidas(operacion):
+    with pytest.raises(ValueError):
+        list(EjecutorMedido(0).ejecutar([crear_campus(1, 1)], operacion))
@@ -0,0 +1,122 @@
+import importlib.util
+import os
+import pytest
+from conftest import RAIZ
+from modules.administrador_redes import AdministradorRedes
+
+_spec = importlib.util.spec_from_file_location("cli", os.path.join(RAIZ, "cli.py"))
+cli = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(cli)
+
+CSV = (
+    "campus,dispositivo,modelo,capa,interfaz,ip,mascara,vlans,servicios\n"
+    "Central,sw1,C9300,Acceso,Gi1,10.0.0.1,255.255.255.0,V10=10;V20=20,ssh;snmp\n"
+    "Central,sw1,C9300,Acceso,Gi2,,,V10=10;V20=20,ssh;snmp\n"
+    "Central,sw2,C9500,Núcleo,Gi1,10.0.1.1,255.255.255.0,,\n"
+    "Norte,sw3,C9200,Distribución,,,,V30=30,ntp\n"
+)
+
+# Lo que escribe el reporte CSV: una fila por campus antes de las filas de sus dispositivos
+CSV_EXPORTADO = (
+    "campus,descripcion,dispositivo,modelo,capa,interfaz,ip,mascara,vlans,servicios\n"
+    "Central,,,,,,,,,\n"
+    "Central,,sw1,C9300,Acceso,Gi1,10.0.0.1,255.255.255.0,V10=10;V20=20,ssh;snmp\n"
+    "Central,,sw1,C9300,Acceso,Gi2,,,V10=10;V20=20,ssh;snmp\n"
+    "Central,,sw2,C9500,Núcleo,Gi1,10.0.1.1,255.255.255.0,,\n"
+    "Norte,,,,,,,,,\n"
+    "Norte,,sw3,C9200,Distribución,,,,V30=30,ntp\n"
+)
+
+JSONL = (
+    '{"campus": "Central", "descripcion": "Sede central"}\n'
+    '{"campus": "Vacio", "descripcion": "Campus sin dispositivos"}\n'
+    '{"campus": "Central", "nombre": "sw1", "modelo": "C9300", "capa": "Acceso", "interfaces": ["Gi1"], '
+    '"ips_masks": {"Gi1": ["10.0.0.1", "255.255.255.0"]}, "vlans": {"V10": "10"}, "servicios": ["ssh"]}\n'
+)
+
+TEXTO = """Campus: Central
+Descripción: 
+
+Dispositivo: sw1
+Modelo: C9300
+Capa: Acceso
+Interfaces:
+- Gi1: IP: 10.0.0.1, Máscara: 255.255.255.0
+- Gi2: IP: , Máscara: 
+VLANs:
+- V10: 10
+- V20: 20
+Servicios: ssh, snmp
+------------------------------
+
+Dispositivo: sw2
+Modelo: C9500
+Capa: Núcleo
+Interfaces:
+- Gi1: IP: 10.0.1.1, Máscara: 255.255.255.0
+VLANs:
+
+Servicios: 
+------------------------------
+Campus: Norte
+Descripción: 
+
+Dispositivo: sw3
+Modelo: C9200
+Capa: Distribución
+Interfaces:
+
+VLANs:
+- V30: 30
+Servicios: ntp
+------------------------------
+"""
+
+
+def test_importar_y_exportar_como_texto(tmp_path):
+    inventario = str(tmp_path / "inventario.json")
+    entrada = tmp_path / "entrada.csv"
+    entrada.write_text(CSV, encoding="utf-8")
+
+    assert cli.main([inventario, "importar", str(entrada)]) == 0
+    assert cli.main([inventario, "exportar", str(tmp_path / "reporte.txt")]) == 0
+    assert (tmp_path / "reporte.txt").read_text(encoding="utf-8") == TEXTO
+
+
+def test_exportar_como_csv_e_importar_conserva_los_datos(tmp_path):
+    entrada = tmp_path / "entrada.csv"
+    entrada.write_text(CSV, encoding="utf-8")
+    assert cli.main([str(tmp_path / "a.json"), "importar", str(entrada)]) == 0
+    assert cli.main([str(tmp_path / "a.json"), "exportar", str(tmp_path / "a.csv")]) == 0
+    assert cli.main([str(tmp_path / "b.json"), "importar", str(tmp_path / "a.csv")]) == 0
+    assert cli.main([str(tmp_path / "b.json"), "exportar", str(tmp_path / "b.csv")]) == 0
+    assert (tmp_path / "a.csv").read_text(encoding="utf-8") == CSV_EXPORTADO
+    assert (tmp_path / "b.csv").read_text(encoding="utf-8") == CSV_EXPORTADO
+
+
+@pytest.mark.parametrize("formato", ["jsonl", "csv"])
+def test_exportar_e_importar_conserva_los_campus_vacios_y_las_descripciones(tmp_path, formato):
+    entrada = tmp_path / "entrada.jsonl"
+    entrada.write_text(JSONL, encoding="utf-8")
+    assert cli.main([str(tmp_path / "a.json"), "importar", str(entrada)]) == 0
+    assert cli.main([str(tmp_path / "a.json"), "exportar", str(tmp_path / f"a.{formato}")]) == 0
+    assert cli.main([str(tmp_path / "b.json"), "importar", str(tmp_path / f"a.{formato}")]) == 0
+    assert cli.main([str(tmp_path / "b.json"), "exportar", str(tmp_path / f"b.{formato}")]) == 0
+    assert (tmp_path / f"a.{formato}").read_text(encoding="utf-8") == (tmp_path / f"b.{formato}").read_text(encoding="utf-8")
+
+    administrador = AdministradorRedes(str(tmp_path / "b.json"))
+    assert {nombre: campus.descripcion for nombre, campus in administrador.campus.items()} == {
+        "Central": "Sede central", "Vacio": "Campus sin dispositivos"}
+    assert [dispositivo.nombre for dispositivo in administrador.campus["Central"].dispositivos] == ["sw1"]
+    administrador.diario.cerrar()
+
+
+def test_los_registros_invalidos_se_informan_y_no_se_importan(tmp_path, capsys):
+    entrada = tmp_path / "entrada.csv"
+    entrada.write_text(CSV + "Norte,sw4,C9200,Acceso,Gi1,10.0.0.300,255.255.255.0,,\n"
+                             "Norte,sw5,C9200,Acceso,Gi1,10.0.2.1,255.0.255.0,,\n", encoding="utf-8")
+    assert cli.main([str(tmp_path / "inventario.json"), "importar", str(entrada)]) == 1
+    errores = capsys.readouterr().err
+    assert "entrada.csv:6:" in errores and "entrada.csv:7:" in errores
+    assert cli.main([str(tmp_path / "inventario.json"), "buscar", "--nombre", "sw4"]) == 1
+    assert cli.main([str(tmp_path / "inventario.json"), "buscar", "--nombre", "sw3"]) == 0
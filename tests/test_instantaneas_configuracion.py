@@ -0,0 +1,59 @@
+import copy
+import pytest
+from modules.instantaneas_configuracion import AlmacenInstantaneas, arbol_de_hashes, comparar_arboles
+
+
+def configuracion(interfaces=200):
+    return {"native": {
+        "hostname": "csr1",
+        "interface": {"GigabitEthernet": [
+            {"name": str(n), "description": f"Enlace {n}", "ip": {"address": f"10.0.{n}.1"}} for n in range(interfaces)
+        ]},
+        "ntp": {"server": ["10.0.0.10", "10.0.0.11"]},
+    }}
+
+
+def cambiar(original):
+    cambiada = copy.deepcopy(original)
+    nativa = cambiada["native"]
+    nativa["hostname"] = "csr2"
+    interfaces = nativa["interface"]["GigabitEthernet"]
+    interfaces[1]["description"] = "Cambiada"
+    del interfaces[3]
+    interfaces.append({"name": "999", "description": "Nueva", "ip": {"address": "10.9.9.1"}})
+    # El orden de los elementos de una lista con clave no es un cambio
+    interfaces.reverse()
+    nativa["ntp"]["server"] = ["10.0.0.10"]
+    return cambiada
+
+
+ESPERADOS = [
+    ("native/hostname", "modificado"),
+    ("native/interface/GigabitEthernet/name=1/description", "modificado"),
+    ("native/interface/GigabitEthernet/name=3", "eliminado"),
+    ("native/interface/GigabitEthernet/name=999", "agregado"),
+    ("native/ntp/server", "modificado"),
+]
+
+
+@pytest.mark.parametrize("interfaces", [5, 200])
+def test_compara_por_clave_con_y_sin_nodos_en_el_arbol(interfaces):
+    antes = configuracion(interfaces)
+    despues = cambiar(antes)
+    cambios = list(comparar_arboles(antes, arbol_de_hashes(antes), despues, arbol_de_hashes(despues)))
+    assert sorted((ruta, tipo) for ruta, tipo, _, _ in cambios) == ESPERADOS
+    assert ("native/hostname", "modificado", "csr1", "csr2") in cambios
+
+
+def test_el_almacen_guarda_cada_contenido_una_vez_y_compara(tmp_path):
+    almacen = AlmacenInstantaneas(str(tmp_path))
+    antes = configuracion()
+    assert almacen.guardar("10.0.0.1", antes)[::2] == (1, True)
+    assert almacen.guardar("10.0.0.1", copy.deepcopy(antes))[::2] == (2, False)
+    assert almacen.guardar("10.0.0.1", cambiar(antes))[::2] == (3, True)
+    assert [entrada["id"] for entrada in almacen.listar("10.0.0.1")] == [1, 2, 3]
+    assert almacen.comparar("10.0.0.1", 1, 2) == []
+    assert sorted((ruta, tipo) for ruta, tipo, _, _ in almacen.comparar("10.0.0.1", 2, 3)) == ESPERADOS
+    assert almacen.cargar("10.0.0.1", 3) == cambiar(antes)
+    with pytest.raises(KeyError):
+        almacen.comparar("10.0.0.1", 1, 9)
@@ -0,0 +1,72 @@
+import json
+from modules.administrador_redes import AdministradorRedes
+from modules.dispositivo import Dispositivo
+
+
+def nombres(encontrados):
+    return sorted((campus, dispositivo.nombre) for campus, dispositivo in encontrados)
+
+
+def crear_administrador(tmp_path):
+    administrador = AdministradorRedes(str(tmp_path / "inventario.json"))
+    administrador.crear_campus("Norte", "")
+    administrador.crear_campus("Sur", "")
+    administrador.registrar_dispositivo("Norte", Dispositivo("sw1", "C9300", "Acceso", ["Gi1"], {"Gi1": ("10.0.0.1", "255.255.255.0")},
+                                                             {"V10": "10"}, ["ssh"]))
+    administrador.registrar_dispositivo("Sur", Dispositivo("sw2", "C9500", "Núcleo", ["Gi1"], {"Gi1": ("10.0.1.1", "255.255.255.0")},
+                                                           {"V10": "10"}, ["snmp"]))
+    return administrador
+
+
+def test_los_indices_siguen_las_modificaciones(tmp_path):
+    administrador = crear_administrador(tmp_path)
+    inventario = administrador.inventario
+    assert nombres(inventario.buscar_por_vlan("10")) == [("Norte", "sw1"), ("Sur", "sw2")]
+
+    sw1 = administrador.campus["Norte"].obtener_dispositivo("sw1")
+    administrador.actualizar_dispositivo("Norte", sw1, ips_masks={"Gi1": ("10.0.2.1", "255.255.255.0")}, vlans={"V20": "20"},
+                                         servicios=["ntp"], capa="Distribución")
+    assert inventario.buscar_por_ip("10.0.0.1") == []
+    assert nombres(inventario.buscar_por_ip("10.0.2.1")) == [("Norte", "sw1")]
+    assert nombres(inventario.buscar_por_vlan("10")) == [("Sur", "sw2")]
+    assert nombres(inventario.buscar_por_vlan("20")) == [("Norte", "sw1")]
+    assert inventario.buscar_por_servicio("ssh") == [] and nombres(inventario.buscar_por_servicio("ntp")) == [("Norte", "sw1")]
+    assert inventario.buscar_por_capa("Acceso") == [] and nombres(inventario.buscar_por_capa("Distribución")) == [("Norte", "sw1")]
+    assert nombres(inventario.buscar_en_subred("10.0.0.0", "255.255.0.0")) == [("Norte", "sw1"), ("Sur", "sw2")]
+    [(red, encontrados)] = inventario.subredes_que_contienen("10.0.2.99")
+    assert red == "10.0.2.0/24" and nombres(encontrados) == [("Norte", "sw1")]
+    assert inventario.subredes_que_contienen("10.0.0.99") == []
+    administrador.diario.cerrar()
+
+
+def test_los_indices_siguen_las_bajas(tmp_path):
+    administrador = crear_administrador(tmp_path)
+    inventario = administrador.inventario
+    administrador.eliminar_dispositivo("Norte", "sw1")
+    assert inventario.buscar_por_nombre("sw1") == [] and inventario.buscar_por_ip("10.0.0.1") == []
+    assert nombres(inventario.buscar_por_vlan("10")) == [("Sur", "sw2")]
+    administrador.eliminar_campus("Sur")
+    assert len(inventario) == 0
+    assert inventario.buscar_por_vlan("10") == [] and inventario.buscar_en_subred("10.0.0.0", "255.0.0.0") == []
+    administrador.diario.cerrar()
+
+
+def test_los_nombres_repetidos_del_formato_anterior_se_conservan(tmp_path, capsys):
+    ruta = tmp_path / "inventario.json"
+    dispositivo = {"nombre": "sw1", "modelo": "C9300", "capa": "Acceso", "interfaces": ["Gi1"], "vlans": {}, "servicios": []}
+    ruta.write_text(json.dumps({"campus": {"Norte": ""}, "dispositivos": {}, "Norte": [
+        dict(dispositivo, ips_masks={"Gi1": ["10.0.0.1", "255.255.255.0"]}),
+        dict(dispositivo, ips_masks={"Gi1": ["10.0.0.2", "255.255.255.0"]}),
+    ]}), encoding="utf-8")
+
+    administrador = AdministradorRedes(str(ruta))
+    assert "más de un dispositivo llamado sw1" in capsys.readouterr().out
+    campus = administrador.campus["Norte"]
+    assert [dispositivo.nombre for dispositivo in campus.dispositivos] == ["sw1", "sw1 (2)"]
+    assert nombres(administrador.inventario.buscar_por_ip("10.0.0.2")) == [("Norte", "sw1 (2)")]
+    administrador.guardar_en_archivo()
+    administrador.diario.cerrar()
+
+    migrado = AdministradorRedes(str(ruta))
+    assert len(migrado.campus["Norte"].dispositivos) == 2
+    migrado.diario.cerrar()
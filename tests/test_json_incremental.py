@@ -0,0 +1,44 @@
+import json
+from modules.json_incremental import iterar_subarboles, iterar_subarboles_objeto
+
+DOCUMENTO = {
+    "Cisco-IOS-XE-native:native": {
+        "hostname": "csr \"principal\" á",
+        "interface": {"GigabitEthernet": [
+            {"name": "1", "ip": {"address": {"primary": {"address": "10.0.0.1", "mask": "255.255.255.0"}}}},
+            {"name": "2", "shutdown": [None], "mtu": 1500.5, "enabled": False},
+        ]},
+        "ip": {"route": {"ip-route-interface-forwarding-list": []}},
+    }
+}
+
+
+def fragmentar(texto, tamano):
+    datos = texto.encode("utf-8")
+    return (datos[i:i + tamano] for i in range(0, len(datos), tamano))
+
+
+def test_coincide_con_json_loads_con_cualquier_tamano_de_fragmento():
+    texto = json.dumps(DOCUMENTO, indent=1, ensure_ascii=False)
+    for tamano in (1, 2, 3, 7, 64, len(texto)):
+        assert list(iterar_subarboles(fragmentar(texto, tamano))) == [("", DOCUMENTO)]
+
+
+def test_filtra_subarboles_y_produce_cada_elemento_de_una_lista():
+    texto = json.dumps(DOCUMENTO)
+    filtro = "native/interface/GigabitEthernet"
+    esperado = list(iterar_subarboles_objeto(DOCUMENTO, filtro))
+    assert [valor["name"] for _, valor in esperado] == ["1", "2"]
+    for tamano in (1, 5, 4096):
+        assert list(iterar_subarboles(fragmentar(texto, tamano), filtro)) == esperado
+
+
+def test_comodin_en_el_primer_nivel():
+    texto = json.dumps(DOCUMENTO)
+    secciones = list(iterar_subarboles(fragmentar(texto, 3), "*/*"))
+    assert [ruta for ruta, _ in secciones] == [
+        "Cisco-IOS-XE-native:native/hostname",
+        "Cisco-IOS-XE-native:native/interface",
+        "Cisco-IOS-XE-native:native/ip",
+    ]
+    assert secciones == list(iterar_subarboles_objeto(DOCUMENTO, "*/*"))
@@ -0,0 +1,67 @@
+import json
+from modules.metricas import RegistroMetricas, metricas, normalizar_endpoint
+from modules.restconf_operations import RESTCONFOperations
+
+
+def test_exporta_en_formato_prometheus_y_json(tmp_path):
+    registro = RegistroMetricas(habilitado=True)
+    registro.registrar_solicitud("10.0.0.1", "GET", "native/interface=Gi1", 200, 0.003, recibidos=512)
+    registro.registrar_solicitud("10.0.0.1", "GET", "native/interface=Gi2", 503, 0.2)
+    registro.registrar_solicitud("10.0.0.1", "PUT", "native", "ConnectTimeout", 5.0, enviados=100)
+
+    lineas = "".join(registro.lineas_prometheus())
+    assert '# TYPE restconf_duracion_endpoint_segundos histogram' in lineas
+    assert 'restconf_duracion_endpoint_segundos_bucket{metodo="GET",endpoint="native/interface=*",le="0.005"} 1\n' in lineas
+    assert 'restconf_duracion_endpoint_segundos_bucket{metodo="GET",endpoint="native/interface=*",le="+Inf"} 2\n' in lineas
+    assert 'restconf_duracion_endpoint_segundos_count{metodo="GET",endpoint="native/interface=*"} 2\n' in lineas
+    assert 'restconf_errores_total{dispositivo="10.0.0.1",endpoint="native/interface=*",codigo="503"} 1\n' in lineas
+    assert 'restconf_errores_total{dispositivo="10.0.0.1",endpoint="native",codigo="ConnectTimeout"} 1\n' in lineas
+    assert 'restconf_bytes_recibidos_total{dispositivo="10.0.0.1"} 512\n' in lineas
+
+    registro.exportar(str(tmp_path / "metricas.json"))
+    datos = json.loads((tmp_path / "metricas.json").read_text(encoding="utf-8"))
+    [muestra] = datos["metricas"]["restconf_duracion_dispositivo_segundos"]["muestras"]
+    assert muestra["etiquetas"] == {"dispositivo": "10.0.0.1"} and muestra["conteo"] == 3
+    assert abs(muestra["suma"] - 5.203) < 1e-9
+    registro.exportar(str(tmp_path / "metricas.prom"))
+    assert (tmp_path / "metricas.prom").read_text(encoding="utf-8") == "".join(registro.lineas_prometheus())
+
+
+def test_normaliza_las_claves_de_lista_y_escapa_las_etiquetas():
+    assert normalizar_endpoint("ietf-routing:routing/routing-instance=default/ribs/rib=ipv4") == \
+        "ietf-routing:routing/routing-instance=*/ribs/rib=*"
+    assert normalizar_endpoint("") == "/"
+    registro = RegistroMetricas(habilitado=True)
+    registro.sumar("restconf_bytes_enviados_total", ('sw "1"\n',), 3)
+    assert 'restconf_bytes_enviados_total{dispositivo="sw \\"1\\"\\n"} 3\n' in "".join(registro.lineas_prometheus())
+
+
+def test_deshabilitado_no_mide():
+    registro = RegistroMetricas()
+    with registro.medir("cargar"):
+        pass
+    assert registro.a_diccionario()["metricas"]["inventario_duracion_segundos"]["muestras"] == []
+    registro.habilitar()
+    with registro.medir("cargar"):
+        pass
+    assert registro.a_diccionario()["metricas"]["inventario_duracion_segundos"]["muestras"][0]["conteo"] == 1
+
+
+def test_el_cliente_registra_cada_solicitud(servidor_simulado):
+    servidor = servidor_simulado(tamano_respuesta=2048)
+    direccion = f"127.0.0.1:{servidor.puerto}"
+    metricas.reiniciar()
+    metricas.habilitar()
+    try:
+        with RESTCONFOperations(direccion, "admin", "admin", cache=None, interruptores=None, esquema="http") as restconf:
+            restconf.obtener_configuracion_running()
+            restconf.crear_interfaz("GigabitEthernet2", "Prueba", "10.9.0.1", "255.255.255.0")
+        datos = metricas.a_diccionario()["metricas"]
+    finally:
+        metricas.habilitar(False)
+        metricas.reiniciar()
+    solicitudes = {(m["etiquetas"]["metodo"], m["etiquetas"]["codigo"]): m["valor"] for m in datos["restconf_solicitudes_total"]["muestras"]}
+    assert solicitudes == {("GET", "200"): 1, ("PUT", "201"): 1}
+    [recibidos] = datos["restconf_bytes_recibidos_total"]["muestras"]
+    assert recibidos["etiquetas"] == {"dispositivo": direccion} and recibidos["valor"] > 1024
+    assert datos["restconf_errores_total"]["muestras"] == []
@@ -0,0 +1,49 @@
+import time
+from modules.resiliencia import PoliticaReintentos, RegistroInterruptores, segundos_retry_after
+
+
+def test_el_interruptor_se_abre_tras_fallos_consecutivos_y_prueba_al_vencer():
+    interruptores = RegistroInterruptores(umbral_fallos=3, tiempo_apertura=60)
+    for _ in range(2):
+        interruptores.registrar_fallo("10.0.0.1")
+    assert interruptores.permitir("10.0.0.1")
+    interruptores.registrar_fallo("10.0.0.1")
+    assert interruptores.estado("10.0.0.1") == RegistroInterruptores.ABIERTO
+    assert not interruptores.permitir("10.0.0.1")
+    # Otros dispositivos no se ven afectados
+    assert interruptores.permitir("10.0.0.2")
+
+    # Al vencer el plazo pasa una sola solicitud de prueba
+    interruptores._interruptores["10.0.0.1"].hasta = 0.0
+    assert interruptores.permitir("10.0.0.1")
+    assert interruptores.estado("10.0.0.1") == RegistroInterruptores.SEMIABIERTO
+    assert not interruptores.permitir("10.0.0.1")
+    interruptores.registrar_exito("10.0.0.1")
+    assert interruptores.estado("10.0.0.1") == RegistroInterruptores.CERRADO
+    assert interruptores.permitir("10.0.0.1")
+
+
+def test_una_prueba_fallida_duplica_el_plazo_de_apertura():
+    interruptores = RegistroInterruptores(umbral_fallos=1, tiempo_apertura=10, tiempo_apertura_maximo=25)
+    plazos = []
+    for _ in range(3):
+        antes = time.monotonic()
+        interruptores.registrar_fallo("10.0.0.1")
+        interruptor = interruptores._interruptores["10.0.0.1"]
+        plazos.append(round(interruptor.hasta - antes))
+        # Vence el plazo y la prueba siguiente vuelve a fallar
+        interruptor.hasta = 0.0
+        assert interruptores.permitir("10.0.0.1")
+    assert plazos == [10, 20, 25]
+
+
+def test_politica_de_reintentos():
+    politica = PoliticaReintentos(intentos=3, espera_base=1, espera_maxima=4, retry_after_maximo=30)
+    assert politica.reintentable("GET", 0) and politica.reintentable("PUT", 1)
+    assert not politica.reintentable("GET", 2)
+    assert not politica.reintentable("POST", 0) and not politica.reintentable("PATCH", 0)
+    assert all(0 <= politica.espera(intento) <= min(4, 2 ** intento) for intento in range(6) for _ in range(20))
+    assert politica.espera(0, "7") == 7
+    assert politica.espera(0, "120") is None
+    assert segundos_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert segundos_retry_after("no es una fecha") is None
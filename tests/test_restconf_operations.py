@@ -0,0 +1,107 @@
+import requests
+from modules.cache_restconf import CacheRESTCONF
+from modules.restconf_operations import RESTCONFOperations
+
+
+def cliente(servidor, cache=None, **opciones):
+    return RESTCONFOperations(f"127.0.0.1:{servidor.puerto}", "admin", "admin", cache=cache, interruptores=None,
+                              esquema="http", **opciones)
+
+
+def test_las_lecturas_por_partes_usan_y_llenan_la_cache(servidor_simulado):
+    servidor = servidor_simulado(tamano_respuesta=200 * 1024)
+    cache = CacheRESTCONF(ttl=300)
+    with cliente(servidor, cache) as restconf:
+        lecturas = [(list(restconf.obtener_configuracion_running_stream()), list(restconf.obtener_tabla_enrutamiento_stream()))
+                    for _ in range(3)]
+        completa = restconf.obtener_configuracion_running()
+    assert servidor.solicitudes == 2
+    assert lecturas[0] == lecturas[1] == lecturas[2]
+    assert len(lecturas[0][1]) > 1000
+    assert completa["Cisco-IOS-XE-native:native"]["hostname"] == "csr-simulado"
+
+
+def test_no_guarda_respuestas_leidas_a_medias_ni_mayores_que_la_cache(servidor_simulado):
+    servidor = servidor_simulado(tamano_respuesta=64 * 1024)
+    with cliente(servidor, CacheRESTCONF(ttl=300)) as restconf:
+        secciones = restconf.obtener_configuracion_running_stream()
+        next(secciones)
+        secciones.close()
+        list(restconf.obtener_configuracion_running_stream())
+    assert servidor.solicitudes == 2
+
+    with cliente(servidor, CacheRESTCONF(ttl=300, max_bytes=16 * 1024)) as restconf:
+        list(restconf.obtener_tabla_enrutamiento_stream())
+        list(restconf.obtener_tabla_enrutamiento_stream())
+    assert servidor.solicitudes == 4
+
+
+def test_reutiliza_la_conexion_y_cuenta_los_handshakes_evitados(servidor_simulado):
+    servidor = servidor_simulado()
+    with cliente(servidor) as restconf:
+        for _ in range(5):
+            assert restconf.es_dispositivo_operativo()
+        assert restconf.estadisticas_conexion() == {"solicitudes": 5, "handshakes_realizados": 1, "handshakes_evitados": 4}
+        # Después de cerrar la sesión los contadores se conservan y la siguiente solicitud abre otra conexión
+        restconf.cerrar()
+        assert restconf.es_dispositivo_operativo()
+        assert restconf.estadisticas_conexion() == {"solicitudes": 6, "handshakes_realizados": 2, "handshakes_evitados": 4}
+
+
+def test_descarta_la_sesion_inactiva(servidor_simulado):
+    servidor = servidor_simulado()
+    with cliente(servidor, inactividad_maxima=0) as restconf:
+        restconf.es_dispositivo_operativo()
+        restconf._ultimo_uso -= 1
+        restconf.es_dispositivo_operativo()
+        assert restconf.estadisticas_conexion()["handshakes_realizados"] == 2
+
+
+def registrar_solicitudes(restconf):
+    solicitudes = []
+    enviar = restconf._enviar
+
+    def registrar(metodo, url, **opciones):
+        solicitudes.append((metodo, restconf._ruta_yang(url)))
+        return enviar(metodo, url, **opciones)
+
+    restconf._enviar = registrar
+    return solicitudes
+
+
+def test_divide_los_lotes_por_cantidad_y_por_tamano():
+    elementos = list(range(10))
+    lotes = RESTCONFOperations._dividir_en_lotes(elementos, [{"n": n} for n in elementos], max_elementos=4)
+    assert [lote for lote, _ in lotes] == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+    # Cada dato ocupa 8 bytes más el separador: caben tres por lote de 30 bytes
+    lotes = RESTCONFOperations._dividir_en_lotes(elementos, [{"n": n} for n in elementos], max_bytes=30)
+    assert [len(lote) for lote, _ in lotes] == [3, 3, 3, 1]
+    # Un elemento más grande que el límite va solo en su lote
+    assert [lote for lote, _ in RESTCONFOperations._dividir_en_lotes([0], [{"n": 0}], max_bytes=1)] == [[0]]
+
+
+def test_las_rutas_se_envian_en_lotes_al_contenedor(servidor_simulado):
+    servidor = servidor_simulado()
+    rutas = [(f"10.{n}.0.0", "255.255.0.0", "10.0.0.1") for n in range(5)]
+    with cliente(servidor) as restconf:
+        solicitudes = registrar_solicitudes(restconf)
+        resultados = restconf.crear_rutas(rutas, max_bytes=200)
+    assert resultados == [(ruta, True) for ruta in rutas]
+    assert len(solicitudes) == servidor.solicitudes == 3
+    assert set(solicitudes) == {("PATCH", "ietf-routing:routing/routing-instance=default/ribs/rib=ipv4/ipv4-routes/static-routes")}
+
+
+def test_si_falla_el_lote_se_aplica_cada_elemento(servidor_simulado, capsys):
+    servidor = servidor_simulado()
+    interfaces = [(f"GigabitEthernet{n}", "Prueba", f"10.{n}.0.1", "255.255.255.0") for n in range(3)]
+
+    def patch_fallido(*argumentos):
+        raise requests.ConnectionError("sin conexión")
+
+    with cliente(servidor) as restconf:
+        restconf._realizar_solicitud_patch = patch_fallido
+        solicitudes = registrar_solicitudes(restconf)
+        assert restconf.crear_interfaces(interfaces) == [(interfaz, True) for interfaz in interfaces]
+        assert [metodo for metodo, _ in solicitudes] == ["PUT"] * 3
+        assert restconf.crear_interfaces(interfaces, individual_si_falla=False) == [(interfaz, False) for interfaz in interfaces]
+    assert "Error al aplicar un lote de 3 elementos" in capsys.readouterr().out
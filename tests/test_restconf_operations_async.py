@@ -0,0 +1,53 @@
+import asyncio
+from modules.resiliencia import RegistroInterruptores
+from modules.restconf_operations_async import RESTCONFOperationsAsync
+
+
+def cliente(servidor, **opciones):
+    return RESTCONFOperationsAsync(f"127.0.0.1:{servidor.puerto}", "admin", "admin", cache=None, esquema="http", **opciones)
+
+
+def test_obtiene_la_configuracion(servidor_simulado):
+    servidor = servidor_simulado(tamano_respuesta=4096)
+
+    async def consultar():
+        async with cliente(servidor, interruptores=None) as restconf:
+            return await restconf.obtener_configuracion_running()
+
+    configuracion = asyncio.run(consultar())
+    assert configuracion["Cisco-IOS-XE-native:native"]["hostname"] == "csr-simulado"
+
+
+def test_la_espera_en_la_cola_no_agota_el_timeout_ni_abre_el_circuito(servidor_simulado):
+    servidor = servidor_simulado(latencia=0.1)
+    interruptores = RegistroInterruptores(umbral_fallos=2)
+
+    async def consultar():
+        # Diez clientes con dos lugares: los últimos esperan en la cola más que el timeout de 0.3 s
+        limite = asyncio.Semaphore(2)
+
+        async def operar():
+            async with cliente(servidor, timeout=0.3, limite=limite, interruptores=interruptores) as restconf:
+                return await restconf.es_dispositivo_operativo()
+
+        return await asyncio.gather(*(operar() for _ in range(10)))
+
+    assert asyncio.run(consultar()) == [True] * 10
+    assert servidor.solicitudes == 10
+    assert interruptores.estado(f"127.0.0.1:{servidor.puerto}") == RegistroInterruptores.CERRADO
+
+
+def test_agotar_la_fecha_limite_en_la_cola_no_es_un_fallo_del_dispositivo(servidor_simulado):
+    servidor = servidor_simulado()
+    interruptores = RegistroInterruptores(umbral_fallos=1)
+
+    async def consultar():
+        limite = asyncio.Semaphore(1)
+        await limite.acquire()
+        fecha_limite = asyncio.get_running_loop().time() + 0.1
+        async with cliente(servidor, limite=limite, fecha_limite=fecha_limite, interruptores=interruptores) as restconf:
+            return await restconf.es_dispositivo_operativo()
+
+    assert asyncio.run(consultar()) is False
+    assert servidor.solicitudes == 0
+    assert interruptores.estado(f"127.0.0.1:{servidor.puerto}") == RegistroInterruptores.CERRADO